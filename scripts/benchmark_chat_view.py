@@ -0,0 +1,138 @@
+"""
+ScreenAsk Chat View Benchmark
+Measures how long the chat panel takes to show a history and to add one message.
+
+Usage:
+    python scripts/benchmark_chat_view.py [messages] [appends]
+
+"widgets" reproduces the old chat panel (a Frame, Label and Text per message
+inside a scrolled canvas, with two update_idletasks calls and a scrollregion
+recompute per message); "text" is MainGUI's chat view, which inserts each
+message into one tagged Text widget. Startup is the time to display the whole
+history; append is the time to add one more message once it is shown, which
+should not grow with the history.
+"""
+
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+from pathlib import Path
+
+# Add the project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.ui.main_gui import MainGUI
+
+class BenchmarkApp:
+    """Stands in for ScreenAskApp; the chat view only needs the GUI"""
+    config = None
+
+class WidgetChatView:
+    """The old chat panel: widgets per message in a scrolled canvas"""
+    
+    def __init__(self, parent):
+        self.chat_canvas = tk.Canvas(parent, bg='white', highlightthickness=0)
+        self.chat_scrollable_frame = ttk.Frame(self.chat_canvas)
+        self.chat_scrollable_frame.bind(
+            "<Configure>",
+            lambda e: self.chat_canvas.configure(scrollregion=self.chat_canvas.bbox("all"))
+        )
+        self.chat_canvas.create_window((0, 0), window=self.chat_scrollable_frame, anchor="nw")
+        self.chat_canvas.pack(fill=tk.BOTH, expand=True)
+    
+    def add_chat_message(self, sender, message, timestamp):
+        """Add a message bubble built from a Frame, Label and Text"""
+        message_frame = tk.Frame(self.chat_scrollable_frame)
+        message_frame.pack(fill=tk.X, padx=5, pady=2)
+        
+        color = '#007ACC' if sender == 'user' else '#28A745'
+        msg_frame = tk.Frame(message_frame, bg=color, relief='raised', bd=1)
+        msg_frame.pack(side=tk.RIGHT if sender == 'user' else tk.LEFT)
+        tk.Label(msg_frame, text=f"{sender} ({timestamp})", bg=color, fg='white',
+                 font=('Arial', 8, 'bold')).pack(anchor='w', padx=5, pady=(2, 0))
+        
+        msg_text = tk.Text(msg_frame, wrap=tk.WORD, height=1, width=40, bg=color, fg='white',
+                           font=('Arial', 10), relief='flat', bd=0)
+        msg_text.insert('1.0', message)
+        msg_text.configure(state='disabled')
+        msg_text.pack(padx=5, pady=(0, 5), fill=tk.BOTH, expand=True)
+        msg_text.update_idletasks()
+        lines = int(msg_text.index('end-1c').split('.')[0])
+        msg_text.configure(height=max(2, min(lines, 8)))
+        
+        self.chat_scrollable_frame.update_idletasks()
+        self.chat_canvas.configure(scrollregion=self.chat_canvas.bbox("all"))
+        self.chat_canvas.yview_moveto(1.0)
+    
+    def get_widget_count(self):
+        """Get the number of widgets in the chat panel"""
+        count = 0
+        pending = [self.chat_scrollable_frame]
+        while pending:
+            children = pending.pop().winfo_children()
+            count += len(children)
+            pending.extend(children)
+        return count
+
+def sample_message(index):
+    """A user question or an AI answer of a few lines"""
+    if index % 2 == 0:
+        return 'user', f"Where is the export button in this dialog? ({index})"
+    return 'ai', "The export button is in the lower right corner, next to Cancel. " * 3 + f"({index})"
+
+def run(root, add_chat_message, messages, appends):
+    """Display a history, then append messages; returns (startup ms, append times ms)"""
+    start = time.perf_counter()
+    for index in range(messages):
+        add_chat_message(*sample_message(index), '12:00:00')
+    root.update()
+    startup_ms = (time.perf_counter() - start) * 1000
+    
+    append_times = []
+    for index in range(messages, messages + appends):
+        start = time.perf_counter()
+        add_chat_message(*sample_message(index), '12:00:00')
+        root.update()
+        append_times.append((time.perf_counter() - start) * 1000)
+    return startup_ms, sorted(append_times)
+
+def report(name, messages, startup_ms, append_times, widgets):
+    """Print one benchmark line"""
+    mean_append = sum(append_times) / len(append_times)
+    print(f"{name:<8} {messages:>5} messages: startup {startup_ms:8.1f} ms, append mean {mean_append:.2f} ms, "
+          f"max {append_times[-1]:.2f} ms, {widgets} widgets")
+
+def main():
+    """Main benchmark function"""
+    max_messages = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    appends = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    
+    root = tk.Tk()
+    root.geometry("600x500")
+    
+    for messages in (50, max_messages // 4, max_messages):
+        frame = ttk.Frame(root)
+        frame.pack(fill=tk.BOTH, expand=True)
+        legacy = WidgetChatView(frame)
+        startup_ms, append_times = run(root, legacy.add_chat_message, messages, appends)
+        report("widgets", messages, startup_ms, append_times, legacy.get_widget_count())
+        frame.destroy()
+        
+        frame = ttk.Frame(root)
+        frame.pack(fill=tk.BOTH, expand=True)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        gui = MainGUI(BenchmarkApp())
+        gui.root = root
+        gui._create_chat_view(frame)
+        startup_ms, append_times = run(root, gui.add_chat_message, messages, appends)
+        report("text", messages, startup_ms, append_times, 1)
+        frame.destroy()
+    
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
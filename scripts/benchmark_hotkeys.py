@@ -0,0 +1,114 @@
+"""
+ScreenAsk Hotkey Benchmark
+Measures press-to-handler latency with synthetic key events and idle CPU of the listener.
+
+Usage:
+    python scripts/benchmark_hotkeys.py [presses] [idle_seconds]
+
+Synthetic keyboard events are fed straight into HotkeyHandler's event handler,
+so no keys are actually pressed. Idle CPU is measured with the real keyboard
+hook installed and no keys pressed.
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# Add the project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import keyboard
+from src.core.services import ServiceContainer
+from src.handlers.hotkey_handler import HotkeyHandler
+
+class LatencyRecorder:
+    """Stands in for ScreenAskApp and records when each handler runs"""
+    
+    def __init__(self):
+        self.event_times = []
+        self.handler_times = []
+        self.done = threading.Event()
+        self.expected = 0
+    
+    def _record(self):
+        """Record a handler call"""
+        self.handler_times.append(time.perf_counter())
+        if len(self.handler_times) >= self.expected:
+            self.done.set()
+    
+    def handle_hotkey_press(self, profile_name='default'):
+        """Record a press handler call"""
+        self._record()
+    
+    def handle_hotkey_release(self, profile_name='default'):
+        """Record a release handler call"""
+        self._record()
+    
+    def handle_stop_speaking(self):
+        """Ignore stop speaking presses"""
+        pass
+
+def make_event(event_type, name):
+    """Create a synthetic keyboard event for a key name"""
+    scan_code = keyboard.key_to_scan_codes(name)[0]
+    return keyboard.KeyboardEvent(event_type, scan_code, name=name, time=time.time())
+
+def measure_latency(presses):
+    """Fire synthetic chord presses/releases and return per-event latencies in ms"""
+    recorder = LatencyRecorder()
+    recorder.expected = presses * 2
+    handler = HotkeyHandler(recorder, ServiceContainer())
+    keys = handler._parse_hotkey_combination(handler.config.get_hotkey())
+    handler.profile_keys = {'default': handler._resolve_keys(keys)}
+    handler.profile_pressed = {'default': False}
+    
+    for _ in range(presses):
+        # Modifiers first, the final key completes the chord
+        for key in keys:
+            if key == keys[-1]:
+                recorder.event_times.append(time.perf_counter())
+            handler._handle_key_event(make_event(keyboard.KEY_DOWN, key))
+        
+        # Release in reverse order; the first release breaks the chord
+        for index, key in enumerate(reversed(keys)):
+            if index == 0:
+                recorder.event_times.append(time.perf_counter())
+            handler._handle_key_event(make_event(keyboard.KEY_UP, key))
+        time.sleep(0.01)
+    
+    recorder.done.wait(timeout=5.0)
+    # Handlers run on their own threads, so pair events and handler calls in time order
+    handler_times = sorted(recorder.handler_times)
+    return [(handled - fired) * 1000 for fired, handled in zip(recorder.event_times, handler_times)]
+
+def measure_idle_cpu(seconds):
+    """Measure process CPU time while the real keyboard hook is installed and idle"""
+    handler = HotkeyHandler(LatencyRecorder(), ServiceContainer())
+    handler.start_listening()
+    start_cpu = time.process_time()
+    time.sleep(seconds)
+    cpu_time = time.process_time() - start_cpu
+    handler.stop_listening()
+    return cpu_time / seconds * 100
+
+def main():
+    """Main benchmark function"""
+    presses = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    idle_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    
+    latencies = sorted(measure_latency(presses))
+    if latencies:
+        mean_latency = sum(latencies) / len(latencies)
+        p95_latency = latencies[int(0.95 * (len(latencies) - 1))]
+        print(f"Press/release to handler ({len(latencies)} events): "
+              f"mean {mean_latency:.2f} ms, p95 {p95_latency:.2f} ms, max {latencies[-1]:.2f} ms")
+    else:
+        print("No handler calls recorded")
+    
+    print(f"Idle CPU with hook installed: {measure_idle_cpu(idle_seconds):.2f}% over {idle_seconds:.0f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+ScreenAsk Overlay Benchmark
+Measures circle overlay frame time and canvas item counts.
+
+Usage:
+    python scripts/benchmark_overlay.py [frames] [shows] [busy_ms]
+
+Frames are drawn straight on the main thread and flushed with update(), so
+the timings include Tk's redraw. "recreate" reproduces the old overlay (a new
+fullscreen window per circle, the oval deleted and recreated every frame and
+one debug label added per frame); "persistent" is CircleOverlay, which reuses
+one window sized to the circle and moves its canvas items; "persistent4"
+draws four labelled points of interest per frame in that window. The window area
+is the number of pixels the compositor blends while a circle is shown.
+
+The scheduler run animates a circle for a few seconds while another main
+thread callback blocks Tk for busy_ms every 100 ms, and reports how many
+frames were drawn, dropped and how evenly they were spaced.
+"""
+
+import sys
+import time
+import math
+import tkinter as tk
+from pathlib import Path
+
+# Add the project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.utils.circle_overlay import CircleOverlay
+
+class BenchmarkConfig:
+    """Stands in for Config with the debug label switched on"""
+    
+    def get(self, section, key, fallback=None):
+        """Get a CircleOverlay setting"""
+        if key == 'debug_coords':
+            return 'true'
+        return fallback
+
+class RecreateOverlay:
+    """The old overlay: a window per circle, items recreated every frame"""
+    
+    def __init__(self):
+        self.window = None
+        self.canvas = None
+        self.circle_id = None
+    
+    def show(self):
+        """Create a fullscreen transparent window"""
+        self.window = tk.Toplevel()
+        self.window.attributes('-topmost', True)
+        self.window.overrideredirect(True)
+        width, height = self.window.winfo_screenwidth(), self.window.winfo_screenheight()
+        self.window.geometry(f"{width}x{height}+0+0")
+        self.canvas = tk.Canvas(self.window, width=width, height=height, highlightthickness=0, bg='black')
+        self.canvas.pack()
+    
+    def draw_frame(self, x, y, radius, color):
+        """Delete and recreate the oval, adding a debug label"""
+        if self.circle_id:
+            self.canvas.delete(self.circle_id)
+        self.circle_id = self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
+                                                 fill=color, outline=color, width=2)
+        self.canvas.create_text(x, y - radius - 20, text=f"({x}, {y})", fill="white",
+                                font=("Arial", 12, "bold"), anchor="center")
+    
+    def hide(self):
+        """Destroy the window"""
+        self.window.destroy()
+        self.window = None
+        self.canvas = None
+        self.circle_id = None
+    
+    def get_item_count(self):
+        """Get the number of items on the canvas"""
+        return len(self.canvas.find_all()) if self.canvas else 0
+
+def pulse_radius(frame, radius=80):
+    """Radius of a pulse animation frame at 30 FPS"""
+    return int(radius * (0.8 + 0.4 * math.sin(frame / 30 * 4)))
+
+def run(root, show, draw_frame, hide, item_count, frames, shows):
+    """Show circles, draw frames and hide them; returns (show ms, frame times ms, max items)"""
+    show_times = []
+    frame_times = []
+    max_items = 0
+    for _ in range(shows):
+        start = time.perf_counter()
+        show()
+        root.update()
+        show_times.append((time.perf_counter() - start) * 1000)
+        
+        for frame in range(frames):
+            start = time.perf_counter()
+            draw_frame(400, 300, pulse_radius(frame), '#00FF00')
+            root.update()
+            frame_times.append((time.perf_counter() - start) * 1000)
+            max_items = max(max_items, item_count())
+        
+        hide()
+        root.update()
+    return sum(show_times) / len(show_times), sorted(frame_times), max_items
+
+def report(name, show_ms, frame_times, max_items):
+    """Print one benchmark line"""
+    mean_frame = sum(frame_times) / len(frame_times)
+    p95_frame = frame_times[int(0.95 * (len(frame_times) - 1))]
+    print(f"{name:<12} show {show_ms:6.2f} ms, frame mean {mean_frame:.3f} ms, p95 {p95_frame:.3f} ms, "
+          f"max {frame_times[-1]:.3f} ms, canvas items up to {max_items}")
+
+def measure_scheduler(root, overlay, busy_ms, seconds=3.0):
+    """Animate a circle while the main thread is periodically busy and report frame pacing"""
+    frame_times = []
+    draw_frame = overlay._draw_frame
+    
+    def timed_draw_frame(*args):
+        frame_times.append(time.perf_counter())
+        draw_frame(*args)
+    
+    overlay._draw_frame = timed_draw_frame
+    
+    def busy():
+        # Simulates a slow Tk callback, e.g. a large chat history redraw
+        end = time.perf_counter() + busy_ms / 1000
+        while time.perf_counter() < end:
+            pass
+        if overlay.is_circle_showing():
+            root.after(100, busy)
+    
+    overlay.show_circle(400, 300, 80, duration=seconds)
+    root.after(100, busy)
+    while overlay.is_circle_showing():
+        root.update()
+    overlay._draw_frame = draw_frame
+    
+    stats = overlay.scheduler.get_stats()
+    gaps = sorted((b - a) * 1000 for a, b in zip(frame_times, frame_times[1:]))
+    bunched = sum(1 for gap in gaps if gap < overlay.scheduler.frame_interval * 1000 / 2)
+    print(f"scheduler    {stats['frames']} frames, {stats['dropped_frames']} dropped, "
+          f"max {stats['max_late_ms']:.1f} ms late, {bunched} bunched (<half interval apart) "
+          f"with {busy_ms:.0f} ms busy every 100 ms")
+    if gaps:
+        print(f"             frame gap median {gaps[len(gaps) // 2]:.1f} ms, max {gaps[-1]:.1f} ms")
+
+def main():
+    """Main benchmark function"""
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    shows = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    busy_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 50
+    
+    root = tk.Tk()
+    root.withdraw()
+    
+    legacy = RecreateOverlay()
+    report("recreate", *run(root, legacy.show, legacy.draw_frame, legacy.hide, legacy.get_item_count,
+                            frames, shows))
+    
+    overlay = CircleOverlay(BenchmarkConfig())
+    overlay.create_window()
+    
+    def draw_frame(x, y, radius, color):
+        overlay._draw_frame([(x, y, radius, f"({x}, {y})")], color)
+    
+    def show():
+        overlay._place_window([(400, 300, int(80 * 1.2))], True)
+    
+    report("persistent", *run(root, show, draw_frame, overlay._hide_now, overlay.get_item_count,
+                              frames, shows))
+    
+    screen_width, screen_height = root.winfo_screenwidth(), root.winfo_screenheight()
+    width, height = overlay.window_size
+    print(f"Window area: recreate {screen_width}x{screen_height} ({screen_width * screen_height} px), "
+          f"persistent {width}x{height} ({width * height} px) for an 80 px circle")
+    
+    # Several points of interest share one window and are drawn in the same pass
+    offsets = [(0, 0), (250, 0), (0, 200), (250, 200)]
+    
+    def draw_frames(x, y, radius, color):
+        overlay._draw_frame([(x + dx, y + dy, radius, f"Step {index + 1}")
+                             for index, (dx, dy) in enumerate(offsets)], color)
+    
+    def show_all():
+        overlay._place_window([(400 + dx, 300 + dy, int(80 * 1.2)) for dx, dy in offsets], True)
+    
+    report("persistent4", *run(root, show_all, draw_frames, overlay._hide_now, overlay.get_item_count,
+                               frames, shows))
+    
+    measure_scheduler(root, overlay, busy_ms)
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
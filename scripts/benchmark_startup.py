@@ -0,0 +1,112 @@
+"""
+ScreenAsk Startup Benchmark
+Measures import cost and time until ScreenAsk is ready for the hotkey.
+
+Usage:
+    python scripts/benchmark_startup.py [top_n]
+
+Import times come from a fresh interpreter run with "python -X importtime",
+grouped by top-level package. "Ready for hotkey" covers what start() does
+before the main loop up to the keyboard hook being installed: constructing
+ScreenAskApp, creating the main and overlay windows and starting the tray.
+Handlers created during that time are listed, since they should all be
+deferred. The background initialization is then run and timed separately:
+handler construction, then the warm-up.
+"""
+
+import sys
+import time
+import subprocess
+from pathlib import Path
+
+# Add the project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+def measure_imports(module):
+    """Import a module in a fresh interpreter and return (total_us, {package: cumulative_us})"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=str(project_root), capture_output=True, text=True)
+    
+    packages = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        try:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            cumulative = int(cumulative)
+        except ValueError:
+            continue
+        
+        name = name.strip()
+        if name == module:
+            total_us = cumulative
+        
+        # A package's cumulative time already includes its submodules, so keep the largest
+        package = name.split('.')[0]
+        packages[package] = max(packages.get(package, 0), cumulative)
+    
+    if result.returncode != 0:
+        print(f"Warning: importing {module} failed:\n{result.stderr.splitlines()[-1] if result.stderr else ''}")
+    return total_us, packages
+
+def main():
+    """Main benchmark function"""
+    top_n = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    
+    # Step 1: import cost of the application module in a fresh interpreter
+    total_us, packages = measure_imports('src.core.main')
+    print(f"Import src.core.main: {total_us / 1000:.0f} ms")
+    print(f"{'Package':<28}{'Cumulative (ms)':>16}")
+    for package, cumulative in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top_n]:
+        print(f"{package:<28}{cumulative / 1000:>16.1f}")
+    
+    # Step 2: time to ready-for-hotkey, through start() until the keyboard hook is installed
+    start_time = time.perf_counter()
+    from src.core.main import ScreenAskApp
+    app = ScreenAskApp()
+    constructed_time = time.perf_counter() - start_time
+    
+    listening_at = []
+    start_listening = app.hotkey_handler.start_listening
+    
+    def timed_start_listening():
+        start_listening()
+        listening_at.append(time.perf_counter())
+    
+    app.hotkey_handler.start_listening = timed_start_listening
+    app._initialize_handlers = lambda: None  # Run below, on this thread, to time it alone
+    app._start_components()
+    ready_time = listening_at[0] - start_time
+    created_at_startup = list(app.handlers)
+    del app._initialize_handlers
+    
+    # Step 3: the work the background initialization thread does after startup
+    start_time = time.perf_counter()
+    app._construct_handlers()
+    construct_time = time.perf_counter() - start_time
+    
+    start_time = time.perf_counter()
+    app._warm_up()
+    warm_up_time = time.perf_counter() - start_time
+    
+    print(f"\nApp constructed:         {constructed_time * 1000:>8.0f} ms")
+    print(f"Ready for hotkey:        {ready_time * 1000:>8.0f} ms")
+    print(f"Handlers created before the hotkey: {', '.join(created_at_startup) or 'none'}")
+    print(f"Handler construction:    {construct_time * 1000:>8.0f} ms (background)")
+    print(f"Warm-up:                 {warm_up_time * 1000:>8.0f} ms (background)")
+    
+    app.hotkey_handler.stop_listening()
+    app.tray_handler.stop_tray()
+    app.main_gui.root.destroy()
+    if app.handlers.get('tts_handler'):
+        app.tts_handler.shutdown()
+    if app.handlers.get('audio_handler'):
+        app.audio_handler.stop_warm_stream()
+    app.services.shutdown()
+
+if __name__ == "__main__":
+    main()
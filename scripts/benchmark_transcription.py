@@ -0,0 +1,96 @@
+"""
+ScreenAsk Transcription Benchmark
+Compares latency and real-time factor of the configured transcription services.
+
+Usage:
+    python scripts/benchmark_transcription.py recording.wav [runs] [service ...]
+
+Services are any registered transcription backend, plus "race" to run the
+configured race_services in parallel. Real-time factor (RTF) is processing
+time divided by audio duration; values below 1.0 mean faster than real time.
+"""
+
+import sys
+import time
+import wave
+from pathlib import Path
+
+# Add the project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.handlers.audio_handler import AudioHandler
+
+def get_audio_duration(filename):
+    """Get duration of a WAV file in seconds"""
+    with wave.open(filename, 'rb') as wav_file:
+        return wav_file.getnframes() / float(wav_file.getframerate())
+
+def benchmark_service(handler, service, filename, runs):
+    """Run one transcription service several times and collect timings"""
+    if service == 'race':
+        transcriber = lambda name: handler.transcribe_race(name)['text']
+    else:
+        transcriber = handler.transcribers[service]
+    
+    # Untimed warm-up run (model load, TLS handshake, etc.)
+    warmup_start = time.perf_counter()
+    text = transcriber(filename)
+    warmup_time = time.perf_counter() - warmup_start
+    
+    latencies = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        text = transcriber(filename)
+        latencies.append(time.perf_counter() - start_time)
+    
+    # Backends may return (text, confidence)
+    if isinstance(text, tuple):
+        text = text[0]
+    return warmup_time, latencies, text
+
+def main():
+    """Main benchmark function"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    
+    filename = sys.argv[1]
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    
+    handler = AudioHandler()
+    services = sys.argv[3:] or list(handler.transcribers.keys())
+    duration = get_audio_duration(filename)
+    
+    print(f"Audio: {filename} ({duration:.2f}s), {runs} runs per service")
+    print(f"{'Service':<16}{'First (s)':>10}{'Mean (s)':>10}{'Min (s)':>10}{'RTF':>8}  Text")
+    
+    for service in services:
+        if service != 'race' and service not in handler.transcribers:
+            print(f"{service:<16}unknown service")
+            continue
+        
+        try:
+            warmup_time, latencies, text = benchmark_service(handler, service, filename, runs)
+        except Exception as e:
+            print(f"{service:<16}failed: {e}")
+            continue
+        
+        mean_latency = sum(latencies) / len(latencies) if latencies else warmup_time
+        min_latency = min(latencies) if latencies else warmup_time
+        rtf = mean_latency / duration if duration else 0.0
+        preview = (text or "<no result>")[:40]
+        print(f"{service:<16}{warmup_time:>10.2f}{mean_latency:>10.2f}{min_latency:>10.2f}{rtf:>8.2f}  {preview}")
+    
+    # Race statistics are only populated when "race" was benchmarked
+    stats = handler.get_transcription_stats()
+    if any(entry['races'] for entry in stats.values()):
+        print("\nRace statistics:")
+        for service, entry in stats.items():
+            win_rate = entry['win_rate'] or 0.0
+            print(f"  {service:<16}wins {entry['wins']}/{entry['races']} ({win_rate:.0%}), "
+                  f"mean latency {entry['mean_latency']:.2f}s")
+
+if __name__ == "__main__":
+    main()
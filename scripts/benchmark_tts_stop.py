@@ -0,0 +1,102 @@
+"""
+ScreenAsk TTS Stop Latency Benchmark
+Measures how long each TTS engine takes to go quiet after stop().
+
+Usage:
+    python scripts/benchmark_tts_stop.py [trials] [engine ...]
+
+Engines are local, google and openai (default: every available one). Each
+trial speaks a long answer, waits for audio to start, stops it at a random
+moment and records TTSHandler's measured stop latency (from stop() to the end
+of the utterance). pyttsx3 can only be stopped from its word and utterance
+callbacks, so its latency depends on the platform driver.
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+# Add the project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.handlers import tts_handler
+from src.handlers.tts_handler import TTSHandler
+
+TEXT = ("The export button is in the lower right corner of the dialog, next to Cancel. "
+        "Click it to open the export options. Choose a file format from the list at the top. "
+        "Then pick the folder you want to save to and confirm with the Save button. "
+        "The progress of the export is shown in the status bar at the bottom of the window.")
+
+def engine_available(tts, engine):
+    """Check whether an engine can be benchmarked"""
+    if engine == 'google':
+        return tts_handler.GTTS_AVAILABLE
+    if engine == 'openai':
+        tts.services.get_openai_handler()
+        return tts._openai_tts_available()
+    return tts.engine is not None
+
+def wait_for_audio(tts, future, timeout=15.0):
+    """Wait until the utterance has started playing; False if it ended or never started"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline and not future.done():
+        metrics = tts.current_metrics
+        if metrics and metrics['starts']:
+            return True
+        time.sleep(0.005)
+    return False
+
+def benchmark_engine(tts, engine, trials, rng):
+    """Stop speech at random moments and collect the stop latencies"""
+    tts._get_tts_engine_to_use = lambda: engine
+    latencies = []
+    for _ in range(trials):
+        future = tts.speak(TEXT, blocking=False)
+        if not wait_for_audio(tts, future):
+            tts.stop()
+            future.result(timeout=30.0)
+            continue
+        
+        # Stop somewhere in the first few sentences
+        time.sleep(rng.uniform(0.1, 2.0))
+        if future.done():
+            continue
+        tts.stop()
+        future.result(timeout=30.0)
+        if tts.last_stop_latency is not None:
+            latencies.append(tts.last_stop_latency)
+    return latencies
+
+def main():
+    """Main benchmark function"""
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    engines = sys.argv[2:] or ['local', 'google', 'openai']
+    rng = random.Random(0)
+    
+    tts = TTSHandler()
+    tts._submit(lambda: None).result(timeout=30.0)  # Wait for the engines to be created
+    
+    print(f"{trials} stops per engine")
+    print(f"{'Engine':<10}{'Stops':>6}{'Min (ms)':>10}{'Median':>10}{'Mean':>10}{'Max':>10}")
+    try:
+        for engine in engines:
+            if not engine_available(tts, engine):
+                print(f"{engine:<10}not available")
+                continue
+            
+            latencies = sorted(latency * 1000 for latency in benchmark_engine(tts, engine, trials, rng))
+            if not latencies:
+                print(f"{engine:<10}no utterance was stopped while playing")
+                continue
+            mean = sum(latencies) / len(latencies)
+            median = latencies[len(latencies) // 2]
+            print(f"{engine:<10}{len(latencies):>6}{latencies[0]:>10.0f}{median:>10.0f}{mean:>10.0f}"
+                  f"{latencies[-1]:>10.0f}")
+    finally:
+        tts.shutdown()
+
+if __name__ == "__main__":
+    main()
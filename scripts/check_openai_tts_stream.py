@@ -0,0 +1,267 @@
+"""
+ScreenAsk OpenAI Speech Streaming Check
+Runs TTSHandler's OpenAI engine against a local server that streams PCM slowly.
+
+Usage:
+    python scripts/check_openai_tts_stream.py [chunk delay ms]
+
+The server answers POST /v1/audio/speech with one second of 24 kHz PCM per
+request, sent in 50 ms chunks with a delay between them, and the OpenAI base_url
+points at it. The sound device is replaced by a stream that records what is
+written, in real time. It checks that playback starts before the download
+finishes, that every sentence is requested and played, that a second
+run is served from the cache without requests, and that stop aborts both the
+output stream and the download without caching the partial audio.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+from types import SimpleNamespace
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add the project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.core.config import Config
+from src.core.services import ServiceContainer
+from src.handlers import tts_handler
+from src.handlers.tts_handler import TTSHandler, OPENAI_TTS_SAMPLE_RATE, OPENAI_TTS_CHUNK_BYTES
+
+# One second of audio per request
+RESPONSE_CHUNKS = 20
+
+TEXT = "The export button is in the lower right corner. It is next to Cancel. Click it to save the file."
+STOP_TEXT = "This answer is stopped while its first sentence is still downloading. It is never finished."
+
+class SpeechServer(ThreadingHTTPServer):
+    """Local stand-in for the OpenAI speech endpoint that logs every request"""
+    daemon_threads = True
+    
+    def __init__(self, chunk_delay):
+        super().__init__(('127.0.0.1', 0), SpeechRequestHandler)
+        self.chunk_delay = chunk_delay
+        self.requests = []
+        self.lock = threading.Lock()
+    
+    @property
+    def base_url(self):
+        """The OpenAI base_url for this server"""
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+class SpeechRequestHandler(BaseHTTPRequestHandler):
+    """Streams a tone as raw PCM, one chunk every chunk_delay seconds"""
+    
+    def do_POST(self):
+        """Answer a speech request"""
+        if self.path != '/v1/audio/speech':
+            self.send_error(404)
+            return
+        
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        record = {'input': body['input'], 'format': body.get('response_format'), 'started': time.perf_counter(),
+                  'finished': None, 'sent': 0, 'complete': False}
+        with self.server.lock:
+            self.server.requests.append(record)
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'audio/pcm')
+        self.end_headers()
+        
+        # A square wave at 1 kHz so the audio is not all zeros
+        period = bytes(24 * [0x00, 0x20]) + bytes(24 * [0x00, 0xe0])
+        chunk = (period * (OPENAI_TTS_CHUNK_BYTES // len(period) + 1))[:OPENAI_TTS_CHUNK_BYTES]
+        try:
+            for _ in range(RESPONSE_CHUNKS):
+                time.sleep(self.server.chunk_delay)
+                self.wfile.write(chunk)
+                self.wfile.flush()
+                record['sent'] += len(chunk)
+            record['complete'] = True
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client closed the download
+        record['finished'] = time.perf_counter()
+    
+    def log_message(self, format, *args):
+        """Keep the check's output free of access logs"""
+        pass
+
+class RecordingStream:
+    """Replaces sounddevice.RawOutputStream; writes block for the audio's duration like a device"""
+    streams = []
+    
+    def __init__(self, samplerate, channels, dtype):
+        self.samplerate = samplerate
+        self.writes = []
+        self.aborted = False
+        self.closed = False
+        RecordingStream.streams.append(self)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.closed = True
+    
+    def write(self, data):
+        """Record a write and wait as long as the audio would play"""
+        self.writes.append((time.perf_counter(), len(data)))
+        time.sleep(len(data) / (self.samplerate * 2))
+    
+    def abort(self):
+        """Record that buffered audio was dropped"""
+        self.aborted = True
+    
+    @property
+    def bytes_written(self):
+        """Total bytes written to the stream"""
+        return sum(size for _, size in self.writes)
+
+def check(errors, condition, message):
+    """Record a failed check"""
+    if not condition:
+        errors.append(message)
+
+def cache_key(tts):
+    """The (language, voice) TTSHandler caches OpenAI speech under"""
+    voice = f"{tts.config.get('TTS', 'openai_model', 'tts-1')}/{tts.config.get('TTS', 'openai_voice', 'alloy')}"
+    return tts.config.get('Audio', 'language', 'en-US'), voice
+
+def check_streaming(tts, server, errors):
+    """Speak uncached text and check progressive playback and per-sentence requests"""
+    sentences = tts._split_sentences(TEXT)
+    tts.speak(TEXT)
+    stream = RecordingStream.streams[-1]
+    requests = list(server.requests)
+    
+    # The first two sentences are requested at the same time, so requests may arrive in any order
+    inputs = [request['input'] for request in requests]
+    check(errors, sorted(inputs) == sorted(sentences), f"requests {inputs} do not match sentences {sentences}")
+    check(errors, all(request['format'] == 'pcm' for request in requests), "speech not requested as pcm")
+    check(errors, all(request['complete'] for request in requests), "a download was cut short")
+    check(errors, stream.bytes_written == sum(request['sent'] for request in requests),
+          f"played {stream.bytes_written} bytes of {sum(request['sent'] for request in requests)} downloaded")
+    first = next((request for request in requests if request['input'] == sentences[0]), None)
+    if first and stream.writes:
+        first_audio = stream.writes[0][0]
+        check(errors, first_audio < first['finished'], "playback started only after the first download finished")
+        print(f"First audio {(first_audio - first['started']) * 1000:.0f} ms into the first download, "
+              f"which took {(first['finished'] - first['started']) * 1000:.0f} ms")
+    else:
+        errors.append("nothing was requested or played")
+    return sentences
+
+def check_cache(tts, server, sentences, errors):
+    """Speak the same text again; it must be played from the cache without requests"""
+    language, cache_voice = cache_key(tts)
+    for sentence in sentences:
+        check(errors, tts.audio_cache.get(sentence, language, 'openai', cache_voice) is not None,
+              f"not cached: {sentence!r}")
+    
+    request_count = len(server.requests)
+    start = time.perf_counter()
+    tts.speak(TEXT)
+    stream = RecordingStream.streams[-1]
+    check(errors, len(server.requests) == request_count,
+          f"{len(server.requests) - request_count} requests for cached speech")
+    check(errors, stream.bytes_written == len(sentences) * RESPONSE_CHUNKS * OPENAI_TTS_CHUNK_BYTES,
+          f"played {stream.bytes_written} bytes from the cache")
+    if stream.writes:
+        print(f"Cached: first audio after {(stream.writes[0][0] - start) * 1000:.0f} ms")
+
+def check_stop(tts, server, errors):
+    """Stop during the first download; the stream and the download must both be aborted"""
+    request_count = len(server.requests)
+    first_sentence = tts._split_sentences(STOP_TEXT)[0]
+    future = tts.speak(STOP_TEXT, blocking=False)
+    
+    # Stop after three chunks have been played
+    deadline = time.perf_counter() + 5.0
+    while time.perf_counter() < deadline:
+        streams = RecordingStream.streams
+        if streams and len(streams[-1].writes) >= 3 and len(server.requests) > request_count:
+            break
+        time.sleep(0.005)
+    stream = RecordingStream.streams[-1]
+    tts.stop()
+    future.result(timeout=5.0)
+    played = stream.bytes_written
+    
+    # The server notices the closed connection on its next write
+    requests = server.requests[request_count:]
+    request = next(request for request in requests if request['input'] == first_sentence)
+    deadline = time.perf_counter() + 2.0
+    while any(request['finished'] is None for request in requests) and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    
+    check(errors, stream.aborted, "stop did not abort the output stream")
+    check(errors, played < RESPONSE_CHUNKS * OPENAI_TTS_CHUNK_BYTES, "the whole first sentence was played")
+    check(errors, not request['complete'], "the download ran to completion after stop")
+    check(errors, tts.last_stop_latency is not None, "no stop latency was recorded")
+    language, cache_voice = cache_key(tts)
+    for sentence in tts._split_sentences(STOP_TEXT):
+        check(errors, tts.audio_cache.get(sentence, language, 'openai', cache_voice) is None,
+              f"audio of a stopped answer was cached: {sentence!r}")
+    
+    if tts.last_stop_latency is not None:
+        print(f"Stopped after {played / (OPENAI_TTS_SAMPLE_RATE * 2) * 1000:.0f} ms of audio, "
+              f"{tts.last_stop_latency * 1000:.0f} ms after the stop request; "
+              f"download sent {request['sent']} of {RESPONSE_CHUNKS * OPENAI_TTS_CHUNK_BYTES} bytes")
+
+def main():
+    """Main check function"""
+    chunk_delay = (float(sys.argv[1]) if len(sys.argv) > 1 else 50.0) / 1000
+    
+    server = SpeechServer(chunk_delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    # Record instead of playing
+    tts_handler.sd = SimpleNamespace(RawOutputStream=RecordingStream)
+    tts_handler.STREAMING_PLAYBACK_AVAILABLE = True
+    
+    # Config reads and writes settings.ini in the working directory, so run in a scratch one
+    original_cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix='screenask-tts-')
+    os.chdir(work_dir)
+    tts = None
+    errors = []
+    try:
+        config = Config()
+        config.set('OpenAI', 'api_key', 'sk-local-check')
+        config.set('OpenAI', 'base_url', server.base_url)
+        config.set('TTS', 'engine', 'openai')
+        config.set('TTS', 'cache_enabled', 'true')
+        config.set('Audio', 'language', 'en-US')
+        
+        services = ServiceContainer(config)
+        services.get_openai_handler()
+        tts = TTSHandler(services)
+        
+        sentences = check_streaming(tts, server, errors)
+        check_cache(tts, server, sentences, errors)
+        check_stop(tts, server, errors)
+    finally:
+        if tts is not None:
+            tts.shutdown()
+            tts.worker_thread.join(timeout=5.0)
+        server.shutdown()
+        os.chdir(original_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    print(f"{len(server.requests)} requests, {len(RecordingStream.streams)} output streams")
+    if errors:
+        for error in errors:
+            print(f"ERROR: {error}")
+        print(f"FAILED with {len(errors)} errors")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+ScreenAsk Sentence Segmenter Corpus Check
+Runs split_sentences over a corpus of hand-split texts in every supported language.
+
+Usage:
+    python scripts/check_sentence_segmenter.py [max_chars]
+
+Each language has cases for abbreviations, decimals, ordinals, ellipses,
+quotes and line breaks, written the way TTS answers actually look. A case
+passes when the segmenter returns exactly the expected sentences. A second
+pass splits every text with max_chars (default 250) and checks that no
+chunk is longer than the limit unless it has no clause punctuation to break
+at, and that no text is lost.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.utils.sentence_segmenter import split_sentences, CLAUSE_PATTERN
+
+# (language, feature, text, expected sentences)
+CORPUS = [
+    # English
+    ('en-US', 'abbreviation', "Ask Dr. Smith about it. Then click Save.",
+     ["Ask Dr. Smith about it.", "Then click Save."]),
+    ('en-US', 'abbreviation', "Use a shortcut, e.g. Ctrl+S. It saves the file.",
+     ["Use a shortcut, e.g. Ctrl+S.", "It saves the file."]),
+    ('en-US', 'initials', "The book is by J. K. Rowling. It is on the shelf.",
+     ["The book is by J. K. Rowling.", "It is on the shelf."]),
+    ('en-US', 'decimal', "Set the zoom to 1.5 times. The text gets bigger.",
+     ["Set the zoom to 1.5 times.", "The text gets bigger."]),
+    ('en-US', 'ordinal', "Click the 3rd tab. It is labelled Tools.",
+     ["Click the 3rd tab.", "It is labelled Tools."]),
+    ('en-US', 'ellipsis', "Open the menu... Then pick Export. Wait… Done!",
+     ["Open the menu...", "Then pick Export.", "Wait…", "Done!"]),
+    ('en-US', 'ellipsis', "It says loading... please wait. Then it opens.",
+     ["It says loading... please wait.", "Then it opens."]),
+    ('en-US', 'quotes', 'The button says "Save." Click it. Is it "Open?" No.',
+     ['The button says "Save."', "Click it.", 'Is it "Open?"', "No."]),
+    ('en-US', 'quotes', 'Click Save. “Next” appears below.',
+     ["Click Save.", "“Next” appears below."]),
+    ('en-GB', 'line break', "Steps to follow:\n1. Open File\n2. Choose Save As\nDone",
+     ["Steps to follow:", "1. Open File", "2. Choose Save As", "Done"]),
+    ('en-GB', 'abbreviation', "Mrs. Jones sent it at approx. 5 pm. Reply soon.",
+     ["Mrs. Jones sent it at approx. 5 pm.", "Reply soon."]),
+    
+    # Spanish
+    ('es-ES', 'abbreviation', "Llame al Sr. García mañana. Él tiene el archivo.",
+     ["Llame al Sr. García mañana.", "Él tiene el archivo."]),
+    ('es-ES', 'decimal', "La versión 2.4 ya está instalada. Reinicie el equipo.",
+     ["La versión 2.4 ya está instalada.", "Reinicie el equipo."]),
+    ('es-ES', 'ordinal', "Abra la 2.ª pestaña. Allí está el botón.",
+     ["Abra la 2.ª pestaña.", "Allí está el botón."]),
+    ('es-ES', 'ellipsis', "Espere... ¿Ya cargó? ¡Perfecto!",
+     ["Espere...", "¿Ya cargó?", "¡Perfecto!"]),
+    ('es-ES', 'quotes', 'El botón dice «Guardar.» Haga clic en él.',
+     ['El botón dice «Guardar.»', "Haga clic en él."]),
+    ('es-ES', 'line break', "Pasos:\nAbra el menú\nElija Exportar",
+     ["Pasos:", "Abra el menú", "Elija Exportar"]),
+    
+    # French
+    ('fr-FR', 'abbreviation', "Parlez au Dr. Martin. Il connaît le logiciel.",
+     ["Parlez au Dr. Martin.", "Il connaît le logiciel."]),
+    ('fr-FR', 'abbreviation', "Voir p. 12 du manuel. Ensuite, cliquez sur OK.",
+     ["Voir p. 12 du manuel.", "Ensuite, cliquez sur OK."]),
+    ('fr-FR', 'decimal', "Le prix est de 3,50 euros ou 3.50 dollars. C'est tout.",
+     ["Le prix est de 3,50 euros ou 3.50 dollars.", "C'est tout."]),
+    ('fr-FR', 'ordinal', "Cliquez sur le 1er onglet. Il s'appelle Accueil.",
+     ["Cliquez sur le 1er onglet.", "Il s'appelle Accueil."]),
+    ('fr-FR', 'ellipsis', "Attendez… Voilà ! C'est prêt.",
+     ["Attendez…", "Voilà !", "C'est prêt."]),
+    ('fr-FR', 'quotes', "Le bouton indique « Enregistrer. » Cliquez dessus.",
+     ["Le bouton indique « Enregistrer. »", "Cliquez dessus."]),
+    ('fr-FR', 'line break', "Étapes :\nOuvrez le menu\nChoisissez Exporter",
+     ["Étapes :", "Ouvrez le menu", "Choisissez Exporter"]),
+    
+    # German
+    ('de-DE', 'abbreviation', "Öffnen Sie z.B. Word. Dort finden Sie die Vorlage.",
+     ["Öffnen Sie z.B. Word.", "Dort finden Sie die Vorlage."]),
+    ('de-DE', 'abbreviation', "Fragen Sie Dr. Müller bzw. Fr. Schmidt. Beide helfen.",
+     ["Fragen Sie Dr. Müller bzw. Fr. Schmidt.", "Beide helfen."]),
+    ('de-DE', 'decimal', "Die Datei hat 2.5 MB. Das ist klein.",
+     ["Die Datei hat 2.5 MB.", "Das ist klein."]),
+    ('de-DE', 'ordinal', "Das Update kommt am 3. Mai. Bitte speichern Sie vorher.",
+     ["Das Update kommt am 3. Mai.", "Bitte speichern Sie vorher."]),
+    ('de-DE', 'ellipsis', "Einen Moment... Jetzt ist es geladen.",
+     ["Einen Moment...", "Jetzt ist es geladen."]),
+    ('de-DE', 'quotes', 'Die Schaltfläche heißt „Speichern.“ Klicken Sie darauf.',
+     ['Die Schaltfläche heißt „Speichern.“', "Klicken Sie darauf."]),
+    ('de-DE', 'line break', "Schritte:\nMenü öffnen\nExport wählen",
+     ["Schritte:", "Menü öffnen", "Export wählen"]),
+    
+    # Italian
+    ('it-IT', 'abbreviation', "Chieda al Sig. Rossi. Lui ha la password.",
+     ["Chieda al Sig. Rossi.", "Lui ha la password."]),
+    ('it-IT', 'abbreviation', "Scriva al dott. Bianchi. Risponde subito.",
+     ["Scriva al dott. Bianchi.", "Risponde subito."]),
+    ('it-IT', 'decimal', "La versione 1.2 è vecchia. Aggiorni il programma.",
+     ["La versione 1.2 è vecchia.", "Aggiorni il programma."]),
+    ('it-IT', 'ordinal', "Apra la 2ª scheda. Lì trova il pulsante.",
+     ["Apra la 2ª scheda.", "Lì trova il pulsante."]),
+    ('it-IT', 'ellipsis', "Un attimo… Ecco fatto!",
+     ["Un attimo…", "Ecco fatto!"]),
+    ('it-IT', 'quotes', 'Il pulsante dice "Salva." Lo prema.',
+     ['Il pulsante dice "Salva."', "Lo prema."]),
+    ('it-IT', 'line break', "Passi:\nApra il menu\nScelga Esporta",
+     ["Passi:", "Apra il menu", "Scelga Esporta"]),
+    
+    # Portuguese
+    ('pt-PT', 'abbreviation', "Fale com o Sr. Silva. Ele tem a chave.",
+     ["Fale com o Sr. Silva.", "Ele tem a chave."]),
+    ('pt-PT', 'decimal', "O ficheiro tem 4.2 MB. Pode enviá-lo.",
+     ["O ficheiro tem 4.2 MB.", "Pode enviá-lo."]),
+    ('pt-PT', 'ordinal', "Abra o 1.º separador. Lá está o botão.",
+     ["Abra o 1.º separador.", "Lá está o botão."]),
+    ('pt-PT', 'ellipsis', "Aguarde... Pronto!",
+     ["Aguarde...", "Pronto!"]),
+    ('pt-PT', 'quotes', 'O botão diz "Guardar." Clique nele.',
+     ['O botão diz "Guardar."', "Clique nele."]),
+    ('pt-PT', 'line break', "Passos:\nAbra o menu\nEscolha Exportar",
+     ["Passos:", "Abra o menu", "Escolha Exportar"]),
+    
+    # Russian
+    ('ru-RU', 'abbreviation', "Офис на ул. Ленина. Вход со двора.",
+     ["Офис на ул. Ленина.", "Вход со двора."]),
+    ('ru-RU', 'abbreviation', "Нажмите кнопку, т.е. Сохранить. Файл сохранится.",
+     ["Нажмите кнопку, т.е. Сохранить.", "Файл сохранится."]),
+    ('ru-RU', 'decimal', "Версия 3.1 устарела. Обновите программу.",
+     ["Версия 3.1 устарела.", "Обновите программу."]),
+    ('ru-RU', 'ordinal', "Откройте 2-ю вкладку. Там есть кнопка.",
+     ["Откройте 2-ю вкладку.", "Там есть кнопка."]),
+    ('ru-RU', 'ellipsis', "Подождите… Готово!",
+     ["Подождите…", "Готово!"]),
+    ('ru-RU', 'quotes', "Кнопка называется «Сохранить.» Нажмите её.",
+     ["Кнопка называется «Сохранить.»", "Нажмите её."]),
+    ('ru-RU', 'line break', "Шаги:\nОткройте меню\nВыберите Экспорт",
+     ["Шаги:", "Откройте меню", "Выберите Экспорт"]),
+    
+    # Turkish
+    ('tr-TR', 'abbreviation', "Dr. Ayşe Yılmaz ile görüşün. O yardım eder.",
+     ["Dr. Ayşe Yılmaz ile görüşün.", "O yardım eder."]),
+    ('tr-TR', 'abbreviation', "Bir program açın, örn. Excel. Sonra dosyayı seçin.",
+     ["Bir program açın, örn. Excel.", "Sonra dosyayı seçin."]),
+    ('tr-TR', 'decimal', "Dosya 1.5 MB boyutunda. İndirebilirsiniz.",
+     ["Dosya 1.5 MB boyutunda.", "İndirebilirsiniz."]),
+    ('tr-TR', 'ordinal', "Listede 2. Dosya seçili. Onu açın.",
+     ["Listede 2. Dosya seçili.", "Onu açın."]),
+    ('tr-TR', 'ellipsis', "Bekleyin... İşlem bitti!",
+     ["Bekleyin...", "İşlem bitti!"]),
+    ('tr-TR', 'quotes', 'Düğmede "Kaydet." yazıyor. Ona tıklayın.',
+     ['Düğmede "Kaydet." yazıyor.', "Ona tıklayın."]),
+    ('tr-TR', 'line break', "Adımlar:\nMenüyü açın\nDışa Aktar'ı seçin",
+     ["Adımlar:", "Menüyü açın", "Dışa Aktar'ı seçin"]),
+]
+
+LANGUAGES = ['en-US', 'en-GB', 'es-ES', 'fr-FR', 'de-DE', 'it-IT', 'pt-PT', 'ru-RU', 'tr-TR']
+
+def check_max_chars(language, text, max_chars):
+    """Split with a length limit and return problems with the chunks"""
+    problems = []
+    chunks = split_sentences(text, language, max_chars=max_chars)
+    if ''.join(''.join(chunks).split()) != ''.join(text.split()):
+        problems.append("text was lost or changed by splitting")
+    for chunk in chunks:
+        if len(chunk) > max_chars and len(CLAUSE_PATTERN.split(chunk)) > 1:
+            problems.append(f"chunk of {len(chunk)} chars could have been split: {chunk[:40]}...")
+    return problems
+
+def main():
+    """Main check function"""
+    max_chars = int(sys.argv[1]) if len(sys.argv) > 1 else 250
+    
+    failures = []
+    features = {}
+    for language, feature, text, expected in CORPUS:
+        features.setdefault(language, set()).add(feature)
+        actual = split_sentences(text, language)
+        if actual != expected:
+            failures.append(f"{language} {feature}: {text!r}\n    expected {expected}\n    got      {actual}")
+    
+    # A long answer per language, made of the corpus texts, exercises the clause splitter
+    for language in LANGUAGES:
+        long_text = ' '.join(text.replace('\n', ' ') for case_language, _, text, _ in CORPUS
+                             if case_language == language) * 5
+        for problem in check_max_chars(language, long_text, max_chars):
+            failures.append(f"{language} max_chars={max_chars}: {problem}")
+    
+    missing = [language for language in LANGUAGES if not features.get(language)]
+    if missing:
+        failures.append(f"no corpus cases for {', '.join(missing)}")
+    
+    print(f"{len(CORPUS)} cases in {len(features)} languages, max_chars {max_chars}")
+    if failures:
+        print(f"FAILED with {len(failures)} errors:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
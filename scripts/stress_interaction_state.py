@@ -0,0 +1,345 @@
+"""
+ScreenAsk Interaction State Stress Test
+Fires randomized press/release/stop sequences at a real ScreenAskApp.
+
+Usage:
+    python scripts/stress_interaction_state.py [sequences] [seed]
+
+The app's screenshot, audio, OpenAI and TTS handlers are replaced by stubs with
+random delays, injected into ScreenAskApp.handlers; tray, GUI and overlay are
+not started. Hotkey events go through HotkeyHandler's dispatch to the 'capture'
+worker in key order, from one thread like the keyboard hook, with a random
+hotkey profile per sequence, overlapping chords and stop presses. It checks
+that every recorded transition is allowed, that the recorder is never started
+twice, that every question is analyzed with the screenshot taken for it, and
+that the app always settles in idle with an empty capture queue.
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import threading
+import contextlib
+import concurrent.futures
+from pathlib import Path
+
+# Add the project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.core.main import ScreenAskApp
+from src.core.interaction_state import TRANSITIONS, IDLE
+
+# Hotkey profiles used by the sequences: 'quick' has no audio, the others record
+PROFILES = ['default', 'quick', 'window']
+
+class StubHandlers:
+    """Shared random delays and error log of the stub handlers"""
+    
+    def __init__(self, rng):
+        self.rng = rng
+        self.rng_lock = threading.Lock()
+        self.errors = []
+        self.errors_lock = threading.Lock()
+    
+    def delay(self, scale=0.002):
+        """Sleep for a random short stage duration"""
+        with self.rng_lock:
+            duration = self.rng.random() * scale
+        time.sleep(duration)
+    
+    def chance(self, probability):
+        """Draw a random event"""
+        with self.rng_lock:
+            return self.rng.random() < probability
+    
+    def error(self, message):
+        """Record an invariant violation"""
+        with self.errors_lock:
+            self.errors.append(message)
+
+class StubScreenshotHandler:
+    """Returns a unique screenshot per capture; a few captures fail"""
+    
+    def __init__(self, stubs):
+        self.stubs = stubs
+        self.captures = 0
+        self.last_screen_hash = None
+        self.last_capture_geometry = None
+        self.screen_size = (1920, 1080)
+    
+    def capture_screenshot(self, region='full', scale=1.0):
+        """Simulate a capture"""
+        self.stubs.delay()
+        if self.stubs.chance(0.03):
+            return None
+        self.captures += 1
+        self.last_screen_hash = f"shot-{self.captures}"
+        return self.last_screen_hash
+    
+    def to_screen_coordinates(self, x, y, r, geometry):
+        """Screenshots are full screen, so coordinates need no mapping"""
+        return x, y, r
+
+class StubAudioHandler:
+    """A single recorder; remembers which screenshot each recording was made for"""
+    
+    def __init__(self, stubs, screenshot_handler):
+        self.stubs = stubs
+        self.screenshot_handler = screenshot_handler
+        self.lock = threading.Lock()
+        self.recording = False
+        self.recording_screenshot = None
+        self.saved = {}
+    
+    def start_recording(self):
+        """Start recording, which fails the test if the recorder is busy"""
+        with self.lock:
+            if self.recording:
+                self.stubs.error(f"recorder started twice (for {self.screenshot_handler.last_screen_hash})")
+            self.recording = True
+            self.recording_screenshot = self.screenshot_handler.last_screen_hash
+    
+    def stop_recording(self):
+        """Stop recording"""
+        with self.lock:
+            self.recording = False
+    
+    def detect_speech(self):
+        """Speech gate; a few recordings have no speech"""
+        self.stubs.delay()
+        if self.stubs.chance(0.1):
+            return False, "no speech (stress test)"
+        return True, None
+    
+    def save_recording(self, filename):
+        """Remember the recording's screenshot under its filename"""
+        with self.lock:
+            self.saved[filename] = self.recording_screenshot
+        return filename
+    
+    def transcribe_audio(self, filename):
+        """Transcribe into a question naming the screenshot it was recorded for"""
+        self.stubs.delay()
+        with self.lock:
+            return f"question about {self.saved[filename]}"
+    
+    def is_transcript_confident(self, result=None):
+        """Every stub transcript is confident"""
+        return True
+    
+    def delete_recording(self, filename):
+        """Forget a processed recording"""
+        with self.lock:
+            self.saved.pop(filename, None)
+
+class StubOpenAIHandler:
+    """Answers after a delay and checks the question belongs to the screenshot"""
+    
+    def __init__(self, stubs):
+        self.stubs = stubs
+        self.descriptions = {}
+        self.answers = 0
+    
+    def is_configured(self):
+        """The stub is always configured"""
+        return True
+    
+    def analyze_screenshot_with_text(self, screenshot, user_text, profile=None, image_size=None):
+        """Answer a question about a screenshot"""
+        if user_text and user_text != f"question about {screenshot}":
+            self.stubs.error(f"'{user_text}' analyzed with {screenshot}")
+        self.stubs.delay()
+        self.answers += 1
+        return f"answer about {screenshot}"
+    
+    def parse_structured_response(self, response):
+        """Wrap the answer in one point of interest"""
+        return {'points': [{'x': 100, 'y': 100, 'r': 30, 'label': ''}], 'tx': response}, None
+    
+    def cache_description(self, screen_hash, response):
+        """Remember the answer for the speech gate's cache fallback"""
+        self.descriptions[screen_hash] = response
+    
+    def get_cached_description(self, screen_hash):
+        """Get a remembered answer"""
+        return self.descriptions.get(screen_hash)
+
+class StubTTSHandler:
+    """Speech that finishes on a timer thread unless stopped"""
+    
+    def __init__(self, stubs):
+        self.stubs = stubs
+        self.lock = threading.Lock()
+        self.pending = []
+    
+    def speak(self, text, blocking=False):
+        """Start speaking, returning a Future that completes when speech ends"""
+        future = concurrent.futures.Future()
+        with self.lock:
+            self.pending.append(future)
+        with self.stubs.rng_lock:
+            duration = self.stubs.rng.random() * 0.003
+        threading.Timer(duration, self._finish, args=(future,)).start()
+        return future
+    
+    def _finish(self, future):
+        """End one utterance"""
+        with self.lock:
+            if future not in self.pending:
+                return
+            self.pending.remove(future)
+        future.set_result(None)
+    
+    def stop(self):
+        """End every utterance now"""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        for future in pending:
+            future.set_result(None)
+
+class StubTray:
+    """Swallows notifications"""
+    
+    def notify(self, title, message):
+        """Ignore a notification"""
+        pass
+
+class StubOverlay:
+    """Draws nothing"""
+    
+    def show_circles(self, points):
+        """Ignore the points"""
+        pass
+
+def create_app(stubs):
+    """Build a ScreenAskApp whose handlers are the stubs"""
+    app = ScreenAskApp()
+    app.main_gui = None
+    app.tray_handler = StubTray()
+    app.circle_overlay = StubOverlay()
+    
+    screenshot_handler = StubScreenshotHandler(stubs)
+    app.handlers.update({
+        'screenshot_handler': screenshot_handler,
+        'audio_handler': StubAudioHandler(stubs, screenshot_handler),
+        'openai_handler': StubOpenAIHandler(stubs),
+        'tts_handler': StubTTSHandler(stubs)
+    })
+    app.interaction.history = []  # Keep the full history for checking
+    return app
+
+def make_sequence(rng):
+    """Hotkey events of one sequence, in key order: one chord, or two overlapping ones"""
+    owner = rng.choice(PROFILES)
+    if rng.random() < 0.2:
+        other = rng.choice([profile for profile in PROFILES if profile != owner])
+        releases = [('release', owner), ('release', other)]
+        rng.shuffle(releases)
+        events = [('press', owner), ('press', other)] + releases
+    else:
+        events = [('press', owner), ('release', owner)]
+    
+    if rng.random() < 0.1:
+        events.insert(rng.randint(0, len(events)), ('stop', None))
+    return events
+
+def send(app, kind, owner):
+    """Dispatch one hotkey event like HotkeyHandler's keyboard hook"""
+    if kind == 'press':
+        app.hotkey_handler._on_hotkey_press(owner)
+    elif kind == 'release':
+        app.hotkey_handler._on_hotkey_release(owner)
+    else:
+        app.hotkey_handler._on_stop_speaking_press()
+
+def is_settled(app):
+    """Check that nothing is running, queued or being spoken"""
+    pools = app.services.get_thread_metrics()['pools']
+    busy = any(stats['active'] or stats['queued'] for stats in pools.values())
+    return (not busy and app.interaction.get_state()[0] == IDLE and not app.pending_captures
+            and app.queued_capture is None and not app.handlers['tts_handler'].pending)
+
+def wait_until_settled(app, timeout):
+    """Wait for the app to go idle; returns whether it did"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if is_settled(app):
+            return True
+        time.sleep(0.001)
+    return is_settled(app)
+
+def check_settled(app, stubs, label):
+    """Check the app's state once it has settled"""
+    if not wait_until_settled(app, timeout=2.0):
+        state = app.interaction.get_state()[0]
+        stubs.error(f"{label}: app did not settle (state {state}, {len(app.pending_captures)} queued)")
+        app.hotkey_handler._on_stop_speaking_press()
+        wait_until_settled(app, timeout=2.0)
+        return
+    if app.current_screenshot is not None:
+        stubs.error(f"{label}: screenshot kept after the interaction ended")
+    if app.handlers['audio_handler'].recording:
+        stubs.error(f"{label}: recorder left running")
+
+def check_history(history):
+    """Check every recorded transition against the allowed transitions"""
+    errors = []
+    for _, token, from_state, to_state in history:
+        if to_state != IDLE and to_state not in TRANSITIONS[from_state]:
+            errors.append(f"invalid transition {from_state} -> {to_state} (token {token})")
+    return errors
+
+def run(app, stubs, rng, sequences):
+    """Send the sequences, sometimes letting the app settle in between"""
+    for sequence in range(sequences):
+        for kind, owner in make_sequence(rng):
+            send(app, kind, owner)
+            if rng.random() < 0.5:
+                time.sleep(rng.random() * 0.003)  # Key held or between keys
+        
+        # Sometimes let the sequence finish: every press/release must end in idle
+        if rng.random() < 0.3:
+            check_settled(app, stubs, f"sequence {sequence}")
+    check_settled(app, stubs, "end")
+
+def main():
+    """Main stress test function"""
+    sequences = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else int(time.time())
+    rng = random.Random(seed)
+    stubs = StubHandlers(random.Random(seed + 1))
+    
+    # The app writes its settings, chat journal and recordings to the working directory
+    original_cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix='screenask-stress-')
+    os.chdir(work_dir)
+    start_time = time.perf_counter()
+    try:
+        # The handlers log every stage; keep the report readable
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            app = create_app(stubs)
+            run(app, stubs, rng, sequences)
+            app.chat_history.close()
+            app.services.shutdown()
+    finally:
+        os.chdir(original_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    errors = stubs.errors + check_history(app.interaction.history)
+    elapsed = time.perf_counter() - start_time
+    print(f"{sequences} sequences (seed {seed}) in {elapsed:.1f}s: "
+          f"{app.handlers['openai_handler'].answers} answers, {len(app.interaction.history)} transitions")
+    if errors:
+        print(f"FAILED with {len(errors)} errors:")
+        for error in errors[:20]:
+            print(f"  {error}")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,48 @@
 import configparser
 import os
 
+# Prefix of the settings sections that define hotkey profiles, e.g. [Profile:quick]
+PROFILE_SECTION_PREFIX = 'Profile:'
+
+# Built-in profiles; each binds a hotkey to a capture/prompt/model preset.
+# prompt may contain {question} for the transcribed speech, model '' means the OpenAI model,
+# region is full, active_window or x,y,width,height, and scale downsizes the screenshot.
+PROFILE_PRESETS = {
+    'quick': {
+        'enabled': 'false',
+        'hotkey': 'ctrl+shift+d',
+        'prompt': 'Briefly describe what is on the screen in one or two sentences.',
+        'model': 'gpt-4o-mini',
+        'detail': 'low',
+        'region': 'full',
+        'scale': '0.5',
+        'audio': 'false',
+        'tts': 'true'
+    },
+    'window': {
+        'enabled': 'false',
+        'hotkey': 'ctrl+shift+w',
+        'prompt': '',
+        'model': '',
+        'detail': 'auto',
+        'region': 'active_window',
+        'scale': '1.0',
+        'audio': 'true',
+        'tts': 'true'
+    },
+    'point': {
+        'enabled': 'false',
+        'hotkey': 'ctrl+shift+p',
+        'prompt': '',
+        'model': '',
+        'detail': 'auto',
+        'region': 'full',
+        'scale': '1.0',
+        'audio': 'true',
+        'tts': 'false'
+    }
+}
+
 class Config:
     def __init__(self):
         self.config_file = "settings.ini"
@@ -19,11 +61,14 @@ class Config:
         self.config['General'] = {
             'hotkey': 'ctrl+shift+s',
             'stop_speaking_hotkey': 'ctrl+shift+x',
-            'auto_start': 'false'
+            'auto_start': 'false',
+            'warm_up': 'true',
+            'capture_queue_size': '2'
         }
         
         self.config['OpenAI'] = {
             'api_key': '',
+            'base_url': '',
             'model': 'gpt-4o',
             'max_tokens': '1000',
             'temperature': '0.1'  # Low temperature for consistent coordinate responses
@@ -32,13 +77,27 @@ class Config:
         self.config['Audio'] = {
             'language': 'en-US',
             'transcription_service': 'google',
-            'enable_recording': 'true'
+            'enable_recording': 'true',
+            'warm_stream': 'false',
+            'preroll_ms': '500',
+            'local_model': 'base',
+            'local_device': 'cpu',
+            'local_compute_type': 'int8',
+            'race_services': 'google,openai_whisper,local_whisper',
+            'race_timeout': '10',
+            'race_min_chars': '2',
+            'race_min_confidence': '0.5'
         }
         
         self.config['TTS'] = {
             'rate': '200',
             'volume': '0.8',
-            'engine': 'auto'
+            'engine': 'auto',
+            'openai_model': 'tts-1',
+            'openai_voice': 'alloy',
+            'cache_enabled': 'true',
+            'cache_dir': 'tts_cache',
+            'cache_max_mb': '50'
         }
         
         self.config['Response'] = {
@@ -54,12 +113,29 @@ class Config:
             'debug_coords': 'false'
         }
         
+        self.config['SpeechGate'] = {
+            'enabled': 'true',
+            'min_duration': '0.4',
+            'min_speech_ratio': '0.1',
+            'vad_threshold_db': '-45',
+            'min_confidence': '0.4',
+            'fallback': 'cache'
+        }
+        
+        self.config['ChatHistory'] = {
+            'store': 'journal',
+            'db_file': 'chat_history.db'
+        }
+        
         self.config['Prompts'] = {
             'system_prompt': 'You are a helpful AI assistant that analyzes screenshots and provides clear, concise answers.',
             'prepend_prompt': '',
             'append_prompt': 'Please be specific and helpful in your response.'
         }
         
+        for name, preset in PROFILE_PRESETS.items():
+            self.config[PROFILE_SECTION_PREFIX + name] = dict(preset)
+        
         self.save_config()
     
     def save_config(self):
@@ -102,6 +178,92 @@ class Config:
         """Set stop speaking hotkey combination"""
         self.set('General', 'stop_speaking_hotkey', hotkey)
     
+    def get_warm_up_enabled(self):
+        """Get whether connections, engines and devices are primed after startup"""
+        return self.get('General', 'warm_up', 'true').lower() == 'true'
+    
+    def set_warm_up_enabled(self, enabled):
+        """Set whether connections, engines and devices are primed after startup"""
+        self.set('General', 'warm_up', str(enabled).lower())
+    
+    def get_capture_queue_size(self):
+        """Get how many presses made while busy are queued instead of ignored (0 disables)"""
+        return int(self.get('General', 'capture_queue_size', '2'))
+    
+    def set_capture_queue_size(self, size):
+        """Set how many presses made while busy are queued instead of ignored (0 disables)"""
+        self.set('General', 'capture_queue_size', str(int(size)))
+    
+    def get_profile_names(self):
+        """Get the names of all hotkey profiles, the default profile first"""
+        names = ['default'] + list(PROFILE_PRESETS)
+        for section in self.config.sections():
+            if section.startswith(PROFILE_SECTION_PREFIX):
+                name = section[len(PROFILE_SECTION_PREFIX):]
+                if name and name not in names:
+                    names.append(name)
+        return names
+    
+    def get_profile(self, name):
+        """Get a hotkey profile as a dict; 'default' is the General hotkey with the global settings"""
+        if name == 'default':
+            return {
+                'name': 'default',
+                'enabled': True,
+                'hotkey': self.get_hotkey(),
+                'prompt': '',
+                'model': '',
+                'detail': 'auto',
+                'region': 'full',
+                'scale': 1.0,
+                'audio': self.get_audio_recording_enabled(),
+                'tts': True
+            }
+        
+        values = dict(PROFILE_PRESETS.get(name, {}))
+        section = PROFILE_SECTION_PREFIX + name
+        if section in self.config:
+            values.update(self.config[section])
+        
+        try:
+            scale = min(max(float(values.get('scale', '1.0')), 0.1), 1.0)
+        except ValueError:
+            scale = 1.0
+        
+        return {
+            'name': name,
+            'enabled': values.get('enabled', 'false').lower() == 'true',
+            'hotkey': values.get('hotkey', ''),
+            'prompt': values.get('prompt', ''),
+            'model': values.get('model', ''),
+            'detail': values.get('detail', 'auto'),
+            'region': values.get('region', 'full'),
+            'scale': scale,
+            'audio': values.get('audio', 'true').lower() == 'true',
+            'tts': values.get('tts', 'true').lower() == 'true'
+        }
+    
+    def get_profiles(self):
+        """Get all enabled hotkey profiles that have a hotkey, the default profile first"""
+        profiles = [self.get_profile(name) for name in self.get_profile_names()]
+        return [profile for profile in profiles if profile['enabled'] and profile['hotkey']]
+    
+    def set_profile(self, name, **values):
+        """Set hotkey profile values (enabled, hotkey, prompt, model, detail, region, scale, audio, tts)"""
+        if name == 'default':
+            if 'hotkey' in values:
+                self.set_hotkey(values['hotkey'])
+            if 'audio' in values:
+                self.set_audio_recording_enabled(values['audio'])
+            return
+        
+        section = PROFILE_SECTION_PREFIX + name
+        if section not in self.config:
+            self.config[section] = dict(PROFILE_PRESETS.get(name, {}))
+        for key, value in values.items():
+            self.config[section][key] = str(value).lower() if isinstance(value, bool) else str(value)
+        self.save_config()
+    
     def get_audio_recording_enabled(self):
         """Get whether audio recording is enabled"""
         return self.get('Audio', 'enable_recording', 'true').lower() == 'true'
@@ -110,6 +272,43 @@ class Config:
         """Set whether audio recording is enabled"""
         self.set('Audio', 'enable_recording', 'true' if enabled else 'false')
     
+    def get_audio_warm_stream_enabled(self):
+        """Get whether the input stream is kept open between recordings"""
+        return self.get('Audio', 'warm_stream', 'false').lower() == 'true'
+    
+    def set_audio_warm_stream_enabled(self, enabled):
+        """Set whether the input stream is kept open between recordings"""
+        self.set('Audio', 'warm_stream', 'true' if enabled else 'false')
+    
+    def get_audio_preroll_ms(self):
+        """Get pre-roll length (ms) prepended to recordings in warm stream mode"""
+        return int(self.get('Audio', 'preroll_ms', '500'))
+    
+    def set_audio_preroll_ms(self, preroll_ms):
+        """Set pre-roll length (ms) prepended to recordings in warm stream mode"""
+        self.set('Audio', 'preroll_ms', str(int(preroll_ms)))
+    
+    def get_transcription_race_services(self):
+        """Get list of transcription services raced in 'race' mode"""
+        services = self.get('Audio', 'race_services', 'google,openai_whisper,local_whisper')
+        return [service.strip() for service in services.split(',') if service.strip()]
+    
+    def set_transcription_race_services(self, services):
+        """Set list of transcription services raced in 'race' mode"""
+        self.set('Audio', 'race_services', ','.join(services))
+    
+    def get_speech_gate_enabled(self):
+        """Get whether requests without detectable speech skip the vision call"""
+        return self.get('SpeechGate', 'enabled', 'true').lower() == 'true'
+    
+    def set_speech_gate_enabled(self, enabled):
+        """Set whether requests without detectable speech skip the vision call"""
+        self.set('SpeechGate', 'enabled', str(enabled).lower())
+    
+    def get_speech_gate_fallback(self):
+        """Get gated request behaviour: 'cache' (reuse description of same screen) or 'abort'"""
+        return self.get('SpeechGate', 'fallback', 'cache')
+    
     def get_tts_engine(self):
         """Get TTS engine preference"""
         return self.get('TTS', 'engine', 'auto')
@@ -118,6 +317,14 @@ class Config:
         """Set TTS engine preference"""
         self.set('TTS', 'engine', engine)
     
+    def get_tts_cache_enabled(self):
+        """Get whether speech from the network TTS engines is cached on disk"""
+        return self.get('TTS', 'cache_enabled', 'true').lower() == 'true'
+    
+    def set_tts_cache_enabled(self, enabled):
+        """Set whether speech from the network TTS engines is cached on disk"""
+        self.set('TTS', 'cache_enabled', str(enabled).lower())
+    
     def get_structured_format_enabled(self):
         """Get structured format setting"""
         return self.get('Response', 'structured_format', 'false').lower() == 'true'
@@ -172,4 +379,12 @@ class Config:
     
     def set_circle_overlay_debug_coords(self, enabled):
         """Set circle overlay debug coordinates setting"""
-        self.set('CircleOverlay', 'debug_coords', str(enabled).lower()) 
\ No newline at end of file
+        self.set('CircleOverlay', 'debug_coords', str(enabled).lower())
+    
+    def get_chat_store(self):
+        """Get where chat history is kept: journal (recent messages) or sqlite (full, searchable)"""
+        return self.get('ChatHistory', 'store', 'journal').lower()
+    
+    def set_chat_store(self, store):
+        """Set where chat history is kept: journal (recent messages) or sqlite (full, searchable)"""
+        self.set('ChatHistory', 'store', store) 
\ No newline at end of file
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import deque
+
+# Interaction states, in pipeline order
+IDLE = 'idle'
+CAPTURING = 'capturing'
+RECORDING = 'recording'
+TRANSCRIBING = 'transcribing'
+ANALYZING = 'analyzing'
+SPEAKING = 'speaking'
+
+# Allowed transitions; cancel() and finish() may return to idle from any state
+TRANSITIONS = {
+    IDLE: {CAPTURING},
+    CAPTURING: {RECORDING, ANALYZING},
+    RECORDING: {TRANSCRIBING},
+    TRANSCRIBING: {ANALYZING},
+    ANALYZING: {SPEAKING},
+    SPEAKING: {CAPTURING}  # A new press may start while the previous answer is spoken
+}
+
+class InteractionStateMachine:
+    """Lock-protected state of the current push-to-talk interaction"""
+    
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.state = IDLE
+        
+        # Each interaction gets a token; stale tokens from cancelled interactions are rejected
+        self.token = 0
+        self.history = deque(maxlen=200)
+        
+        # Hotkey profile whose press started the interaction; only its release stops the recording
+        self.owner = None
+    
+    def begin(self, owner='default'):
+        """Start a new interaction (-> capturing), returning its token or None if busy"""
+        with self.condition:
+            if CAPTURING not in TRANSITIONS[self.state]:
+                return None
+            
+            self.token += 1
+            self.owner = owner
+            self._set_state(CAPTURING)
+            return self.token
+    
+    def transition(self, token, to_state, from_states=None):
+        """Move the interaction identified by token to to_state if the transition is allowed"""
+        with self.condition:
+            if token != self.token:
+                return False
+            if from_states is not None and self.state not in from_states:
+                return False
+            if to_state not in TRANSITIONS[self.state]:
+                return False
+            self._set_state(to_state)
+            return True
+    
+    def finish(self, token):
+        """Return to idle if token is still the current interaction"""
+        with self.condition:
+            if token != self.token or self.state == IDLE:
+                return False
+            self._set_state(IDLE)
+            return True
+    
+    def cancel(self):
+        """Cancel whatever interaction is in progress and return to idle, returning the previous state"""
+        with self.condition:
+            previous_state = self.state
+            self.token += 1
+            if self.state != IDLE:
+                self._set_state(IDLE)
+            return previous_state
+    
+    def is_current(self, token):
+        """Check if token belongs to the interaction in progress"""
+        with self.condition:
+            return token == self.token and self.state != IDLE
+    
+    def get_state(self):
+        """Get the current state and token"""
+        with self.condition:
+            return self.state, self.token
+    
+    def claim_release(self, owner='default'):
+        """Handle a hotkey release: move the owner's recording interaction to transcribing
+        
+        Returns the interaction token, or None if that profile is not recording. HotkeyHandler
+        runs press and release handlers in key order on the single 'capture' worker, so a
+        release is never handled while its press is still capturing.
+        """
+        with self.condition:
+            if self.state == RECORDING and owner == self.owner:
+                self._set_state(TRANSCRIBING)
+                return self.token
+            return None
+    
+    def _set_state(self, state):
+        """Record a state change and wake waiters, caller holds the condition"""
+        self.history.append((time.perf_counter(), self.token, self.state, state))
+        self.state = state
+        self.condition.notify_all()
@@ -1,50 +1,80 @@
+import os
 import sys
 import threading
 import time
+import itertools
+from collections import deque
 import tkinter as tk
 from tkinter import messagebox
 
-from src.core.config import Config
+from src.core.services import ServiceContainer
+from src.core.interaction_state import (InteractionStateMachine, IDLE, RECORDING, TRANSCRIBING,
+                                        ANALYZING, SPEAKING)
 from src.ui.tray_handler import TrayHandler
 from src.ui.main_gui import MainGUI
 from src.handlers.hotkey_handler import HotkeyHandler
-from src.handlers.screenshot_handler import ScreenshotHandler
-from src.handlers.audio_handler import AudioHandler
-from src.handlers.openai_handler import OpenAIHandler
-from src.handlers.tts_handler import TTSHandler
 from src.utils.poi_handler import POIHandler
 from src.utils.circle_overlay import CircleOverlay
 from src.utils.chat_history import ChatHistory
+from src.utils.chat_store import ChatStore
 
 class ScreenAskApp:
     def __init__(self):
-        self.config = Config()
+        # Shared config, HTTP client and executors for all handlers
+        self.services = ServiceContainer()
+        self.config = self.services.config
         self.running = False
         
-        # Initialize handlers
-        self.screenshot_handler = ScreenshotHandler()
-        self.audio_handler = AudioHandler()
-        self.openai_handler = OpenAIHandler()
-        self.tts_handler = TTSHandler()
+        # Heavy handlers (pyautogui, openai, pygame/pyttsx3, sounddevice) are imported and
+        # constructed on first use, or by the background initialization started in start()
+        self.handlers = {}
+        self.handlers_lock = threading.RLock()
+        
+        # Timings of the startup warm-up steps (see _warm_up)
+        self.warm_up_report = []
+        
+        # Initialize lightweight handlers
         self.poi_handler = POIHandler()
         self.circle_overlay = CircleOverlay(self.config)
         
         # Initialize chat history
-        self.chat_history = ChatHistory()
+        self.chat_history = ChatHistory(store=self._create_chat_store())
         
         # Initialize UI components
         self.main_gui = MainGUI(self)
         self.tray_handler = TrayHandler(self)
-        self.hotkey_handler = HotkeyHandler(self)
+        self.hotkey_handler = HotkeyHandler(self, self.services)
         
-        # Processing flag to prevent multiple simultaneous captures
-        self.processing = False
+        # idle -> capturing -> recording -> transcribing -> analyzing -> speaking; prevents
+        # overlapping captures, and its token tells stages of a cancelled interaction to stop
+        self.interaction = InteractionStateMachine()
         
-        # Store current screenshot for processing
+        # Store current screenshot (and its perceptual hash) for processing, owned by the current interaction
         self.current_screenshot = None
+        self.current_screen_hash = None
+        
+        # Hotkey profile of the current interaction and where its screenshot came from
+        self.current_profile = None
+        self.current_capture_geometry = None
         
+        # Presses made while busy are captured right away and processed in order afterwards
+        self.pending_captures = deque()
+        self.queued_capture = None  # Queued capture whose key is still held
+        self.capture_queue_lock = threading.Lock()
+        self.recording_ids = itertools.count(1)
+    
     def start(self):
         """Start the application"""
+        self._start_components()
+        
+        # Start the main loop
+        try:
+            self.main_gui.root.mainloop()
+        except KeyboardInterrupt:
+            self.quit()
+    
+    def _start_components(self):
+        """Create the windows, tray and hotkey listener and start background initialization"""
         self.running = True
         
         print("Starting ScreenAsk...")
@@ -52,12 +82,18 @@ class ScreenAskApp:
         # Start the main GUI
         self.main_gui.create_main_window()
         
+        # The overlay window is created once, hidden, and reused for every circle
+        self.circle_overlay.create_window()
+        
         # Start the system tray
         self.tray_handler.start_tray()
         
         # Start hotkey listening
         self.hotkey_handler.start_listening()
         
+        # Construct the heavy handlers off the main thread once the UI is up
+        self.services.submit('io', self._initialize_handlers)
+        
         # Set initial tray tooltip
         if self.config.get_audio_recording_enabled():
             self.tray_handler.set_tooltip("ScreenAsk - Hold {} to record, {} to stop speaking".format(
@@ -73,27 +109,143 @@ class ScreenAskApp:
         if self.main_gui:
             self.main_gui.set_status_ready()
         
-        # Check if OpenAI is configured
-        if not self.openai_handler.is_configured():
+        # Check if OpenAI is configured (without waiting for the client to be created)
+        if not (self.config.get_openai_key() or '').strip():
             self.tray_handler.notify("ScreenAsk", "Please configure your OpenAI API key in settings")
+    
+    def _get_handler(self, name, factory):
+        """Get a handler, constructing it on first use"""
+        handler = self.handlers.get(name)
+        if handler is None:
+            with self.handlers_lock:
+                handler = self.handlers.get(name)
+                if handler is None:
+                    start_time = time.perf_counter()
+                    handler = factory()
+                    self.handlers[name] = handler
+                    print(f"✓ {name} ready in {(time.perf_counter() - start_time) * 1000:.0f} ms")
+        return handler
+    
+    @property
+    def screenshot_handler(self):
+        """Screenshot handler (created on first use)"""
+        def create():
+            from src.handlers.screenshot_handler import ScreenshotHandler
+            return ScreenshotHandler()
+        return self._get_handler('screenshot_handler', create)
+    
+    @property
+    def openai_handler(self):
+        """OpenAI handler (created on first use)"""
+        def create():
+            # Shared with the audio handler, which may already have created it for Whisper
+            return self.services.get_openai_handler()
+        return self._get_handler('openai_handler', create)
+    
+    @property
+    def audio_handler(self):
+        """Audio handler (created on first use)"""
+        def create():
+            from src.handlers.audio_handler import AudioHandler
+            return AudioHandler(self.services)
+        return self._get_handler('audio_handler', create)
+    
+    @property
+    def tts_handler(self):
+        """TTS handler (created on first use)"""
+        def create():
+            from src.handlers.tts_handler import TTSHandler
+            return TTSHandler(self.services)
+        return self._get_handler('tts_handler', create)
+    
+    def _initialize_handlers(self):
+        """Construct the heavy handlers in the background so the first hotkey press is fast"""
+        self._construct_handlers()
         
-        # Start the main loop
+        if self.config.get_warm_up_enabled():
+            self._warm_up()
+    
+    def _construct_handlers(self):
+        """Construct the heavy handlers and load models they need"""
+        start_time = time.perf_counter()
         try:
-            self.main_gui.root.mainloop()
-        except KeyboardInterrupt:
-            self.quit()
+            self.openai_handler
+            self.screenshot_handler
+            self.tts_handler
+            self.audio_handler
+            
+            # Keep the microphone open if warm stream mode is enabled
+            self.update_audio_stream()
+            
+            # Load the offline transcription model so the first request is fast
+            transcription_service = self.config.get('Audio', 'transcription_service', 'google')
+            if transcription_service == 'local_whisper' or (
+                    transcription_service == 'race' and 'local_whisper' in self.config.get_transcription_race_services()):
+                self.services.submit('cpu', self.audio_handler.load_local_model)
+            
+            print(f"✓ Background initialization finished in {time.perf_counter() - start_time:.2f}s")
+        except Exception as e:
+            print(f"Error during background initialization: {e}")
+    
+    def _warm_up(self):
+        """Pay first-use costs (TLS, TTS driver, audio device, capture backend) before the first request"""
+        self.warm_up_report = []
+        # One priming request per host; a repeat would be a no-op, so the whole cost counts as saved
+        self._run_warm_up_step('OpenAI connection', self.openai_handler.warm_up)
+        self._run_warm_up_step('TTS engine', self.tts_handler.warm_up)
+        if self.config.get_audio_recording_enabled():
+            self._run_warm_up_step('Audio device', self.audio_handler.probe_input_device, repeat=True)
+        self._run_warm_up_step('Screen capture', self.screenshot_handler.warm_up, repeat=True)
+        
+        total_time = sum(step['time'] for step in self.warm_up_report)
+        total_saved = sum(step['saved'] for step in self.warm_up_report)
+        print(f"✓ Warm-up finished in {total_time * 1000:.0f} ms, "
+              f"~{total_saved * 1000:.0f} ms saved on the first request")
+    
+    def _run_warm_up_step(self, name, step, repeat=False):
+        """Time one warm-up step; with repeat, a second run measures the warm cost to estimate the saving"""
+        entry = {'step': name, 'time': 0.0, 'saved': 0.0, 'ok': False}
+        try:
+            start_time = time.perf_counter()
+            entry['ok'] = step() is not False
+            entry['time'] = time.perf_counter() - start_time
+            
+            if entry['ok']:
+                # Without a warm rerun, the whole first-use cost counts as saved
+                warm_time = 0.0
+                if repeat:
+                    start_time = time.perf_counter()
+                    step()
+                    warm_time = time.perf_counter() - start_time
+                entry['saved'] = max(0.0, entry['time'] - warm_time)
+                print(f"  {name}: {entry['time'] * 1000:.0f} ms (saves ~{entry['saved'] * 1000:.0f} ms)")
+            else:
+                print(f"  {name}: skipped")
+        except Exception as e:
+            print(f"⚠ Warm-up step '{name}' failed: {e}")
+        self.warm_up_report.append(entry)
+        return entry
     
-    def handle_hotkey_press(self):
+    def handle_hotkey_press(self, profile_name='default'):
         """Handle hotkey press - start recording"""
-        if self.processing:
-            print("Already processing, ignoring hotkey press")
+        profile = self.config.get_profile(profile_name)
+        
+        # The recorder is still taking a queued question
+        with self.capture_queue_lock:
+            recorder_busy = self.queued_capture is not None and self.queued_capture['audio']
+        if recorder_busy:
+            print("Still recording a queued question, ignoring hotkey press")
+            return
+        
+        token = self.interaction.begin(owner=profile_name)
+        if token is None:
+            if not self._queue_capture(profile):
+                print(f"Already {self.interaction.get_state()[0]}, ignoring hotkey press")
             return
-            
-        self.processing = True
         
         try:
-            # Check if audio recording is enabled
-            audio_enabled = self.config.get_audio_recording_enabled()
+            # Check if audio recording is enabled for this profile
+            audio_enabled = profile['audio']
             
             if audio_enabled:
                 print("Hotkey pressed - starting capture and recording...")
@@ -112,47 +264,56 @@ class ScreenAskApp:
             
             # Step 1: Capture screenshot
             print("Capturing screenshot...")
-            screenshot_base64 = self.screenshot_handler.capture_screenshot()
+            screenshot_base64 = self.screenshot_handler.capture_screenshot(profile['region'], profile['scale'])
             
             if not screenshot_base64:
                 self.tray_handler.notify("ScreenAsk", "Failed to capture screenshot")
                 if self.main_gui:
                     self.main_gui.set_status_ready()
-                self.processing = False
+                # Also starts a capture queued while the previous answer was spoken
+                self._end_interaction(token)
                 return
             
             print("Screenshot captured successfully")
             
-            # Store screenshot for processing
-            self.current_screenshot = screenshot_base64
+            # Store screenshot for processing, unless the interaction was cancelled meanwhile
+            with self.interaction.condition:
+                if not self.interaction.is_current(token):
+                    print("Interaction cancelled during capture")
+                    return
+                self.current_screenshot = screenshot_base64
+                self.current_screen_hash = self._capture_screen_hash(profile)
+                self.current_profile = profile
+                self.current_capture_geometry = self.screenshot_handler.last_capture_geometry
             
             if audio_enabled:
                 # Step 2: Start recording audio
                 print("Starting audio recording...")
                 self.audio_handler.start_recording()
+                # The release is handled after this returns, on the same 'capture' worker
+                if not self.interaction.transition(token, RECORDING):
+                    self.audio_handler.stop_recording()
             else:
                 # Process immediately without audio
                 print("Processing without audio recording...")
-                self._process_screenshot_only()
-            
+                if self.interaction.transition(token, ANALYZING):
+                    # Analysis runs on the io pool so presses made meanwhile can be queued
+                    self.services.submit('io', self._process_screenshot_only, token)
+        
         except Exception as e:
             print(f"Error in hotkey press handler: {e}")
             self.tray_handler.notify("ScreenAsk", f"Error: {str(e)}")
             if self.main_gui:
                 self.main_gui.set_status_ready()
-            self.processing = False
+            self._end_interaction(token)
     
-    def handle_hotkey_release(self):
+    def handle_hotkey_release(self, profile_name='default'):
         """Handle hotkey release - stop recording and process"""
-        if not self.processing:
-            print("Not currently processing, ignoring hotkey release")
-            return
-        
-        # Check if audio recording is enabled
-        audio_enabled = self.config.get_audio_recording_enabled()
-        
-        if not audio_enabled:
-            print("Audio disabled - hotkey release ignored")
+        # Runs after the press handler on the 'capture' worker, so a fast tap finds the recording started
+        token = self.interaction.claim_release(owner=profile_name)
+        if token is None:
+            if not self._finish_queued_capture(profile_name):
+                print(f"Not recording ({self.interaction.get_state()[0]}), ignoring hotkey release")
             return
         
         try:
@@ -163,62 +324,272 @@ class ScreenAskApp:
             if self.main_gui:
                 self.main_gui.set_status_processing()
             self.audio_handler.stop_recording()
-            
+            filename, gate_reason = self._save_recording()
+        except Exception as e:
+            print(f"Error in hotkey release handler: {e}")
+            self.tray_handler.notify("ScreenAsk", f"Error: {str(e)}")
+            if self.main_gui:
+                self.main_gui.set_status_ready()
+            self._end_interaction(token)
+            return
+        
+        # Transcription and analysis run on the io pool so the next press is not held up
+        self.services.submit('io', self._process_recording, token, filename, gate_reason)
+    
+    def _save_recording(self):
+        """Run the speech gate on the stopped recording and save it, returning (filename, gate_reason)"""
+        # Done before the recorder is handed to the next press
+        speech_detected, gate_reason = self.audio_handler.detect_speech()
+        if not speech_detected:
+            return None, gate_reason
+        return self.audio_handler.save_recording(f"temp_recording_{next(self.recording_ids)}.wav"), None
+    
+    def _process_recording(self, token, filename, gate_reason):
+        """Transcribe a saved recording, then analyze and speak the answer"""
+        try:
             # Step 2: Process the recorded audio
             print("Processing recorded audio...")
             self.tray_handler.notify("ScreenAsk", "Processing your question...")
             
-            # Save and transcribe the audio
-            filename = self.audio_handler.save_recording()
             user_text = None
             
-            if filename:
-                user_text = self.audio_handler.transcribe_audio(filename)
-                
-                if not user_text:
-                    print("No audio detected or transcription failed")
-                    user_text = None
-                else:
-                    print(f"Transcribed text: {user_text}")
-                    # Add user message to chat history
-                    self.chat_history.add_message('user', user_text)
-                    # Update chat display
-                    if self.main_gui:
-                        self.main_gui.update_chat_display()
+            # Skip transcription entirely if the recording has no speech in it
+            if gate_reason:
+                print(f"Speech gate: {gate_reason}")
+            else:
+                # Transcribe the saved audio
+                if filename:
+                    user_text = self.audio_handler.transcribe_audio(filename)
+                    
+                    if not user_text:
+                        print("No audio detected or transcription failed")
+                        user_text = None
+                    elif not self.audio_handler.is_transcript_confident():
+                        print(f"Speech gate: low transcript confidence for '{user_text}'")
+                        user_text = None
+                    else:
+                        print(f"Transcribed text: {user_text}")
+                        # Add user message to chat history
+                        self.chat_history.add_message('user', user_text)
+                        # Update chat display
+                        if self.main_gui:
+                            self.main_gui.update_chat_display()
             
-            # Step 3: Send to OpenAI with audio text
-            self._process_with_openai(user_text)
+            if not self.interaction.transition(token, ANALYZING):
+                print("Interaction cancelled during transcription")
+                return
             
+            # Step 3: Send to OpenAI with audio text, unless the gate rejected the request
+            if not user_text and self.config.get_speech_gate_enabled():
+                self._handle_gated_request(token)
+            else:
+                self._process_with_openai(user_text, token)
+        
         except Exception as e:
-            print(f"Error in hotkey release handler: {e}")
+            print(f"Error processing recording: {e}")
             self.tray_handler.notify("ScreenAsk", f"Error: {str(e)}")
             if self.main_gui:
                 self.main_gui.set_status_ready()
         finally:
-            self.processing = False
-            self.current_screenshot = None
+            if filename:
+                # Deferred while losing race backends are still reading it
+                self.audio_handler.delete_recording(filename)
+            self._end_interaction(token)
     
-    def _process_screenshot_only(self):
+    def _end_interaction(self, token):
+        """Drop the interaction's screenshot and return to idle, unless its answer is still being spoken"""
+        with self.interaction.condition:
+            state, current_token = self.interaction.get_state()
+            if token != current_token:
+                return  # Cancelled (which dropped the screenshot), or a newer interaction owns it
+            self._drop_capture()
+            if state != SPEAKING:
+                self.interaction.finish(token)
+        
+        self._log_thread_metrics()
+        self._start_next_capture()
+    
+    def _drop_capture(self):
+        """Forget the current interaction's screenshot, caller holds the interaction condition"""
+        self.current_screenshot = None
+        self.current_screen_hash = None
+        self.current_profile = None
+        self.current_capture_geometry = None
+    
+    def _capture_screen_hash(self, profile):
+        """Key the last screen hash by screenshot scale, since cached coordinates are in scaled pixels
+        
+        The hash is of the captured region, so profiles capturing the same pixels share descriptions.
+        """
+        screen_hash = self.screenshot_handler.last_screen_hash
+        if screen_hash and profile['scale'] < 1.0:
+            return f"{screen_hash}@{profile['scale']}"
+        return screen_hash
+    
+    def _queue_capture(self, profile):
+        """Capture the screen (and start recording) for a press made while busy, returning False if not queued"""
+        max_queued = self.config.get_capture_queue_size()
+        audio_enabled = profile['audio']
+        with self.capture_queue_lock:
+            # The recorder is free again once the busy interaction is past recording
+            if (max_queued <= 0 or self.queued_capture is not None or len(self.pending_captures) >= max_queued
+                    or self.interaction.get_state()[0] not in (TRANSCRIBING, ANALYZING)):
+                return False
+            capture = {'audio': audio_enabled, 'profile': profile, 'filename': None, 'gate_reason': None}
+            self.queued_capture = capture
+        
+        print("Busy - capturing this request for the queue...")
+        screenshot_base64 = self.screenshot_handler.capture_screenshot(profile['region'], profile['scale'])
+        if not screenshot_base64:
+            with self.capture_queue_lock:
+                self.queued_capture = None
+            self.tray_handler.notify("ScreenAsk", "Failed to capture screenshot")
+            return True
+        
+        capture['screenshot'] = screenshot_base64
+        capture['screen_hash'] = self._capture_screen_hash(profile)
+        capture['geometry'] = self.screenshot_handler.last_capture_geometry
+        
+        if audio_enabled:
+            # Started under the lock, so a stop hotkey clearing the queue meanwhile either drops the
+            # capture before the recorder starts or stops the recorder after
+            with self.capture_queue_lock:
+                if self.queued_capture is not capture:
+                    return True
+                self.audio_handler.start_recording()
+            self.tray_handler.notify("ScreenAsk", "Busy - your question will be queued")
+        else:
+            with self.capture_queue_lock:
+                if self.queued_capture is not capture:
+                    return True
+            self._enqueue_capture(capture)
+        return True
+    
+    def _finish_queued_capture(self, profile_name='default'):
+        """Stop recording a queued capture and queue it, returning False if none is recording"""
+        with self.capture_queue_lock:
+            capture = self.queued_capture
+            if capture is None or not capture['audio'] or capture['profile']['name'] != profile_name:
+                return False
+        
+        self.audio_handler.stop_recording()
+        capture['filename'], capture['gate_reason'] = self._save_recording()
+        self._enqueue_capture(capture)
+        return True
+    
+    def _enqueue_capture(self, capture):
+        """Add a finished capture to the queue and start it if nothing is busy"""
+        with self.capture_queue_lock:
+            self.queued_capture = None
+            self.pending_captures.append(capture)
+            print(f"Capture queued ({len(self.pending_captures)} pending)")
+        self._start_next_capture()
+    
+    def _start_next_capture(self):
+        """Start processing the oldest queued capture once the app is idle"""
+        with self.capture_queue_lock:
+            if not self.pending_captures:
+                return
+            
+            # Held under the state lock so a hotkey release cannot claim the replayed recording state
+            with self.interaction.condition:
+                if self.interaction.get_state()[0] != IDLE:
+                    return  # Started again when the current interaction ends
+                capture = self.pending_captures.popleft()
+                token = self.interaction.begin(owner=capture['profile']['name'])
+                self.current_screenshot = capture['screenshot']
+                self.current_screen_hash = capture['screen_hash']
+                self.current_profile = capture['profile']
+                self.current_capture_geometry = capture['geometry']
+                if capture['audio']:
+                    self.interaction.transition(token, RECORDING)
+                    self.interaction.transition(token, TRANSCRIBING)
+                else:
+                    self.interaction.transition(token, ANALYZING)
+            
+            print(f"Processing queued capture ({len(self.pending_captures)} still pending)")
+        
+        if capture['audio']:
+            self.services.submit('io', self._process_recording, token, capture['filename'], capture['gate_reason'])
+        else:
+            self.services.submit('io', self._process_screenshot_only, token)
+    
+    def _clear_capture_queue(self):
+        """Drop queued captures, stopping a queued recording in progress"""
+        with self.capture_queue_lock:
+            queued_capture = self.queued_capture
+            self.queued_capture = None
+            dropped = list(self.pending_captures)
+            self.pending_captures.clear()
+        
+        if queued_capture and queued_capture['audio']:
+            self.audio_handler.stop_recording()
+        for capture in dropped:
+            if capture['filename']:
+                try:
+                    os.remove(capture['filename'])
+                except OSError:
+                    pass
+    
+    def _create_chat_store(self):
+        """Open the SQLite chat store if configured, falling back to the journal"""
+        if self.config.get_chat_store() != 'sqlite':
+            return None
+        try:
+            store = ChatStore(self.config.get('ChatHistory', 'db_file', 'chat_history.db'))
+            print(f"✓ Chat history database: {store.db_file}")
+            return store
+        except Exception as e:
+            print(f"⚠ Could not open chat history database, using the journal: {e}")
+            return None
+    
+    def _log_thread_metrics(self):
+        """Print the thread count and worker pool usage"""
+        metrics = self.services.get_thread_metrics()
+        pools = ', '.join(f"{name} {stats['active']}/{stats['workers']} (+{stats['queued']} queued)"
+                          for name, stats in metrics['pools'].items())
+        print(f"Threads: {metrics['threads']} - {pools}")
+    
+    def _handle_gated_request(self, token):
+        """Handle a request without usable speech: reuse a cached description or abort"""
+        cached_response = None
+        if self.config.get_speech_gate_fallback() == 'cache':
+            cached_response = self.openai_handler.get_cached_description(self.current_screen_hash)
+        
+        if cached_response:
+            print("Speech gate: reusing cached description of this screen")
+            self._handle_response(cached_response, token)
+            return
+        
+        print("Speech gate: no speech detected, skipping AI analysis")
+        self.tray_handler.notify("ScreenAsk", "No speech detected")
+        if self.main_gui:
+            self.main_gui.set_status_ready()
+    
+    def _process_screenshot_only(self, token):
         """Process screenshot without audio recording"""
         try:
             # Add user message to chat history for screenshot-only mode
-            self.chat_history.add_message('user', '[Screenshot analysis requested]')
+            profile_name = self.current_profile['name'] if self.current_profile else 'default'
+            if profile_name == 'default':
+                self.chat_history.add_message('user', '[Screenshot analysis requested]')
+            else:
+                self.chat_history.add_message('user', f'[Screenshot analysis requested: {profile_name}]')
             # Update chat display
             if self.main_gui:
                 self.main_gui.update_chat_display()
             
             # Process immediately without user audio text
-            self._process_with_openai(None)
+            self._process_with_openai(None, token)
         except Exception as e:
             print(f"Error in screenshot-only processing: {e}")
             self.tray_handler.notify("ScreenAsk", f"Error: {str(e)}")
             if self.main_gui:
                 self.main_gui.set_status_ready()
         finally:
-            self.processing = False
-            self.current_screenshot = None
+            self._end_interaction(token)
     
-    def _process_with_openai(self, user_text):
+    def _process_with_openai(self, user_text, token):
         """Send to OpenAI and handle response"""
         print("Sending to OpenAI...")
         if self.main_gui:
@@ -231,7 +602,23 @@ class ScreenAskApp:
                 self.main_gui.set_status_ready()
             return
         
-        response = self.openai_handler.analyze_screenshot_with_text(self.current_screenshot, user_text)
+        # Cropped or scaled screenshots are described to the model by their own size
+        profile = self.current_profile
+        image_size = None
+        if profile and self.current_capture_geometry and (profile['region'] != 'full' or profile['scale'] < 1.0):
+            image_size = self.current_capture_geometry['size']
+        
+        analysis_start = time.perf_counter()
+        response = self.openai_handler.analyze_screenshot_with_text(self.current_screenshot, user_text,
+                                                                    profile=profile, image_size=image_size)
+        analysis_metadata = {
+            'latency': round(time.perf_counter() - analysis_start, 3),
+            'model': (profile and profile.get('model')) or self.config.get('OpenAI', 'model', 'gpt-4o')
+        }
+        
+        if not self.interaction.is_current(token):
+            print("Interaction cancelled during analysis, dropping response")
+            return
         
         if response.startswith("Error"):
             print(f"OpenAI error: {response}")
@@ -242,6 +629,12 @@ class ScreenAskApp:
         
         print(f"OpenAI response: {response}")
         
+        if self._handle_response(response, token, analysis_metadata):
+            # Remember the answer so gated requests on the same screen can reuse it
+            self.openai_handler.cache_description(self.current_screen_hash, response)
+    
+    def _handle_response(self, response, token=None, metadata=None):
+        """Parse a structured response, then record (with metadata, e.g. latency), display and speak it"""
         # Parse structured response (always enabled)
         structured_data, error = self.openai_handler.parse_structured_response(response)
         
@@ -251,15 +644,27 @@ class ScreenAskApp:
             self.tray_handler.notify("ScreenAsk", "Error parsing AI response")
             if self.main_gui:
                 self.main_gui.set_status_ready()
-            return
+            return False
         
         # Extract structured data
-        poi_x = structured_data['x']
-        poi_y = structured_data['y']
-        poi_radius = structured_data['r']
+        points = structured_data['points']
         text_response = structured_data['tx']
         
+        # Map coordinates from a cropped or scaled screenshot back onto the screen
+        if self.current_capture_geometry:
+            mapped_points = []
+            for point in points:
+                x, y, r = self.screenshot_handler.to_screen_coordinates(
+                    point['x'], point['y'], point['r'], self.current_capture_geometry)
+                mapped_points.append({'x': x, 'y': y, 'r': r, 'label': point['label']})
+            points = mapped_points
+        
+        poi_x, poi_y, poi_radius = points[0]['x'], points[0]['y'], points[0]['r']
+        
         print(f"Structured response - POI: ({poi_x}, {poi_y}), Radius: {poi_radius}")
+        if len(points) > 1:
+            print("Additional POIs: " + ', '.join(f"{point['label'] or '?'} ({point['x']}, {point['y']})"
+                                                  for point in points[1:]))
         print(f"Text to speak: {text_response}")
         
         # Add AI message to chat history with metadata
@@ -267,16 +672,23 @@ class ScreenAskApp:
             'coordinates': {'x': poi_x, 'y': poi_y, 'radius': poi_radius},
             'has_circle_overlay': self.config.get_circle_overlay_enabled()
         }
+        if len(points) > 1:
+            ai_metadata['points'] = [{'x': point['x'], 'y': point['y'], 'radius': point['r'], 'label': point['label']}
+                                     for point in points]
+        ai_metadata.update(metadata or {})
         self.chat_history.add_message('ai', text_response, metadata=ai_metadata)
         # Update chat display
         if self.main_gui:
             self.main_gui.update_chat_display()
         
-        # Add screen resolution info for debugging
-        if self.main_gui and self.main_gui.root:
+        # Add screen resolution info for debugging (prefer the size cached during warm-up
+        # over querying Tk from this worker thread)
+        screen_size = self.screenshot_handler.screen_size
+        if screen_size is None and self.main_gui and self.main_gui.root:
+            screen_size = (self.main_gui.root.winfo_screenwidth(), self.main_gui.root.winfo_screenheight())
+        if screen_size:
             try:
-                screen_width = self.main_gui.root.winfo_screenwidth()
-                screen_height = self.main_gui.root.winfo_screenheight()
+                screen_width, screen_height = screen_size
                 print(f"Screen resolution: {screen_width}x{screen_height}")
                 print(f"POI relative position: {poi_x/screen_width:.1%} from left, {poi_y/screen_height:.1%} from top")
                 
@@ -290,35 +702,60 @@ class ScreenAskApp:
                 region_x = "left" if poi_x < screen_width/3 else ("center" if poi_x < 2*screen_width/3 else "right")
                 region_y = "top" if poi_y < screen_height/3 else ("middle" if poi_y < 2*screen_height/3 else "bottom")
                 print(f"📍 POI is in {region_y}-{region_x} region of screen")
-                
+            
             except:
                 pass
         
         # Store POI data using POI handler
-        self.poi_handler.set_current_poi(poi_x, poi_y, poi_radius, text_response)
+        self.poi_handler.set_current_pois(points, text_response)
         
-        # Show circle overlay if enabled
+        # Show circle overlay if enabled; all points are drawn in one overlay
         if self.config.get_circle_overlay_enabled():
-            print(f"Showing circle overlay at ({poi_x}, {poi_y}) with radius {poi_radius}")
-            self.circle_overlay.show_circle(poi_x, poi_y, poi_radius)
+            if len(points) == 1:
+                print(f"Showing circle overlay at ({poi_x}, {poi_y}) with radius {poi_radius}")
+            else:
+                print(f"Showing circle overlay at {len(points)} points")
+            self.circle_overlay.show_circles(points)
         
         # Speak only the text portion
-        self._speak_response(text_response)
-            
+        self._speak_response(text_response, token)
+        
         print("Process completed successfully!")
+        return True
     
-    def _speak_response(self, text):
+    def _speak_response(self, text, token=None):
         """Speak the response text"""
+        if self.current_profile and not self.current_profile['tts']:
+            # The answer is shown in the chat and overlay only; the interaction ends right away
+            print(f"Speech disabled for profile '{self.current_profile['name']}'")
+            if self.main_gui:
+                self.main_gui.set_status_ready()
+            return
+        
+        if token is not None and not self.interaction.transition(token, SPEAKING):
+            print("Interaction cancelled, not speaking response")
+            return
+        
         print("Speaking response...")
         if self.main_gui:
             self.main_gui.set_status_speaking()
         self.tray_handler.notify("ScreenAsk", "Speaking response...")
         
-        self.tts_handler.speak(text, blocking=False)
+        future = self.tts_handler.speak(text, blocking=False)
         
-        # Set status back to ready after a short delay
-        import time
-        threading.Timer(2.0, lambda: self.main_gui.set_status_ready() if self.main_gui else None).start()
+        # The interaction ends once TTS has finished (or was stopped)
+        if future is None:
+            self._on_speech_done(token)
+        else:
+            future.add_done_callback(lambda _: self._on_speech_done(token))
+    
+    def _on_speech_done(self, token):
+        """End a spoken interaction and start the next queued capture"""
+        if token is not None and not self.interaction.finish(token):
+            return  # Cancelled, or a newer interaction took over
+        if self.main_gui:
+            self.main_gui.set_status_ready()
+        self._start_next_capture()
     
     def get_current_poi_data(self):
         """Get the current point of interest data"""
@@ -339,7 +776,7 @@ class ScreenAskApp:
             self.circle_overlay.show_circle(x, y, radius)
         else:
             print("Circle overlay not available")
-
+    
     def test_coordinate_accuracy(self):
         """Test coordinate accuracy by showing multiple circles at different locations"""
         if not self.circle_overlay:
@@ -364,7 +801,7 @@ class ScreenAskApp:
             print(f"  Testing {description}: ({x}, {y}) with radius {radius}")
             input("Press Enter to show circle...")
             self.circle_overlay.show_circle(x, y, radius)
-            
+    
     def clear_coordinate_cache(self):
         """Clear cached coordinates to force fresh detection"""
         if hasattr(self.openai_handler, 'coordinate_cache'):
@@ -382,8 +819,20 @@ class ScreenAskApp:
         """Handle stop speaking hotkey - stop TTS immediately"""
         try:
             print("Stop speaking hotkey pressed - stopping TTS...")
-            if self.tts_handler:
-                self.tts_handler.stop()
+            
+            # Cancel the interaction in progress and anything queued behind it; stale stages
+            # see their token is no longer current
+            with self.interaction.condition:
+                previous_state = self.interaction.cancel()
+                self._drop_capture()
+            if previous_state == RECORDING:
+                self.audio_handler.stop_recording()
+            self._clear_capture_queue()
+            
+            # Nothing can be speaking before the TTS handler exists; don't build it just to stop it
+            tts_handler = self.handlers.get('tts_handler')
+            if tts_handler:
+                tts_handler.stop()
                 print("TTS stopped successfully")
                 
                 # Update status back to ready
@@ -392,7 +841,7 @@ class ScreenAskApp:
                 
                 # Show notification
                 self.tray_handler.notify("ScreenAsk", "Speech stopped")
-                
+        
         except Exception as e:
             print(f"Error stopping TTS: {e}")
     
@@ -421,17 +870,27 @@ class ScreenAskApp:
                     self.config.get_hotkey(), self.config.get_stop_speaking_hotkey()))
         
         # Also reload OpenAI configuration
-        if self.openai_handler:
+        if self.handlers.get('openai_handler'):
             self.openai_handler.setup_client()
     
+    def update_audio_stream(self):
+        """Open or close the warm input stream to match the current settings"""
+        if not self.audio_handler:
+            return
+        
+        if self.config.get_audio_recording_enabled() and self.config.get_audio_warm_stream_enabled():
+            self.audio_handler.start_warm_stream()
+        else:
+            self.audio_handler.stop_warm_stream()
+    
     def quit(self):
         """Quit the application"""
         print("Shutting down ScreenAsk...")
         self.running = False
         
-        # Save chat history before shutdown
+        # Write out journal lines still queued before shutdown
         if self.chat_history:
-            self.chat_history.save_to_file()
+            self.chat_history.close()
         
         # Stop components
         if self.hotkey_handler:
@@ -440,8 +899,12 @@ class ScreenAskApp:
         if self.tray_handler:
             self.tray_handler.stop_tray()
         
-        if self.tts_handler:
-            self.tts_handler.stop()
+        # Only shut down handlers that were actually constructed
+        if self.handlers.get('tts_handler'):
+            self.tts_handler.shutdown()
+        
+        if self.handlers.get('audio_handler'):
+            self.audio_handler.stop_warm_stream()
         
         if self.circle_overlay:
             self.circle_overlay.hide_circle()
@@ -449,6 +912,9 @@ class ScreenAskApp:
         if self.main_gui and self.main_gui.root:
             self.main_gui.root.quit()
         
+        if self.services:
+            self.services.shutdown()
+        
         print("ScreenAsk shutdown complete")
         sys.exit(0)
 
@@ -0,0 +1,130 @@
+import threading
+import concurrent.futures
+from urllib.parse import urlsplit
+from src.core.config import Config
+
+# httpx ships with the openai package; a shared client keeps its connection pool warm
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# Bounded worker pools shared by the app: 'capture' runs hotkey handlers one at a time and in
+# order, 'io' runs network-bound pipeline stages, 'cpu' runs local compute (e.g. model loading)
+WORKER_POOLS = {
+    'capture': 1,
+    'io': 4,
+    'cpu': 2
+}
+
+class ServiceContainer:
+    """Shared config, HTTP client and executors injected into all handlers"""
+    
+    def __init__(self, config=None):
+        self.config = config or Config()
+        self.http_client = None
+        self.executors = {}
+        self.pool_stats = {}
+        self.lock = threading.Lock()
+        
+        # Handlers shared between the app and other handlers; handler_lock is separate from lock
+        # because constructing a handler takes lock (e.g. for the HTTP client)
+        self.openai_handler = None
+        self.handler_lock = threading.Lock()
+        
+        # Hosts the warm-up has already opened a pooled connection to
+        self.primed_hosts = set()
+    
+    def get_http_client(self):
+        """Get the shared HTTP client (created on first use)"""
+        if not HTTPX_AVAILABLE:
+            return None
+        
+        with self.lock:
+            if self.http_client is None:
+                self.http_client = httpx.Client(
+                    timeout=httpx.Timeout(60.0, connect=10.0),
+                    limits=httpx.Limits(max_connections=10, max_keepalive_connections=5)
+                )
+            return self.http_client
+    
+    def prime_connection(self, url):
+        """Open a kept-alive connection to url's host in the shared pool, once per host"""
+        http_client = self.get_http_client()
+        if http_client is None:
+            return False
+        
+        parts = urlsplit(url)
+        host = (parts.scheme, parts.netloc)
+        with self.lock:
+            if host in self.primed_hosts:
+                return True
+            self.primed_hosts.add(host)
+        
+        # Any response (even 404) leaves the TLS connection in the pool
+        http_client.head(url)
+        return True
+    
+    def get_openai_handler(self):
+        """Get the shared OpenAI handler, creating exactly one even when called from several threads"""
+        if self.openai_handler is None:
+            with self.handler_lock:
+                if self.openai_handler is None:
+                    from src.handlers.openai_handler import OpenAIHandler
+                    self.openai_handler = OpenAIHandler(self)
+        return self.openai_handler
+    
+    def get_executor(self, name, max_workers=None):
+        """Get a named shared thread pool (created on first use)"""
+        with self.lock:
+            if name not in self.executors:
+                max_workers = max_workers or WORKER_POOLS.get(name, 4)
+                self.executors[name] = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix=name)
+                self.pool_stats[name] = {'workers': max_workers, 'submitted': 0, 'active': 0, 'completed': 0}
+            return self.executors[name]
+    
+    def submit(self, pool, func, *args):
+        """Run func on a named worker pool, counting it in the pool metrics and logging errors"""
+        executor = self.get_executor(pool)
+        stats = self.pool_stats[pool]
+        
+        def run():
+            with self.lock:
+                stats['active'] += 1
+            try:
+                return func(*args)
+            except Exception as e:
+                print(f"Error in {pool} worker: {e}")
+                raise
+            finally:
+                with self.lock:
+                    stats['active'] -= 1
+                    stats['completed'] += 1
+        
+        with self.lock:
+            stats['submitted'] += 1
+        return executor.submit(run)
+    
+    def get_thread_metrics(self):
+        """Get process thread count and per-pool worker, active and queued task counts"""
+        with self.lock:
+            pools = {}
+            for name, stats in self.pool_stats.items():
+                pools[name] = dict(stats, queued=stats['submitted'] - stats['completed'] - stats['active'])
+            return {'threads': threading.active_count(), 'pools': pools}
+    
+    def shutdown(self):
+        """Shut down executors and close the HTTP client"""
+        with self.lock:
+            for executor in self.executors.values():
+                executor.shutdown(wait=False)
+            self.executors.clear()
+            
+            if self.http_client is not None:
+                try:
+                    self.http_client.close()
+                except Exception as e:
+                    print(f"Error closing HTTP client: {e}")
+                self.http_client = None
@@ -16,14 +16,24 @@ except ImportError:
     SPEECH_RECOGNITION_AVAILABLE = False
     print("Warning: SpeechRecognition not available - voice input disabled")
 
+try:
+    from faster_whisper import WhisperModel
+    LOCAL_WHISPER_AVAILABLE = True
+except ImportError:
+    LOCAL_WHISPER_AVAILABLE = False
+
 import threading
 import time
 import os
-from src.core.config import Config
+import math
+import concurrent.futures
+from collections import deque
+from src.core.services import ServiceContainer
 
 class AudioHandler:
-    def __init__(self):
-        self.config = Config()
+    def __init__(self, services=None):
+        self.services = services or ServiceContainer()
+        self.config = self.services.config
         self.recording = False
         self.audio_data = None
         self.recording_stream = None
@@ -38,13 +48,42 @@ class AudioHandler:
             self.recognizer = None
             self.microphone = None
         
-        # Initialize OpenAI handler for Whisper (lazy initialization)
-        self.openai_handler = None
+        # Local Whisper model is loaded once on first use and kept warm
+        self.local_model = None
+        self.local_model_name = None
+        self.local_model_lock = threading.Lock()
+        
+        # Transcription backends by service name (see Audio/transcription_service).
+        # A backend takes a WAV filename and returns text or a (text, confidence) tuple;
+        # cancellable backends also take a cancelled Event that a race sets once it has a winner.
+        self.transcribers = {
+            'google': self._recognize_google,
+            'openai_whisper': self.transcribe_with_whisper,
+            'local_whisper': self._recognize_local_whisper
+        }
+        self.cancellable_transcribers = set(self.transcribers)
+        
+        # Recordings still being read by race backends (filename -> readers), and those to
+        # delete once their last reader finishes
+        self.recording_readers = {}
+        self.pending_deletes = set()
+        self.recordings_lock = threading.Lock()
+        
+        # Per-backend latency and race win statistics
+        self.transcription_stats = {}
+        self.stats_lock = threading.Lock()
+        self.last_transcription = None
         
         # Audio recording settings
         self.channels = 1
         self.rate = 44100
         
+        # Warm stream state: the input stream stays open and feeds a pre-roll ring buffer
+        self.warm_stream = None
+        self.block_ms = 10
+        self.preroll_buffer = deque()
+        self.audio_lock = threading.Lock()
+        
         # Set default input device if available
         if AUDIO_AVAILABLE:
             try:
@@ -62,21 +101,83 @@ class AudioHandler:
         if not SPEECH_RECOGNITION_AVAILABLE or not AUDIO_AVAILABLE:
             print("Audio recording not available - skipping microphone calibration")
             return
-            
+        
         # Skip microphone calibration since we're using sounddevice instead of PyAudio
         print("Skipping microphone calibration (not needed with sounddevice)")
     
+    def probe_input_device(self):
+        """Query the default input device and check it supports the recording format"""
+        if not AUDIO_AVAILABLE:
+            return False
+        
+        device_info = sd.query_devices(kind='input')
+        sd.check_input_settings(samplerate=self.rate, channels=self.channels, dtype='int16')
+        return device_info['name']
+    
+    def start_warm_stream(self):
+        """Open an always-on input stream that keeps a short pre-roll buffer"""
+        if not AUDIO_AVAILABLE:
+            print("Audio libraries not available - cannot open warm stream")
+            return False
+        
+        if self.warm_stream:
+            return True
+        
+        try:
+            preroll_ms = max(0, self.config.get_audio_preroll_ms())
+            preroll_blocks = max(1, preroll_ms // self.block_ms)
+            self.preroll_buffer = deque(maxlen=preroll_blocks)
+            
+            self.warm_stream = sd.InputStream(
+                samplerate=self.rate,
+                channels=self.channels,
+                dtype='int16',
+                blocksize=int(self.rate * self.block_ms / 1000),
+                callback=self._recording_callback
+            )
+            self.warm_stream.start()
+            print(f"Warm input stream opened ({preroll_ms} ms pre-roll)")
+            return True
+        except Exception as e:
+            print(f"Error opening warm input stream: {e}")
+            self.warm_stream = None
+            return False
+    
+    def stop_warm_stream(self):
+        """Close the always-on input stream"""
+        if not self.warm_stream:
+            return
+        
+        try:
+            self.warm_stream.stop()
+            self.warm_stream.close()
+            print("Warm input stream closed")
+        except Exception as e:
+            print(f"Error closing warm input stream: {e}")
+        finally:
+            self.warm_stream = None
+            self.preroll_buffer.clear()
+    
     def start_recording(self):
         """Start continuous recording audio using sounddevice"""
         if not AUDIO_AVAILABLE:
             print("Audio libraries not available - cannot record audio")
             return False
-            
+        
         try:
             if self.recording:
                 print("Already recording, ignoring start request")
                 return False
-                
+            
+            if self.warm_stream:
+                # Stream is already running - seed the recording with the pre-roll
+                with self.audio_lock:
+                    self.audio_data = list(self.preroll_buffer)
+                    self.preroll_buffer.clear()
+                    self.recording = True
+                print(f"Recording from warm stream ({len(self.audio_data)} pre-roll blocks)")
+                return True
+            
             self.recording = True
             self.audio_data = []
             
@@ -102,19 +203,23 @@ class AudioHandler:
         if status:
             print(f"Recording status: {status}")
         
-        if self.recording and self.audio_data is not None:
-            self.audio_data.append(indata.copy())
+        with self.audio_lock:
+            if self.recording and self.audio_data is not None:
+                self.audio_data.append(indata.copy())
+            elif self.warm_stream:
+                self.preroll_buffer.append(indata.copy())
     
     def stop_recording(self):
         """Stop continuous recording audio"""
         if not self.recording:
             print("Not currently recording, ignoring stop request")
             return
-            
+        
         try:
-            self.recording = False
+            with self.audio_lock:
+                self.recording = False
             
-            # Stop the recording stream
+            # Stop the recording stream (the warm stream stays open)
             if hasattr(self, 'recording_stream') and self.recording_stream:
                 self.recording_stream.stop()
                 self.recording_stream.close()
@@ -127,23 +232,75 @@ class AudioHandler:
             else:
                 print("Recording stopped. No audio data captured.")
                 self.audio_data = None
-                
+        
         except Exception as e:
             print(f"Error stopping recording: {e}")
             self.recording = False
     
+    def get_recording_duration(self):
+        """Get duration of the last recording in seconds"""
+        if not AUDIO_AVAILABLE or self.audio_data is None:
+            return 0.0
+        return len(self.audio_data) / float(self.rate)
+    
+    def get_speech_ratio(self, frame_ms=30):
+        """Estimate the fraction of the last recording that contains speech (energy VAD)"""
+        if not AUDIO_AVAILABLE or self.audio_data is None or len(self.audio_data) == 0:
+            return 0.0
+        
+        samples = self.audio_data.reshape(-1).astype(np.float32) / 32768.0
+        frame_length = int(self.rate * frame_ms / 1000)
+        frame_count = len(samples) // frame_length
+        if frame_count == 0:
+            return 0.0
+        
+        frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+        levels_db = 20 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10)
+        
+        # A frame is speech if it is above the absolute threshold and clearly above the noise floor
+        threshold_db = float(self.config.get('SpeechGate', 'vad_threshold_db', '-45'))
+        noise_floor_db = np.percentile(levels_db, 10)
+        speech_frames = levels_db > max(threshold_db, noise_floor_db + 10)
+        return float(np.mean(speech_frames))
+    
+    def detect_speech(self):
+        """Check the last recording against the speech gate, returning (passed, reason)"""
+        if not self.config.get_speech_gate_enabled():
+            return True, None
+        
+        duration = self.get_recording_duration()
+        min_duration = float(self.config.get('SpeechGate', 'min_duration', '0.4'))
+        if duration < min_duration:
+            return False, f"recording too short ({duration:.2f}s < {min_duration}s)"
+        
+        speech_ratio = self.get_speech_ratio()
+        min_speech_ratio = float(self.config.get('SpeechGate', 'min_speech_ratio', '0.1'))
+        if speech_ratio < min_speech_ratio:
+            return False, f"no speech detected (speech ratio {speech_ratio:.2f} < {min_speech_ratio})"
+        
+        return True, None
+    
+    def is_transcript_confident(self, result=None):
+        """Check a transcription result against the speech gate confidence threshold"""
+        result = result or self.last_transcription
+        if not result or not result['text']:
+            return False
+        if not self.config.get_speech_gate_enabled() or result['confidence'] is None:
+            return True
+        return result['confidence'] >= float(self.config.get('SpeechGate', 'min_confidence', '0.4'))
+    
     def save_recording(self, filename="temp_recording.wav"):
         """Save recorded audio to file"""
         if not AUDIO_AVAILABLE or self.audio_data is None:
             print("Audio data not available - cannot save recording")
             return None
-            
+        
         try:
             # Check if we have valid audio data
             if len(self.audio_data) == 0:
                 print("No audio data to save")
                 return None
-                
+            
             # Save using soundfile
             sf.write(filename, self.audio_data, self.rate)
             print(f"Audio saved to {filename}")
@@ -154,62 +311,241 @@ class AudioHandler:
     
     def transcribe_audio(self, filename="temp_recording.wav"):
         """Transcribe audio file to text"""
-        # Reload config to get latest settings
-        self.config.load_config()
         transcription_service = self.config.get('Audio', 'transcription_service', 'google')
         
-        if transcription_service == 'openai_whisper':
-            return self.transcribe_with_whisper(filename)
+        if transcription_service == 'race':
+            result = self.transcribe_race(filename)
         else:
-            return self.transcribe_with_google(filename)
+            if transcription_service not in self.transcribers:
+                transcription_service = 'google'
+            result = self._run_transcriber(transcription_service, filename)
+        
+        self.last_transcription = result
+        return result['text']
+    
+    def _run_transcriber(self, service, filename, cancelled=None):
+        """Run one transcription backend and record its latency (not recorded if it was cancelled)"""
+        start_time = time.perf_counter()
+        text, confidence = None, None
+        if cancelled is not None and cancelled.is_set():
+            return {'service': service, 'text': None, 'confidence': None, 'latency': None}
+        try:
+            if cancelled is not None and service in self.cancellable_transcribers:
+                result = self.transcribers[service](filename, cancelled=cancelled)
+            else:
+                result = self.transcribers[service](filename)
+            if isinstance(result, tuple):
+                text, confidence = result
+            else:
+                text = result
+        except Exception as e:
+            print(f"Error in {service} transcription: {e}")
+        latency = time.perf_counter() - start_time
+        
+        if cancelled is None or not cancelled.is_set():
+            self._record_transcription_stats(service, latency, bool(text))
+        return {'service': service, 'text': text, 'confidence': confidence, 'latency': latency}
+    
+    def transcribe_race(self, filename="temp_recording.wav"):
+        """Send audio to several backends in parallel and use the first acceptable result"""
+        services = [service for service in self.config.get_transcription_race_services()
+                    if service in self.transcribers]
+        if not services:
+            print("No valid race services configured, falling back to Google")
+            return self._run_transcriber('google', filename)
+        
+        executor = self.services.get_executor('transcribe', max_workers=2 * len(self.transcribers))
+        timeout = float(self.config.get('Audio', 'race_timeout', '10'))
+        cancelled = threading.Event()
+        futures = []
+        for service in services:
+            # Each backend holds the recording until it is done, even after the race returns
+            self._hold_recording(filename)
+            future = executor.submit(self._run_transcriber, service, filename, cancelled)
+            future.add_done_callback(lambda _future: self._release_recording(filename))
+            futures.append(future)
+        
+        winner = None
+        fallback = None
+        try:
+            for future in concurrent.futures.as_completed(futures, timeout=timeout):
+                result = future.result()
+                if self._is_acceptable_transcript(result):
+                    winner = result
+                    break
+                if result['text'] and fallback is None:
+                    fallback = result
+        except concurrent.futures.TimeoutError:
+            print(f"Transcription race timed out after {timeout}s")
+        finally:
+            # Backends that have not started are dropped; running ones stop at their next check
+            # (an HTTP request already in flight still completes) and the recording is deleted
+            # by delete_recording once the last of them is done
+            cancelled.set()
+            for future in futures:
+                future.cancel()
+        
+        chosen = winner or fallback
+        with self.stats_lock:
+            for service in services:
+                self._get_stats_entry(service)['races'] += 1
+            if chosen:
+                self._get_stats_entry(chosen['service'])['wins'] += 1
+        
+        if chosen:
+            print(f"Transcription race won by {chosen['service']} in {chosen['latency']:.2f}s")
+            return chosen
+        return {'service': None, 'text': None, 'confidence': None, 'latency': None}
+    
+    def _hold_recording(self, filename):
+        """Keep a recording from being deleted while a backend reads it"""
+        with self.recordings_lock:
+            self.recording_readers[filename] = self.recording_readers.get(filename, 0) + 1
+    
+    def _release_recording(self, filename):
+        """Release a hold taken by _hold_recording, deleting the file if that was requested"""
+        with self.recordings_lock:
+            self.recording_readers[filename] -= 1
+            if self.recording_readers[filename] > 0:
+                return
+            del self.recording_readers[filename]
+            if filename not in self.pending_deletes:
+                return
+            self.pending_deletes.discard(filename)
+        self._remove_recording(filename)
+    
+    def delete_recording(self, filename):
+        """Delete a recording now, or once the race backends still reading it are done"""
+        with self.recordings_lock:
+            if self.recording_readers.get(filename):
+                self.pending_deletes.add(filename)
+                return
+        self._remove_recording(filename)
+    
+    def _remove_recording(self, filename):
+        """Remove a recording file, ignoring one that is already gone"""
+        try:
+            os.remove(filename)
+        except OSError as e:
+            if os.path.exists(filename):
+                print(f"Error deleting recording {filename}: {e}")
+    
+    def _is_acceptable_transcript(self, result):
+        """Check a race result against the configured length and confidence thresholds"""
+        text = (result['text'] or '').strip()
+        min_chars = int(self.config.get('Audio', 'race_min_chars', '2'))
+        if len(text) < min_chars or not any(char.isalnum() for char in text):
+            return False
+        
+        # Backends that do not report confidence pass on length alone
+        min_confidence = float(self.config.get('Audio', 'race_min_confidence', '0.5'))
+        confidence = result['confidence']
+        return confidence is None or confidence >= min_confidence
+    
+    def _get_stats_entry(self, service):
+        """Get (or create) the stats entry for a backend, caller holds stats_lock"""
+        if service not in self.transcription_stats:
+            self.transcription_stats[service] = {
+                'runs': 0, 'successes': 0, 'total_latency': 0.0, 'races': 0, 'wins': 0
+            }
+        return self.transcription_stats[service]
+    
+    def _record_transcription_stats(self, service, latency, success):
+        """Record latency and outcome of one transcription call"""
+        with self.stats_lock:
+            entry = self._get_stats_entry(service)
+            entry['runs'] += 1
+            entry['total_latency'] += latency
+            if success:
+                entry['successes'] += 1
+    
+    def get_transcription_stats(self):
+        """Get per-backend mean latency, success rate and race win rate"""
+        with self.stats_lock:
+            stats = {}
+            for service, entry in self.transcription_stats.items():
+                runs = entry['runs']
+                stats[service] = {
+                    'runs': runs,
+                    'mean_latency': entry['total_latency'] / runs if runs else None,
+                    'success_rate': entry['successes'] / runs if runs else None,
+                    'races': entry['races'],
+                    'wins': entry['wins'],
+                    'win_rate': entry['wins'] / entry['races'] if entry['races'] else None
+                }
+            return stats
+    
+    def register_transcriber(self, name, transcriber, cancellable=False):
+        """Register a transcription backend callable taking a WAV filename (and cancelled, if cancellable)"""
+        self.transcribers[name] = transcriber
+        if cancellable:
+            self.cancellable_transcribers.add(name)
+        else:
+            self.cancellable_transcribers.discard(name)
+    
+    def _whisper_language_code(self):
+        """Convert configured language to a 2-letter Whisper language code"""
+        language_full = self.config.get('Audio', 'language', 'en-US')
+        language_code = language_full[:2].lower()
+        
+        # Ensure Turkish is properly handled
+        if language_full == 'tr-TR':
+            language_code = 'tr'
+        return language_code
     
     def transcribe_with_google(self, filename="temp_recording.wav"):
         """Transcribe audio file using Google Speech Recognition"""
+        return self._recognize_google(filename)[0]
+    
+    def _recognize_google(self, filename="temp_recording.wav", cancelled=None):
+        """Transcribe with Google Speech Recognition, returning (text, confidence)"""
         if not SPEECH_RECOGNITION_AVAILABLE:
             print("Speech recognition not available - cannot transcribe audio")
-            return None
-            
+            return None, None
+        
         try:
             with sr.AudioFile(filename) as source:
                 audio = self.recognizer.record(source)
-                text = self.recognizer.recognize_google(audio, language=self.config.get('Audio', 'language', 'en-US'))
-                return text
-        except sr.UnknownValueError:
-            print("Could not understand audio")
-            return None
+                if cancelled is not None and cancelled.is_set():
+                    return None, None  # Another backend won the race; skip the request
+                response = self.recognizer.recognize_google(
+                    audio, language=self.config.get('Audio', 'language', 'en-US'), show_all=True)
+            
+            alternatives = response.get('alternative', []) if isinstance(response, dict) else []
+            if not alternatives:
+                print("Could not understand audio")
+                return None, None
+            
+            best = alternatives[0]
+            return best.get('transcript'), best.get('confidence')
         except sr.RequestError as e:
             print(f"Error with speech recognition service: {e}")
-            return None
+            return None, None
         except Exception as e:
             print(f"Error transcribing audio: {e}")
-            return None
+            return None, None
     
-    def transcribe_with_whisper(self, filename="temp_recording.wav"):
+    def transcribe_with_whisper(self, filename="temp_recording.wav", cancelled=None):
         """Transcribe audio file using OpenAI Whisper"""
-        # Initialize OpenAI handler if not already done
-        if self.openai_handler is None:
-            try:
-                from openai_handler import OpenAIHandler
-                self.openai_handler = OpenAIHandler()
-            except ImportError as e:
-                print(f"Error importing OpenAI handler: {e}")
-                return None
+        # Reuse the app's OpenAI handler; the container creates it once under its lock
+        try:
+            openai_handler = self.services.get_openai_handler()
+        except ImportError as e:
+            print(f"Error importing OpenAI handler: {e}")
+            return None
         
-        if not self.openai_handler.is_configured():
+        if not openai_handler.is_configured():
             print("OpenAI API not configured - cannot use Whisper")
             return None
-            
+        if cancelled is not None and cancelled.is_set():
+            return None  # Another backend won the race; skip the upload
+        
         try:
             with open(filename, 'rb') as audio_file:
                 # Convert language code for Whisper (uses 2-letter codes)
-                language_full = self.config.get('Audio', 'language', 'en-US')
-                language_code = language_full[:2].lower()
-                
-                # Ensure Turkish is properly handled
-                if language_full == 'tr-TR':
-                    language_code = 'tr'
+                language_code = self._whisper_language_code()
                 
-                transcript = self.openai_handler.client.audio.transcriptions.create(
+                transcript = openai_handler.client.audio.transcriptions.create(
                     model="whisper-1",
                     file=audio_file,
                     language=language_code
@@ -219,6 +555,70 @@ class AudioHandler:
             print(f"Error transcribing audio with Whisper: {e}")
             return None
     
+    def load_local_model(self):
+        """Load the local Whisper model once and keep it in memory"""
+        if not LOCAL_WHISPER_AVAILABLE:
+            print("faster-whisper not available - cannot use local transcription")
+            return None
+        
+        model_name = self.config.get('Audio', 'local_model', 'base')
+        
+        with self.local_model_lock:
+            if self.local_model is not None and self.local_model_name == model_name:
+                return self.local_model
+            
+            try:
+                start_time = time.perf_counter()
+                self.local_model = WhisperModel(
+                    model_name,
+                    device=self.config.get('Audio', 'local_device', 'cpu'),
+                    compute_type=self.config.get('Audio', 'local_compute_type', 'int8')
+                )
+                self.local_model_name = model_name
+                print(f"✓ Local Whisper model '{model_name}' loaded in {time.perf_counter() - start_time:.2f}s")
+            except Exception as e:
+                print(f"Error loading local Whisper model: {e}")
+                self.local_model = None
+                self.local_model_name = None
+            
+            return self.local_model
+    
+    def transcribe_with_local_whisper(self, filename="temp_recording.wav"):
+        """Transcribe audio file offline using a local faster-whisper model"""
+        return self._recognize_local_whisper(filename)[0]
+    
+    def _recognize_local_whisper(self, filename="temp_recording.wav", cancelled=None):
+        """Transcribe with the local Whisper model, returning (text, confidence)"""
+        model = self.load_local_model()
+        if model is None:
+            return None, None
+        
+        try:
+            segments, _info = model.transcribe(
+                filename,
+                language=self._whisper_language_code(),
+                beam_size=1,
+                vad_filter=True
+            )
+            
+            # Segments are decoded lazily, so a lost race stops the decoding between segments
+            decoded = []
+            for segment in segments:
+                if cancelled is not None and cancelled.is_set():
+                    return None, None
+                decoded.append(segment)
+            segments = decoded
+            text = "".join(segment.text for segment in segments).strip()
+            if not text:
+                return None, None
+            
+            # Mean per-token probability across segments
+            confidence = sum(math.exp(segment.avg_logprob) for segment in segments) / len(segments)
+            return text, confidence
+        except Exception as e:
+            print(f"Error transcribing audio with local Whisper: {e}")
+            return None, None
+    
     def record_and_transcribe(self):
         """Record audio and transcribe to text"""
         if self.start_recording():
@@ -238,7 +638,7 @@ class AudioHandler:
         if not SPEECH_RECOGNITION_AVAILABLE or not AUDIO_AVAILABLE:
             print("Audio recording not available - cannot listen for speech")
             return None
-            
+        
         try:
             print("Listening for speech...")
             
@@ -265,7 +665,7 @@ class AudioHandler:
                 os.remove(temp_filename)
             except:
                 pass
-                
+            
             return text
         except Exception as e:
             print(f"Error listening for speech: {e}")
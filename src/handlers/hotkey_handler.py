@@ -1,21 +1,33 @@
 import keyboard
 import threading
 import time
-from src.core.config import Config
+from collections import deque
+from src.core.services import ServiceContainer
 
 class HotkeyHandler:
-    def __init__(self, main_app):
+    def __init__(self, main_app, services=None):
         self.main_app = main_app
-        self.config = Config()
+        self.services = services or ServiceContainer()
+        self.config = self.services.config
         self.current_hotkey = None
         self.current_stop_hotkey = None
         self.is_listening = False
-        self.hotkey_pressed = False
         self.stop_hotkey_pressed = False
-        self.hotkey_keys = []
         self.stop_hotkey_keys = []
-        self.monitor_thread = None
         
+        # One push-to-talk binding per enabled profile: profile name -> resolved chord keys
+        self.current_profiles = []
+        self.profile_keys = {}
+        self.profile_pressed = {}
+        
+        # Key events arrive on the keyboard library's hook thread; no polling thread is needed
+        self.hook = None
+        self.pressed_keys = set()
+        self.state_lock = threading.Lock()
+        
+        # Time from the OS key event to our handler being dispatched
+        self.dispatch_latencies = deque(maxlen=100)
+    
     def start_listening(self):
         """Start listening for global hotkeys"""
         if self.is_listening:
@@ -24,19 +36,25 @@ class HotkeyHandler:
         self.is_listening = True
         self.current_hotkey = self.config.get_hotkey()
         self.current_stop_hotkey = self.config.get_stop_speaking_hotkey()
+        self.current_profiles = self._get_profile_bindings(self.current_stop_hotkey)
         
         try:
-            # Parse the hotkey combinations
-            self.hotkey_keys = self._parse_hotkey_combination(self.current_hotkey)
-            self.stop_hotkey_keys = self._parse_hotkey_combination(self.current_stop_hotkey)
+            # Parse the hotkey combinations into the key codes that satisfy each key
+            self.profile_keys = {}
+            for name, hotkey in self.current_profiles:
+                self.profile_keys[name] = self._resolve_keys(self._parse_hotkey_combination(hotkey))
+            self.profile_pressed = {name: False for name in self.profile_keys}
+            self.stop_hotkey_keys = self._resolve_keys(self._parse_hotkey_combination(self.current_stop_hotkey))
             
             print(f"Push-to-talk hotkey registered: {self.current_hotkey}")
+            for name, hotkey in self.current_profiles:
+                if name != 'default':
+                    print(f"Profile '{name}' hotkey registered: {hotkey}")
             print(f"Stop speaking hotkey registered: {self.current_stop_hotkey}")
             
-            # Start monitoring thread
-            self.monitor_thread = threading.Thread(target=self._monitor_keys, daemon=True)
-            self.monitor_thread.start()
-            
+            # Press/release detection is driven by keyboard events
+            self.hook = keyboard.hook(self._handle_key_event)
+        
         except Exception as e:
             print(f"Error setting up hotkey: {e}")
             self.is_listening = False
@@ -45,57 +63,141 @@ class HotkeyHandler:
         """Stop listening for global hotkeys"""
         if not self.is_listening:
             return
-            
+        
         self.is_listening = False
         
         try:
-            # Wait for monitor thread to finish
-            if self.monitor_thread:
-                self.monitor_thread.join(timeout=1.0)
+            if self.hook:
+                keyboard.unhook(self.hook)
+                self.hook = None
             print(f"Push-to-talk hotkey unregistered: {self.current_hotkey}")
         except Exception as e:
             print(f"Error removing hotkey: {e}")
+        finally:
+            with self.state_lock:
+                self.pressed_keys.clear()
+                self.profile_pressed = {name: False for name in self.profile_keys}
+                self.stop_hotkey_pressed = False
     
-    def _monitor_keys(self):
-        """Monitor hotkey states continuously"""
+    def _handle_key_event(self, event):
+        """Track held keys and fire press/release when a hotkey chord becomes held or broken"""
         try:
-            while self.is_listening:
-                try:
-                    # Check main hotkey (push-to-talk)
-                    main_keys_pressed = self._are_keys_pressed(self.hotkey_keys)
-                    
-                    if main_keys_pressed and not self.hotkey_pressed:
-                        # Main hotkey just pressed
-                        self.hotkey_pressed = True
-                        print(f"Hotkey pressed - starting capture and recording: {self.current_hotkey}")
-                        self._on_hotkey_press()
-                    elif not main_keys_pressed and self.hotkey_pressed:
-                        # Main hotkey just released
-                        self.hotkey_pressed = False
-                        print(f"Hotkey released - stopping recording: {self.current_hotkey}")
-                        self._on_hotkey_release()
-                    
-                    # Check stop speaking hotkey
-                    stop_keys_pressed = self._are_keys_pressed(self.stop_hotkey_keys)
-                    
-                    if stop_keys_pressed and not self.stop_hotkey_pressed:
-                        # Stop speaking hotkey just pressed
-                        self.stop_hotkey_pressed = True
-                        print(f"Stop speaking hotkey pressed: {self.current_stop_hotkey}")
-                        self._on_stop_speaking_press()
-                    elif not stop_keys_pressed and self.stop_hotkey_pressed:
-                        # Stop speaking hotkey just released
-                        self.stop_hotkey_pressed = False
-                    
-                    # Sleep briefly to avoid excessive CPU usage
-                    time.sleep(0.05)  # 50ms polling interval
-                    
-                except Exception as e:
-                    print(f"Error in key monitoring: {e}")
-                    time.sleep(0.1)
-                    
+            key = self._event_key(event)
+            with self.state_lock:
+                if event.event_type == keyboard.KEY_DOWN:
+                    if key in self.pressed_keys:
+                        return  # Auto-repeat
+                    self.pressed_keys.add(key)
+                else:
+                    self.pressed_keys.discard(key)
+                
+                held_profiles = self._get_held_profiles()
+                stop_keys_pressed = self._is_chord_held(self.stop_hotkey_keys)
+                
+                # Modifier state machine per profile: idle -> held when the last key of the chord
+                # goes down, held -> idle as soon as any key of the chord is released
+                transitions = []
+                for name, was_pressed in self.profile_pressed.items():
+                    is_pressed = name in held_profiles
+                    if is_pressed != was_pressed:
+                        self.profile_pressed[name] = is_pressed
+                        transitions.append(('press' if is_pressed else 'release', name))
+                
+                stop_pressed = stop_keys_pressed and not self.stop_hotkey_pressed
+                self.stop_hotkey_pressed = stop_keys_pressed
+                
+                # Releases first, so a chord growing into a longer one hands over in order. Queued
+                # under the lock, so the 'capture' worker gets every press and release in key order
+                transitions.sort(key=lambda transition: transition[0] != 'release')
+                for kind, name in transitions:
+                    self._record_latency(event)
+                    if kind == 'press':
+                        self._on_hotkey_press(name)
+                    else:
+                        self._on_hotkey_release(name)
+            
+            if stop_pressed:
+                self._record_latency(event)
+                self._on_stop_speaking_press()
+        
         except Exception as e:
-            print(f"Error in key monitoring thread: {e}")
+            print(f"Error in key event handler: {e}")
+    
+    def _event_key(self, event):
+        """Identify a key event by scan code, falling back to its name"""
+        if event.scan_code is not None:
+            return event.scan_code
+        return (event.name or '').lower()
+    
+    def _get_profile_bindings(self, stop_hotkey):
+        """Get (profile name, hotkey) pairs for enabled profiles, skipping duplicate hotkeys"""
+        bindings = []
+        seen_hotkeys = {stop_hotkey}
+        for profile in self.config.get_profiles():
+            if profile['hotkey'] in seen_hotkeys:
+                print(f"Warning: hotkey {profile['hotkey']} of profile '{profile['name']}' is already in use")
+                continue
+            seen_hotkeys.add(profile['hotkey'])
+            bindings.append((profile['name'], profile['hotkey']))
+        return bindings
+    
+    def _get_held_profiles(self):
+        """Get profiles whose chord is held, dropping chords contained in a longer held chord
+        
+        E.g. with ctrl+shift+s and ctrl+shift+alt+s held only the longer chord counts.
+        Caller holds state_lock.
+        """
+        held = [name for name, keys in self.profile_keys.items() if self._is_chord_held(keys)]
+        if len(held) < 2:
+            return set(held)
+        
+        def chord(name):
+            return [frozenset(codes) for codes in self.profile_keys[name]]
+        
+        result = set()
+        for name in held:
+            keys = chord(name)
+            contained = any(
+                other != name and len(chord(other)) > len(keys) and all(codes in chord(other) for codes in keys)
+                for other in held
+            )
+            if not contained:
+                result.add(name)
+        return result
+    
+    def _is_chord_held(self, keys):
+        """Check if every key of a chord has at least one of its codes held, caller holds state_lock"""
+        return bool(keys) and all(codes & self.pressed_keys for codes in keys)
+    
+    def _resolve_keys(self, key_names):
+        """Map key names to the set of scan codes (and the name) that count as that key"""
+        resolved = []
+        for name in key_names:
+            codes = {name}
+            try:
+                # 'ctrl' resolves to both left and right ctrl, letters are layout-aware
+                codes.update(keyboard.key_to_scan_codes(name))
+            except ValueError:
+                print(f"Warning: unknown key '{name}' in hotkey")
+            resolved.append(codes)
+        return resolved
+    
+    def _record_latency(self, event):
+        """Record time from the key event to handler dispatch"""
+        if event.time:
+            self.dispatch_latencies.append(time.time() - event.time)
+    
+    def get_latency_stats(self):
+        """Get hotkey dispatch latency statistics in milliseconds"""
+        latencies = sorted(self.dispatch_latencies)
+        if not latencies:
+            return None
+        return {
+            'count': len(latencies),
+            'mean_ms': sum(latencies) / len(latencies) * 1000,
+            'p95_ms': latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+            'max_ms': latencies[-1] * 1000
+        }
     
     def _parse_hotkey_combination(self, hotkey_string):
         """Parse hotkey combination into individual keys"""
@@ -120,53 +222,40 @@ class HotkeyHandler:
             print(f"Error parsing hotkey: {e}")
             return []
     
-    def _are_keys_pressed(self, keys):
-        """Check if all specified keys are currently pressed"""
-        try:
-            for key in keys:
-                if key == 'ctrl' and not (keyboard.is_pressed('ctrl') or keyboard.is_pressed('left ctrl') or keyboard.is_pressed('right ctrl')):
-                    return False
-                elif key == 'alt' and not (keyboard.is_pressed('alt') or keyboard.is_pressed('left alt') or keyboard.is_pressed('right alt')):
-                    return False
-                elif key == 'shift' and not (keyboard.is_pressed('shift') or keyboard.is_pressed('left shift') or keyboard.is_pressed('right shift')):
-                    return False
-                elif key not in ['ctrl', 'alt', 'shift'] and not keyboard.is_pressed(key):
-                    return False
-            return True
-        except Exception as e:
-            print(f"Error checking key states: {e}")
-            return False
-    
-    def _on_hotkey_press(self):
+    def _on_hotkey_press(self, profile='default'):
         """Handle hotkey press event"""
-        print(f"Hotkey pressed - starting capture and recording: {self.current_hotkey}")
+        print(f"Hotkey pressed - starting capture and recording: {self._profile_hotkey(profile)} ({profile})")
         
         try:
-            # Call the main app's hotkey press handler
+            # Press and release share the single 'capture' worker, so a release always runs after its press
             if self.main_app:
-                threading.Thread(target=self.main_app.handle_hotkey_press, daemon=True).start()
+                self.services.submit('capture', self.main_app.handle_hotkey_press, profile)
         except Exception as e:
             print(f"Error handling hotkey press: {e}")
     
-    def _on_hotkey_release(self):
+    def _on_hotkey_release(self, profile='default'):
         """Handle hotkey release event"""
-        print(f"Hotkey released - stopping recording: {self.current_hotkey}")
+        print(f"Hotkey released - stopping recording: {self._profile_hotkey(profile)} ({profile})")
         
         try:
-            # Call the main app's hotkey release handler
+            # Queued behind the press on the 'capture' worker
             if self.main_app:
-                threading.Thread(target=self.main_app.handle_hotkey_release, daemon=True).start()
+                self.services.submit('capture', self.main_app.handle_hotkey_release, profile)
         except Exception as e:
             print(f"Error handling hotkey release: {e}")
     
+    def _profile_hotkey(self, profile):
+        """Get the registered hotkey of a profile"""
+        return dict(self.current_profiles).get(profile, self.current_hotkey)
+    
     def _on_stop_speaking_press(self):
         """Handle stop speaking hotkey press event"""
         print(f"Stop speaking hotkey pressed: {self.current_stop_hotkey}")
         
         try:
-            # Call the main app's stop speaking handler
+            # Stop must not wait behind a capture in progress
             if self.main_app:
-                threading.Thread(target=self.main_app.handle_stop_speaking, daemon=True).start()
+                self.services.submit('io', self.main_app.handle_stop_speaking)
         except Exception as e:
             print(f"Error handling stop speaking hotkey: {e}")
     
@@ -174,15 +263,20 @@ class HotkeyHandler:
         """Update the hotkey configuration"""
         new_hotkey = self.config.get_hotkey()
         new_stop_hotkey = self.config.get_stop_speaking_hotkey()
+        new_profiles = self._get_profile_bindings(new_stop_hotkey)
         
         if new_hotkey != self.current_hotkey or new_stop_hotkey != self.current_stop_hotkey:
             print(f"Updating hotkeys from {self.current_hotkey}/{self.current_stop_hotkey} to {new_hotkey}/{new_stop_hotkey}")
-            
-            # Stop current listening
-            self.stop_listening()
-            
-            # Start with new hotkeys
-            self.start_listening()
+        elif new_profiles != self.current_profiles:
+            print(f"Updating hotkey profiles to {', '.join(name for name, _ in new_profiles)}")
+        else:
+            return
+        
+        # Stop current listening
+        self.stop_listening()
+        
+        # Start with new hotkeys
+        self.start_listening()
     
     def is_valid_hotkey(self, hotkey_string):
         """Check if a hotkey string is valid"""
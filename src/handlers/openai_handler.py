@@ -3,25 +3,31 @@ import base64
 import json
 import hashlib
 import time
-from src.core.config import Config
+from src.core.services import ServiceContainer
+
+# Most points of interest kept from one response
+MAX_POINTS_OF_INTEREST = 6
 
 class OpenAIHandler:
-    def __init__(self):
-        self.config = Config()
+    def __init__(self, services=None):
+        self.services = services or ServiceContainer()
+        self.config = self.services.config
         self.client = None
         self.coordinate_cache = {}  # Cache for coordinate consistency
+        self.description_cache = {}  # Screen hash -> last description response
         self.cache_timeout = 300  # 5 minutes cache timeout
         self.setup_client()
     
     def setup_client(self):
         """Setup OpenAI client"""
-        # Reload config to get latest settings
-        self.config.load_config()
         api_key = self.config.get_openai_key()
+        base_url = self.config.get('OpenAI', 'base_url', '').strip() or None
         
         if api_key and api_key.strip():
             try:
-                self.client = openai.OpenAI(api_key=api_key.strip())
+                # Share one pooled HTTP client so reconfiguring keeps warm connections
+                self.client = openai.OpenAI(api_key=api_key.strip(), base_url=base_url,
+                                            http_client=self.services.get_http_client())
                 print("✓ OpenAI client configured successfully")
             except Exception as e:
                 print(f"Error setting up OpenAI client: {e}")
@@ -35,30 +41,34 @@ class OpenAIHandler:
         self.config.set_openai_key(api_key)
         self.setup_client()
     
-    def analyze_screenshot_with_text(self, screenshot_base64, user_text=None):
-        """Analyze screenshot with optional user text using GPT-4 Vision - Always returns structured response"""
+    def analyze_screenshot_with_text(self, screenshot_base64, user_text=None, profile=None, image_size=None):
+        """Analyze screenshot with optional user text using GPT-4 Vision - Always returns structured response
+        
+        profile overrides the prompt, model and image detail (see Config.get_profile); image_size
+        is the screenshot's size when it is a region or scaled copy of the screen.
+        """
         if not self.client:
             return "Error: OpenAI API key not configured"
         
         try:
-            # Reload config to get latest settings
-            self.config.load_config()
-            
             # Always use structured response format
-            return self._analyze_with_structured_response(screenshot_base64, user_text)
-                
+            return self._analyze_with_structured_response(screenshot_base64, user_text, profile, image_size)
+        
         except Exception as e:
             return f"Error analyzing screenshot: {str(e)}"
     
-    def _analyze_with_structured_response(self, screenshot_base64, user_text=None):
+    def _analyze_with_structured_response(self, screenshot_base64, user_text=None, profile=None, image_size=None):
         """Analyze screenshot and return structured JSON response"""
-        # Check for cached coordinates if user_text is provided
+        profile = profile or {}
+        
+        # Check for cached coordinates if user_text is provided (per image size, since
+        # cropped or scaled screenshots use their own coordinate space)
         cached_coordinates = None
         query_hash = None
         if user_text:
-            query_hash = self._generate_query_hash(user_text)
+            query_hash = self._generate_query_hash(user_text, image_size)
             cached_coordinates = self._get_cached_coordinates(query_hash)
-            
+        
         # Get prompt settings
         system_prompt = self.config.get('Prompts', 'system_prompt', 
                                       'You are a helpful AI assistant that analyzes screenshots and provides clear, concise answers.')
@@ -69,23 +79,29 @@ class OpenAIHandler:
         # Try to get screen resolution for context
         screen_context = ""
         screen_width = screen_height = None
-        try:
-            import tkinter as tk
-            root = tk._default_root
-            if root:
-                screen_width = root.winfo_screenwidth()
-                screen_height = root.winfo_screenheight()
-                screen_context = f"\n\nSCREEN CONTEXT: This screenshot is from a {screen_width}x{screen_height} display."
-        except:
-            pass
+        if image_size:
+            image_width, image_height = image_size
+            screen_context = (f"\n\nSCREEN CONTEXT: This screenshot is {image_width}x{image_height} pixels. "
+                              f"Give coordinates in the screenshot's own pixels.")
+        else:
+            try:
+                import tkinter as tk
+                root = tk._default_root
+                if root:
+                    screen_width = root.winfo_screenwidth()
+                    screen_height = root.winfo_screenheight()
+                    screen_context = f"\n\nSCREEN CONTEXT: This screenshot is from a {screen_width}x{screen_height} display."
+            except:
+                pass
         
         # Prepare the message content
+        image_url = {"url": f"data:image/png;base64,{screenshot_base64}"}
+        if profile.get('detail') in ('low', 'high'):
+            image_url["detail"] = profile['detail']
         content = [
             {
                 "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/png;base64,{screenshot_base64}"
-                }
+                "image_url": image_url
             }
         ]
         
@@ -103,6 +119,9 @@ You must respond with a JSON object containing:
 - y: Y coordinate of the main point of interest (integer)  
 - r: Radius around the point of interest for highlighting (integer, typically 25-100 for icons, 50-300 for larger elements)
 - tx: The actual text response to be spoken (string)
+- points: OPTIONAL list of up to {MAX_POINTS_OF_INTEREST} points of interest, only when the answer refers to several elements
+  (e.g. "where are the save and export buttons?" or step-by-step instructions). Each item has x, y, r like above
+  and a short "label" (string, e.g. "Save" or "Step 1"). x, y and r above must be the first point.
 
 CRITICAL VISUAL ANALYSIS INSTRUCTIONS:
 - Use screen coordinates where (0,0) is at the TOP-LEFT corner
@@ -153,6 +172,9 @@ COORDINATE PRECISION:
 Example format:
 {{"x": 150, "y": 200, "r": 100, "tx": "I can see a login form with username and password fields"}}
 
+Example with several points:
+{{"x": 40, "y": 60, "r": 30, "tx": "Save is at the top left, Export is next to it", "points": [{{"x": 40, "y": 60, "r": 30, "label": "Save"}}, {{"x": 110, "y": 60, "r": 30, "label": "Export"}}]}}
+
 ICON IDENTIFICATION EXAMPLES:
 - For "Where is Spotify icon": Look for green circular icon with sound waves, provide exact center coordinates
 - For "Find Chrome icon": Look for colorful circular icon with red, yellow, green, blue colors  
@@ -170,8 +192,14 @@ Instructions:
         
         prompt_parts.append(structured_instructions)
         
-        # Add user text if provided
-        if user_text:
+        # Add user text if provided; a profile prompt replaces the default request
+        prompt_template = profile.get('prompt', '').strip()
+        if prompt_template:
+            if user_text and '{question}' not in prompt_template:
+                prompt_parts.append(f"User question: {user_text}")
+            prompt_parts.append(prompt_template.replace('{question}', user_text or ''))
+            prompt_parts.append("Respond in the structured JSON format above.")
+        elif user_text:
             prompt_parts.append(f"User question: {user_text}")
             prompt_parts.append("Please analyze this screenshot and answer the user's question in the structured JSON format above.")
         else:
@@ -203,7 +231,7 @@ Instructions:
         })
         
         response = self.client.chat.completions.create(
-            model=self.config.get('OpenAI', 'model', 'gpt-4o'),
+            model=profile.get('model') or self.config.get('OpenAI', 'model', 'gpt-4o'),
             messages=messages,
             max_tokens=int(self.config.get('OpenAI', 'max_tokens', '1000')),
             temperature=float(self.config.get('OpenAI', 'temperature', '0.1'))  # Low temperature for consistency
@@ -216,7 +244,8 @@ Instructions:
             try:
                 # Parse the response to get coordinates
                 parsed_data, error = self.parse_structured_response(response_content)
-                if parsed_data and not error:
+                # Only single-point answers are smoothed; several points are returned as they are
+                if parsed_data and not error and len(parsed_data['points']) == 1:
                     # Apply coordinate smoothing if we have cached coordinates
                     smoothed_data = self._smooth_coordinates(parsed_data, cached_coordinates)
                     
@@ -230,7 +259,7 @@ Instructions:
         
         return response_content
     
-
+    
     
     def parse_structured_response(self, response_text):
         """Parse structured JSON response and return data"""
@@ -263,13 +292,47 @@ Instructions:
             if not isinstance(data['tx'], str) or not data['tx'].strip():
                 return None, "Invalid text: tx must be a non-empty string"
             
-            return data, None
+            # Normalize to a list of labelled points; the first one is also x/y/r
+            points = self._parse_points(data.get('points'))
+            if points:
+                data['x'], data['y'], data['r'] = points[0]['x'], points[0]['y'], points[0]['r']
+            else:
+                points = [{'x': data['x'], 'y': data['y'], 'r': data['r'], 'label': ''}]
+            data['points'] = points
             
+            return data, None
+        
         except json.JSONDecodeError as e:
             return None, f"JSON parsing error: {str(e)}"
         except Exception as e:
             return None, f"Error parsing response: {str(e)}"
     
+    def _parse_points(self, points):
+        """Get the valid entries of the optional points list; invalid ones are skipped, not errors"""
+        if points is None:
+            return []
+        if not isinstance(points, list):
+            print("Warning: ignoring points: must be a list")
+            return []
+        
+        parsed = []
+        for point in points:
+            if len(parsed) >= MAX_POINTS_OF_INTEREST:
+                break
+            if not isinstance(point, dict) or not all(key in point for key in ['x', 'y', 'r']):
+                print(f"Warning: ignoring point without x, y and r: {point}")
+                continue
+            if not isinstance(point['x'], int) or not isinstance(point['y'], int):
+                print(f"Warning: ignoring point with non-integer x or y: {point}")
+                continue
+            if not isinstance(point['r'], int) or point['r'] <= 0:
+                print(f"Warning: ignoring point without a positive integer r: {point}")
+                continue
+            label = point.get('label', '')
+            parsed.append({'x': point['x'], 'y': point['y'], 'r': point['r'],
+                           'label': label.strip() if isinstance(label, str) else ''})
+        return parsed
+    
     def _generate_query_hash(self, user_text, screenshot_size=None):
         """Generate a hash for the query to use as cache key"""
         if screenshot_size:
@@ -294,6 +357,23 @@ Instructions:
             'timestamp': time.time()
         }
     
+    def get_cached_description(self, screen_hash):
+        """Get a cached description response for a screen hash"""
+        if screen_hash and screen_hash in self.description_cache:
+            cache_entry = self.description_cache[screen_hash]
+            if time.time() - cache_entry['timestamp'] < self.cache_timeout:
+                return cache_entry['response']
+        return None
+    
+    def cache_description(self, screen_hash, response):
+        """Cache a description response for a screen hash"""
+        if not screen_hash:
+            return
+        self.description_cache[screen_hash] = {
+            'response': response,
+            'timestamp': time.time()
+        }
+    
     def _smooth_coordinates(self, new_coords, cached_coords, similarity_threshold=50):
         """Apply coordinate smoothing if the new coordinates are close to cached ones"""
         if not cached_coords:
@@ -311,7 +391,9 @@ Instructions:
                 'x': cached_coords['x'],
                 'y': cached_coords['y'],
                 'r': new_coords['r'],  # Use new radius
-                'tx': new_coords['tx']  # Use new text
+                'tx': new_coords['tx'],  # Use new text
+                'points': [{'x': cached_coords['x'], 'y': cached_coords['y'], 'r': new_coords['r'],
+                            'label': new_coords['points'][0]['label'] if new_coords.get('points') else ''}]
             }
         
         return new_coords
@@ -332,7 +414,7 @@ Instructions:
             )
             
             return response.choices[0].message.content
-            
+        
         except Exception as e:
             return f"Error getting chat completion: {str(e)}"
     
@@ -340,6 +422,12 @@ Instructions:
         """Check if OpenAI API is properly configured"""
         return self.client is not None and self.config.get_openai_key() != ""
     
+    def warm_up(self):
+        """Open a pooled connection to the API host so the first request skips DNS/TLS setup"""
+        if not self.client:
+            return False
+        return self.services.prime_connection(str(self.client.base_url))
+    
     def test_connection(self):
         """Test OpenAI API connection"""
         if not self.client:
@@ -8,12 +8,38 @@ class ScreenshotHandler:
     def __init__(self):
         # Disable pyautogui's fail-safe feature
         pyautogui.FAILSAFE = False
+        
+        # Perceptual hash of the last captured screen
+        self.last_screen_hash = None
+        
+        # Screen size in pixels, cached by warm_up()
+        self.screen_size = None
+        
+        # Where the last screenshot came from: {'left', 'top', 'scale', 'size'}
+        self.last_capture_geometry = None
     
-    def capture_screenshot(self):
-        """Capture screenshot and return as base64 encoded string"""
+    def capture_screenshot(self, region='full', scale=1.0):
+        """Capture screenshot and return as base64 encoded string
+        
+        region is 'full', 'active_window' or 'x,y,width,height'; scale < 1 downsizes the image.
+        """
         try:
             # Take screenshot
-            screenshot = pyautogui.screenshot()
+            box = self.resolve_region(region)
+            screenshot = pyautogui.screenshot(region=box) if box else pyautogui.screenshot()
+            self.last_screen_hash = self.compute_screen_hash(screenshot)
+            
+            if scale < 1.0:
+                width, height = screenshot.size
+                screenshot = screenshot.resize((max(1, int(width * scale)), max(1, int(height * scale))),
+                                               Image.BILINEAR)
+            
+            self.last_capture_geometry = {
+                'left': box[0] if box else 0,
+                'top': box[1] if box else 0,
+                'scale': scale if scale < 1.0 else 1.0,
+                'size': screenshot.size
+            }
             
             # Convert PIL Image to bytes
             img_buffer = io.BytesIO()
@@ -28,6 +54,59 @@ class ScreenshotHandler:
             print(f"Error capturing screenshot: {e}")
             return None
     
+    def resolve_region(self, region):
+        """Resolve a capture region setting to a (left, top, width, height) box, or None for the full screen"""
+        region = (region or 'full').strip().lower()
+        if region == 'full':
+            return None
+        
+        if region == 'active_window':
+            try:
+                window = pyautogui.getActiveWindow()
+                if window and window.width > 0 and window.height > 0:
+                    return (max(window.left, 0), max(window.top, 0), window.width, window.height)
+            except Exception as e:
+                print(f"Could not get active window, capturing full screen: {e}")
+            return None
+        
+        try:
+            left, top, width, height = (int(part) for part in region.split(','))
+            if width > 0 and height > 0:
+                return (left, top, width, height)
+        except ValueError:
+            pass
+        print(f"Invalid capture region '{region}', capturing full screen")
+        return None
+    
+    def to_screen_coordinates(self, x, y, radius, geometry):
+        """Map a point and radius from screenshot pixels back to screen pixels"""
+        if not geometry:
+            return x, y, radius
+        scale = geometry['scale']
+        return (int(round(geometry['left'] + x / scale)), int(round(geometry['top'] + y / scale)),
+                int(round(radius / scale)))
+    
+    def compute_screen_hash(self, image, hash_size=32):
+        """Compute an average hash of the image, stable across tiny pixel changes"""
+        try:
+            small = image.convert('L').resize((hash_size, hash_size), Image.BILINEAR)
+            pixels = list(small.getdata())
+            average = sum(pixels) / len(pixels)
+            bits = ''.join('1' if pixel > average else '0' for pixel in pixels)
+            return f"{int(bits, 2):0{hash_size * hash_size // 4}x}"
+        except Exception as e:
+            print(f"Error computing screen hash: {e}")
+            return None
+    
+    def warm_up(self):
+        """Cache the screen size and run one capture to initialize the capture backend"""
+        width, height = self.get_screen_resolution()
+        if width is None:
+            return False
+        self.screen_size = (width, height)
+        pyautogui.screenshot()
+        return True
+    
     def capture_screenshot_file(self, filename=None):
         """Capture screenshot and save to file"""
         try:
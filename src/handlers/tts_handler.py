@@ -1,8 +1,13 @@
 import pyttsx3
 import threading
-import os
-import tempfile
-from src.core.config import Config
+import io
+import time
+import queue
+import concurrent.futures
+from collections import deque
+from src.core.services import ServiceContainer
+from src.utils.tts_cache import TTSCache
+from src.utils.sentence_segmenter import split_sentences
 
 # Try to import gTTS and pygame for online TTS
 try:
@@ -14,13 +19,59 @@ except ImportError as e:
     GTTS_AVAILABLE = False
     print(f"⚠ Google TTS not available: {e}")
 
+# sounddevice plays OpenAI's raw PCM stream as it arrives
+try:
+    import sounddevice as sd
+    STREAMING_PLAYBACK_AVAILABLE = True
+except ImportError:
+    STREAMING_PLAYBACK_AVAILABLE = False
+
+# OpenAI speech PCM format: 24 kHz, 16-bit signed, mono
+OPENAI_TTS_SAMPLE_RATE = 24000
+OPENAI_TTS_CHUNK_BYTES = 2400  # 50 ms of audio
+
+# Long sentences are split at clause punctuation so the first audio is not delayed
+TTS_MAX_CHUNK_CHARS = 250
+
 class TTSHandler:
-    def __init__(self):
-        self.config = Config()
-        self.engine = pyttsx3.init()
+    def __init__(self, services=None):
+        self.services = services or ServiceContainer()
+        self.config = self.services.config
+        self.engine = None
         self.speaking = False
-        self.current_thread = None
-        self.stop_requested = False
+        
+        # stop() bumps the generation; utterances from older generations are cancelled
+        self.state_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.speak_generation = 0
+        self.current_generation = 0
+        self.stop_requested_at = None
+        self.last_stop_latency = None
+        
+        # Time-to-first-audio and inter-sentence gap measurements
+        self.current_metrics = None
+        self.last_speech_metrics = None
+        self.speech_metrics_history = deque(maxlen=50)
+        
+        # Per-sentence audio cache for the network engines (google, openai); it is checked where
+        # each sentence is synthesized, so a repeat still segments the text but makes no requests.
+        # pyttsx3 plays straight to the device, so local speech is never cached.
+        self.audio_cache = None
+        if self.config.get_tts_cache_enabled():
+            self.audio_cache = TTSCache(
+                self.config.get('TTS', 'cache_dir', 'tts_cache'),
+                int(float(self.config.get('TTS', 'cache_max_mb', '50')) * 1024 * 1024)
+            )
+        
+        # A single long-lived worker owns the engines and runs speak/config commands in order
+        self.command_queue = queue.Queue()
+        self.worker_thread = threading.Thread(target=self._worker_loop, name='tts-worker', daemon=True)
+        self.worker_thread.start()
+        self._submit(self._init_engines)
+    
+    def _init_engines(self):
+        """Create the TTS engines on the worker thread"""
+        self.engine = pyttsx3.init()
         
         # Initialize pygame mixer for gTTS playback
         if GTTS_AVAILABLE:
@@ -31,9 +82,45 @@ class TTSHandler:
                 print(f"⚠ Pygame mixer initialization failed: {e}")
         
         self.setup_voice()
-        
+    
+    def _worker_loop(self):
+        """Run queued commands until shutdown"""
+        while True:
+            command = self.command_queue.get()
+            if command is None:
+                break
+            
+            func, args, future = command
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                print(f"Error in TTS worker: {e}")
+                future.set_exception(e)
+    
+    def _submit(self, func, *args):
+        """Queue a command for the TTS worker"""
+        future = concurrent.futures.Future()
+        self.command_queue.put((func, args, future))
+        return future
+    
+    def _on_worker(self):
+        """Check if the caller is the TTS worker thread"""
+        return threading.current_thread() is self.worker_thread
+    
+    @property
+    def stop_requested(self):
+        """Whether the utterance being spoken has been cancelled"""
+        return self.current_generation != self.speak_generation
+    
     def setup_voice(self):
         """Setup TTS voice properties"""
+        # Engine properties are only touched on the worker thread
+        if not self._on_worker():
+            self._submit(self.setup_voice)
+            return
+        
         try:
             # Set speech rate
             rate = int(self.config.get('TTS', 'rate', '200'))
@@ -50,6 +137,10 @@ class TTSHandler:
     
     def set_voice_by_language(self):
         """Set voice based on configured language"""
+        if not self._on_worker():
+            self._submit(self.set_voice_by_language)
+            return
+        
         try:
             language = self.config.get('Audio', 'language', 'en-US')
             voices = self.engine.getProperty('voices')
@@ -102,6 +193,8 @@ class TTSHandler:
         
         if engine_setting == 'local':
             return 'local'
+        elif engine_setting == 'openai':
+            return 'openai' if self._openai_tts_available() else 'local'
         elif engine_setting == 'google':
             return 'google' if GTTS_AVAILABLE else 'local'
         else:  # 'auto'
@@ -112,6 +205,11 @@ class TTSHandler:
             else:
                 return 'local'
     
+    def _openai_tts_available(self):
+        """Check if the shared OpenAI client can be used for speech"""
+        openai_handler = self.services.openai_handler
+        return STREAMING_PLAYBACK_AVAILABLE and openai_handler is not None and openai_handler.is_configured()
+    
     def _language_to_gtts_code(self, language):
         """Convert our language codes to gTTS language codes"""
         gtts_mapping = {
@@ -127,142 +225,424 @@ class TTSHandler:
         }
         return gtts_mapping.get(language, 'en')
     
+    def _split_sentences(self, text):
+        """Split text into sentence-sized chunks for synthesis"""
+        language = self.config.get('Audio', 'language', 'en-US')
+        return split_sentences(text, language, max_chars=TTS_MAX_CHUNK_CHARS)
+    
+    def _synthesize_gtts(self, sentence, gtts_lang):
+        """Get MP3 audio for one sentence from the cache, or synthesize it with Google TTS"""
+        if self.audio_cache:
+            audio_data = self.audio_cache.get(sentence, gtts_lang, 'google')
+            if audio_data is not None:
+                return audio_data
+        
+        tts = gTTS(text=sentence, lang=gtts_lang, slow=False)
+        buffer = io.BytesIO()
+        tts.write_to_fp(buffer)
+        audio_data = buffer.getvalue()
+        
+        if self.audio_cache:
+            self.audio_cache.put(sentence, gtts_lang, 'google', '', audio_data)
+        return audio_data
+    
+    def _start_prefetch(self, sentences, synthesize, engine_name):
+        """Synthesize sentences in the background, at most one ahead of playback
+        
+        Returns (audio_queue, cancelled). The queue yields (sentence, audio) pairs, audio being
+        None if synthesis failed, then None; setting cancelled stops the producer.
+        """
+        # Holds at most one prefetched sentence beyond the one being played
+        audio_queue = queue.Queue(maxsize=1)
+        cancelled = threading.Event()
+        
+        def offer(item):
+            # Block until the player takes the item, giving up if playback ended
+            while not cancelled.is_set():
+                try:
+                    audio_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            for sentence in sentences:
+                if cancelled.is_set() or self.stop_requested:
+                    break
+                try:
+                    audio_data = synthesize(sentence)
+                except Exception as e:
+                    print(f"Error with {engine_name}: {e}, falling back to local TTS for this sentence")
+                    audio_data = None
+                
+                if not offer((sentence, audio_data)):
+                    return
+            offer(None)
+        
+        self.services.get_executor('tts_synthesis', max_workers=1).submit(produce)
+        return audio_queue, cancelled
+    
+    def _next_prefetched(self, audio_queue):
+        """Wait for the next prefetched (sentence, audio) pair; None when done or stopped"""
+        while not self.stop_requested:
+            try:
+                return audio_queue.get(timeout=0.02)
+            except queue.Empty:
+                continue
+        return None
+    
     def _speak_with_gtts(self, text):
-        """Speak text using Google TTS"""
+        """Speak text using Google TTS, synthesizing the next sentence while the current one plays"""
+        if not GTTS_AVAILABLE:
+            print("Google TTS not available, falling back to local TTS")
+            return self._speak_with_local_tts(text)
+        
+        language = self.config.get('Audio', 'language', 'en-US')
+        gtts_lang = self._language_to_gtts_code(language)
+        
+        print(f"Using Google TTS for {language} (gtts: {gtts_lang})")
+        
+        audio_queue, cancelled = self._start_prefetch(
+            self._split_sentences(text), lambda sentence: self._synthesize_gtts(sentence, gtts_lang), 'Google TTS')
+        
         try:
-            if not GTTS_AVAILABLE:
-                print("Google TTS not available, falling back to local TTS")
-                return self._speak_with_local_tts(text)
-            
-            language = self.config.get('Audio', 'language', 'en-US')
-            gtts_lang = self._language_to_gtts_code(language)
-            
-            print(f"Using Google TTS for {language} (gtts: {gtts_lang})")
-            
-            # Create TTS object
-            tts = gTTS(text=text, lang=gtts_lang, slow=False)
-            
-            # Save to temporary file
-            tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-            tmp_filename = tmp_file.name
-            tmp_file.close()
-            
-            # Save TTS to file
-            tts.save(tmp_filename)
-            
-            # Play the audio file
-            pygame.mixer.music.load(tmp_filename)
-            pygame.mixer.music.play()
-            
-            # Wait for playback to complete or stop request
-            while pygame.mixer.music.get_busy() and not self.stop_requested:
-                pygame.time.wait(100)
-            
-            # Clean up
-            pygame.mixer.music.stop()
-            try:
-                os.unlink(tmp_filename)
-            except:
-                pass  # Ignore cleanup errors
-                    
+            while True:
+                item = self._next_prefetched(audio_queue)
+                if item is None:
+                    break
+                
+                sentence, audio_data = item
+                if audio_data is None:
+                    self._speak_with_local_tts(sentence)
+                    continue
+                
+                # Play straight from memory - nothing touches the filesystem
+                pygame.mixer.music.load(io.BytesIO(audio_data), 'mp3')
+                pygame.mixer.music.play()
+                self._mark_audio_start()
+                
+                # Wait for playback to complete; stop() sets the event so this wakes immediately
+                while pygame.mixer.music.get_busy() and not self.stop_requested:
+                    self.stop_event.wait(0.02)
+                
+                self._mark_audio_end()
+                pygame.mixer.music.stop()
+                pygame.mixer.music.unload()
         except Exception as e:
-            print(f"Error with Google TTS: {e}, falling back to local TTS")
-            return self._speak_with_local_tts(text)
+            print(f"Error playing Google TTS audio: {e}")
+        finally:
+            # Stop the producer
+            cancelled.set()
+    
+    def _synthesize_openai(self, sentence, model, voice, language, on_chunk=None):
+        """Get PCM audio for one sentence from the cache, or stream it from OpenAI speech
+        
+        on_chunk is called with each chunk as it arrives (not for cached audio). Returns
+        (audio, cached), audio being None if the stream was cut short by a stop request.
+        """
+        cache_voice = f"{model}/{voice}"
+        if self.audio_cache:
+            audio_data = self.audio_cache.get(sentence, language, 'openai', cache_voice)
+            if audio_data is not None:
+                return audio_data, True
+        
+        received = bytearray()
+        client = self.services.openai_handler.client
+        with client.audio.speech.with_streaming_response.create(
+                model=model, voice=voice, input=sentence, response_format='pcm') as response:
+            for chunk in response.iter_bytes(chunk_size=OPENAI_TTS_CHUNK_BYTES):
+                if self.stop_requested:
+                    return None, False
+                received.extend(chunk)
+                if on_chunk:
+                    on_chunk(chunk)
+        
+        # Only complete responses are cached
+        if self.audio_cache and received:
+            self.audio_cache.put(sentence, language, 'openai', cache_voice, bytes(received))
+        return bytes(received), False
+    
+    def _speak_with_openai(self, text):
+        """Speak text using OpenAI speech, one request per sentence
+        
+        The first sentence plays progressively as its chunks arrive; the following sentences are
+        prefetched one ahead of playback, like Google TTS.
+        """
+        model = self.config.get('TTS', 'openai_model', 'tts-1')
+        voice = self.config.get('TTS', 'openai_voice', 'alloy')
+        language = self.config.get('Audio', 'language', 'en-US')
+        sentences = self._split_sentences(text)
+        if not sentences:
+            return
+        
+        print(f"Using OpenAI TTS ({model}, voice: {voice}, {len(sentences)} sentences)")
+        
+        # Later sentences are requested while the first one streams
+        audio_queue, cancelled = self._start_prefetch(
+            sentences[1:], lambda sentence: self._synthesize_openai(sentence, model, voice, language)[0],
+            'OpenAI TTS')
+        played_any = False
+        try:
+            with sd.RawOutputStream(samplerate=OPENAI_TTS_SAMPLE_RATE, channels=1, dtype='int16') as stream:
+                def play(audio_data):
+                    # Write in 50 ms chunks so a stop request takes effect quickly
+                    self._mark_audio_start()
+                    for offset in range(0, len(audio_data), OPENAI_TTS_CHUNK_BYTES):
+                        if self.stop_requested:
+                            break
+                        stream.write(audio_data[offset:offset + OPENAI_TTS_CHUNK_BYTES])
+                    self._mark_audio_end()
+                
+                def on_chunk(chunk):
+                    nonlocal played_any
+                    if not played_any:
+                        self._mark_audio_start()
+                        played_any = True
+                    stream.write(chunk)
+                
+                audio_data, cached = self._synthesize_openai(sentences[0], model, voice, language, on_chunk)
+                if cached:
+                    played_any = True
+                    play(audio_data)
+                elif played_any:
+                    self._mark_audio_end()
+                
+                while True:
+                    item = self._next_prefetched(audio_queue)
+                    if item is None:
+                        break
+                    sentence, audio_data = item
+                    if audio_data is None:
+                        if not self.stop_requested:
+                            self._speak_with_local_tts(sentence)
+                        continue
+                    play(audio_data)
+                
+                if self.stop_requested:
+                    # Drop buffered audio instead of letting it drain
+                    stream.abort()
+        except Exception as e:
+            print(f"Error with OpenAI TTS: {e}")
+            if not played_any and not self.stop_requested:
+                print("Falling back to local TTS")
+                self._speak_with_local_tts(text)
+        finally:
+            # Stop the producer
+            cancelled.set()
     
     def _speak_with_local_tts(self, text):
         """Speak text using local pyttsx3 TTS"""
-        # Split text into smaller chunks to allow for interruption
-        sentences = text.split('. ')
+        # pyttsx3 synthesizes and plays in one blocking call, so queue every sentence
+        # up front and let the driver run them back to back.
+        sentences = self._split_sentences(text)
+        if self.stop_requested or not sentences:
+            return
         
-        for sentence in sentences:
+        # pyttsx3 can only be stopped from inside its driver loop, so stop requests are checked in
+        # every callback. Drivers that do not report words (some espeak and nsss builds) only check
+        # between sentences; benchmark_tts_stop.py measures the latency per engine.
+        def check_stop():
             if self.stop_requested:
-                print("TTS interrupted by stop request")
-                break
-                
-            if sentence.strip():
-                # Add period back if it was removed by split
-                if not sentence.endswith('.') and sentence != sentences[-1]:
-                    sentence += '.'
-                
+                self.engine.stop()
+        
+        def on_started(name):
+            self._mark_audio_start()
+            check_stop()
+        
+        def on_finished(name, completed):
+            self._mark_audio_end()
+            check_stop()
+        
+        tokens = [
+            self.engine.connect('started-utterance', on_started),
+            self.engine.connect('finished-utterance', on_finished),
+            self.engine.connect('started-word', lambda name, location, length: check_stop())
+        ]
+        try:
+            for sentence in sentences:
                 self.engine.say(sentence)
-                self.engine.runAndWait()
+            self.engine.runAndWait()
+            if self.stop_requested:
+                print("TTS interrupted by stop request")
+        finally:
+            for token in tokens:
+                self.engine.disconnect(token)
+    
+    def _mark_audio_start(self):
+        """Record the moment a sentence starts playing"""
+        if self.current_metrics is not None:
+            self.current_metrics['starts'].append(time.perf_counter())
+    
+    def _mark_audio_end(self):
+        """Record the moment a sentence finishes playing"""
+        if self.current_metrics is not None:
+            self.current_metrics['ends'].append(time.perf_counter())
+    
+    def _finish_metrics(self):
+        """Compute time to first audio and inter-sentence gaps for the last utterance"""
+        metrics = self.current_metrics
+        self.current_metrics = None
+        if not metrics or not metrics['starts']:
+            return None
+        
+        starts, ends = metrics['starts'], metrics['ends']
+        gaps = [starts[i + 1] - ends[i] for i in range(min(len(starts) - 1, len(ends)))]
+        result = {
+            'engine': metrics['engine'],
+            'sentences': len(starts),
+            'time_to_first_audio': starts[0] - metrics['requested_at'],
+            'gaps': gaps,
+            'mean_gap': sum(gaps) / len(gaps) if gaps else 0.0,
+            'max_gap': max(gaps) if gaps else 0.0
+        }
+        self.last_speech_metrics = result
+        self.speech_metrics_history.append(result)
+        
+        print(f"TTS metrics ({result['engine']}): first audio after {result['time_to_first_audio'] * 1000:.0f} ms, "
+              f"{result['sentences']} sentences, mean gap {result['mean_gap'] * 1000:.0f} ms, "
+              f"max gap {result['max_gap'] * 1000:.0f} ms")
+        if self.audio_cache:
+            cache_stats = self.audio_cache.get_stats()
+            print(f"TTS cache: {cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']} hits "
+                  f"({cache_stats['hit_rate']:.0%}), {cache_stats['entries']} entries, "
+                  f"{cache_stats['bytes'] / 1024:.0f} KB")
+        return result
+    
+    def get_speech_metrics(self):
+        """Get the last utterance's metrics and averages over recent utterances"""
+        history = list(self.speech_metrics_history)
+        if not history:
+            return {'last': None, 'utterances': 0, 'last_stop_latency': self.last_stop_latency}
+        
+        all_gaps = [gap for entry in history for gap in entry['gaps']]
+        return {
+            'last': self.last_speech_metrics,
+            'cache': self.audio_cache.get_stats() if self.audio_cache else None,
+            'utterances': len(history),
+            'mean_time_to_first_audio': sum(entry['time_to_first_audio'] for entry in history) / len(history),
+            'mean_gap': sum(all_gaps) / len(all_gaps) if all_gaps else 0.0,
+            'max_gap': max(all_gaps) if all_gaps else 0.0,
+            'last_stop_latency': self.last_stop_latency
+        }
+    
+    def _speak_text(self, text, generation):
+        """Speak text with the configured engine on the worker thread, recording latency metrics"""
+        with self.state_lock:
+            if generation != self.speak_generation:
+                return  # Cancelled before it started
+            self.current_generation = generation
+            self.stop_event.clear()
+            self.speaking = True
+        
+        # Choose TTS engine
+        engine = self._get_tts_engine_to_use()
+        self.current_metrics = {'engine': engine, 'requested_at': time.perf_counter(), 'starts': [], 'ends': []}
+        try:
+            if engine == 'google':
+                self._speak_with_gtts(text)
+            elif engine == 'openai':
+                self._speak_with_openai(text)
+            else:
+                self._speak_with_local_tts(text)
+        finally:
+            self._finish_metrics()
+            with self.state_lock:
+                self.speaking = False
+                if self.stop_requested and self.stop_requested_at is not None:
+                    self.last_stop_latency = time.perf_counter() - self.stop_requested_at
+                    print(f"TTS stopped {self.last_stop_latency * 1000:.0f} ms after stop request")
+                self.stop_requested_at = None
     
     def speak(self, text, blocking=True):
-        """Speak the given text"""
+        """Speak the given text, returning a Future that completes when speech ends (None if not queued)"""
         try:
             if not text:
-                return
+                return None
             
             # Stop any current speech
             self.stop()
             
+            with self.state_lock:
+                generation = self.speak_generation
+            
+            if self._on_worker():
+                self._speak_text(text, generation)
+                return None
+            
+            future = self._submit(self._speak_text, text, generation)
             if blocking:
-                self.speaking = True
-                self.stop_requested = False
-                
-                # Choose TTS engine
-                engine = self._get_tts_engine_to_use()
-                if engine == 'google':
-                    self._speak_with_gtts(text)
-                else:
-                    self._speak_with_local_tts(text)
-                
-                self.speaking = False
-            else:
-                # Run in separate thread for non-blocking speech
-                self.current_thread = threading.Thread(target=self._speak_async, args=(text,))
-                self.current_thread.daemon = True
-                self.current_thread.start()
+                future.result()
+            return future
         except Exception as e:
             print(f"Error speaking text: {e}")
-            self.speaking = False
+            return None
+    
+    def warm_up(self):
+        """Prime the TTS engine selected in [TTS]"""
+        if not self._on_worker():
+            return self._submit(self.warm_up).result(timeout=10.0)
+        
+        engine = self._get_tts_engine_to_use()
+        if engine == 'google':
+            return self._warm_up_gtts()
+        elif engine == 'openai':
+            return self._warm_up_openai()
+        return self._warm_up_local()
+    
+    def _warm_up_gtts(self):
+        """Synthesize and decode a short phrase with Google TTS, bypassing the cache"""
+        # gTTS opens a new connection per request, so this primes DNS, gTTS's request code and
+        # the MP3 decoder rather than a pooled connection
+        gtts_lang = self._language_to_gtts_code(self.config.get('Audio', 'language', 'en-US'))
+        buffer = io.BytesIO()
+        gTTS(text='ready', lang=gtts_lang, slow=False).write_to_fp(buffer)
+        buffer.seek(0)
+        pygame.mixer.music.load(buffer, 'mp3')
+        pygame.mixer.music.unload()
+        return True
+    
+    def _warm_up_openai(self):
+        """Open the PCM output device once; the API host is primed with the shared client"""
+        with sd.RawOutputStream(samplerate=OPENAI_TTS_SAMPLE_RATE, channels=1, dtype='int16'):
+            pass
+        return True
     
-    def _speak_async(self, text):
-        """Async method for non-blocking speech"""
+    def _warm_up_local(self):
+        """Prime the local TTS driver with a silent utterance"""
+        if self.engine is None:
+            return False
+        
+        # The first runAndWait loads the platform driver; do it at zero volume
+        volume = float(self.config.get('TTS', 'volume', '0.8'))
         try:
-            self.speaking = True
-            self.stop_requested = False
-            
-            # Choose TTS engine
-            engine = self._get_tts_engine_to_use()
-            if engine == 'google':
-                self._speak_with_gtts(text)
-            else:
-                self._speak_with_local_tts(text)
-            
-            self.speaking = False
-        except Exception as e:
-            print(f"Error in async speech: {e}")
-            self.speaking = False
+            self.engine.setProperty('volume', 0.0)
+            self.engine.say('ready')
+            self.engine.runAndWait()
+        finally:
+            self.engine.setProperty('volume', volume)
+        return True
     
     def stop(self):
         """Stop current speech immediately"""
-        try:
+        with self.state_lock:
+            self.speak_generation += 1
+            self.stop_event.set()
             if self.speaking:
                 print("Stopping TTS immediately...")
-                self.stop_requested = True
-                
-                # Stop local TTS engine
-                self.engine.stop()
-                
-                # Stop Google TTS (pygame)
-                if GTTS_AVAILABLE:
-                    try:
-                        pygame.mixer.music.stop()
-                    except:
-                        pass
-                
-                # Wait briefly for the current speech to stop
-                if self.current_thread and self.current_thread.is_alive():
-                    self.current_thread.join(timeout=0.5)
-                
-                self.speaking = False
-                print("TTS stopped successfully")
-        except Exception as e:
-            print(f"Error stopping TTS: {e}")
+                self.stop_requested_at = time.perf_counter()
+    
+    def shutdown(self):
+        """Stop speech and end the TTS worker thread"""
+        self.stop()
+        self.command_queue.put(None)
     
     def set_rate(self, rate):
         """Set speech rate"""
+        if not self._on_worker():
+            self._submit(self.set_rate, rate)
+            return
+        
         try:
             self.engine.setProperty('rate', rate)
             self.config.set('TTS', 'rate', rate)
@@ -271,6 +651,10 @@ class TTSHandler:
     
     def set_volume(self, volume):
         """Set speech volume (0.0 to 1.0)"""
+        if not self._on_worker():
+            self._submit(self.set_volume, volume)
+            return
+        
         try:
             self.engine.setProperty('volume', volume)
             self.config.set('TTS', 'volume', volume)
@@ -279,6 +663,13 @@ class TTSHandler:
     
     def get_voices(self):
         """Get available voices"""
+        if not self._on_worker():
+            try:
+                return self._submit(self.get_voices).result(timeout=5.0)
+            except Exception as e:
+                print(f"Error getting voices: {e}")
+                return []
+        
         try:
             voices = self.engine.getProperty('voices')
             return [(voice.id, voice.name) for voice in voices] if voices else []
@@ -288,6 +679,10 @@ class TTSHandler:
     
     def set_voice(self, voice_id):
         """Set voice by ID"""
+        if not self._on_worker():
+            self._submit(self.set_voice, voice_id)
+            return
+        
         try:
             self.engine.setProperty('voice', voice_id)
         except Exception as e:
@@ -295,6 +690,10 @@ class TTSHandler:
     
     def refresh_voice_settings(self):
         """Refresh voice settings based on current configuration"""
+        if not self._on_worker():
+            self._submit(self.refresh_voice_settings)
+            return
+        
         try:
             self.config.load_config()
             self.set_voice_by_language()
@@ -2,19 +2,29 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
 import time
-from src.core.config import Config
-from src.handlers.openai_handler import OpenAIHandler
-from src.handlers.tts_handler import TTSHandler
+from collections import deque
+
+# Oldest messages are removed from the chat view beyond this many
+MAX_DISPLAYED_MESSAGES = 1000
 
 class MainGUI:
     def __init__(self, main_app):
         self.main_app = main_app
-        self.config = Config()
-        self.openai_handler = OpenAIHandler()
-        self.tts_handler = TTSHandler()
+        # Share the app's config and handlers instead of creating duplicates
+        self.config = main_app.config
         self.root = None
         self.settings_window = None
-        
+    
+    @property
+    def openai_handler(self):
+        """App's OpenAI handler, resolved lazily so it is not created at startup"""
+        return self.main_app.openai_handler
+    
+    @property
+    def tts_handler(self):
+        """App's TTS handler, resolved lazily so it is not created at startup"""
+        return self.main_app.tts_handler
+    
     def create_main_window(self):
         """Create the main application window"""
         self.root = tk.Tk()
@@ -49,35 +59,24 @@ class MainGUI:
         left_frame.rowconfigure(0, weight=1)
         
         # Create chat display area
-        self.chat_frame = tk.Frame(left_frame, bg='white', relief='sunken', bd=1)
-        self.chat_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        self.chat_frame.columnconfigure(0, weight=1)
-        
-        # Create scrollable chat area
-        self.chat_canvas = tk.Canvas(self.chat_frame, bg='white', highlightthickness=0)
-        self.chat_scrollbar = ttk.Scrollbar(self.chat_frame, orient="vertical", command=self.chat_canvas.yview)
-        self.chat_scrollable_frame = ttk.Frame(self.chat_canvas)
-        
-        self.chat_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.chat_canvas.configure(scrollregion=self.chat_canvas.bbox("all"))
-        )
+        self._create_chat_view(left_frame)
         
-        self.chat_canvas.create_window((0, 0), window=self.chat_scrollable_frame, anchor="nw")
-        self.chat_canvas.configure(yscrollcommand=self.chat_scrollbar.set)
+        # Clear chat button and history search
+        chat_buttons_frame = ttk.Frame(left_frame)
+        chat_buttons_frame.grid(row=1, column=0, columnspan=2, pady=(10, 0), sticky=(tk.W, tk.E))
+        chat_buttons_frame.columnconfigure(1, weight=1)
         
-        self.chat_canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        self.chat_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        clear_chat_btn = ttk.Button(chat_buttons_frame, text="Clear Chat", command=self.clear_chat_history)
+        clear_chat_btn.grid(row=0, column=0, sticky=tk.W)
         
-        # Bind mousewheel to chat canvas
-        def _on_mousewheel(event):
-            self.chat_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        self.chat_search_var = tk.StringVar()
+        chat_search_entry = ttk.Entry(chat_buttons_frame, textvariable=self.chat_search_var)
+        chat_search_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(10, 5))
+        chat_search_entry.bind('<Return>', lambda e: self.search_chat_history())
         
-        self.chat_canvas.bind("<MouseWheel>", _on_mousewheel)
-        
-        # Clear chat button
-        clear_chat_btn = ttk.Button(left_frame, text="Clear Chat", command=self.clear_chat_history)
-        clear_chat_btn.grid(row=1, column=0, pady=(10, 0), sticky=tk.W)
+        search_btn = ttk.Button(chat_buttons_frame, text="Search", command=self.search_chat_history)
+        search_btn.grid(row=0, column=2, sticky=tk.E)
+        self.search_window = None
         
         # Create right panel for status and controls
         right_frame = ttk.Frame(main_frame, padding="10")
@@ -157,7 +156,7 @@ class MainGUI:
                 "• Push-to-talk recording (like walkie-talkies)\n"
                 "• Stop speaking hotkey to interrupt AI responses\n"
                 "• Screenshot capture with AI analysis\n"
-                "• Voice input transcription (Google/OpenAI Whisper)\n"
+                "• Voice input transcription (Google/OpenAI Whisper/local Whisper)\n"
                 "• Text-to-speech responses\n"
                 "• Background operation with tray icon\n\n"
                 "The app runs in the background. Right-click the tray icon for options."
@@ -192,13 +191,45 @@ class MainGUI:
         
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+    
+    def _create_chat_view(self, parent):
+        """Create the chat display in row 0 of parent"""
+        self.chat_frame = tk.Frame(parent, bg='white', relief='sunken', bd=1)
+        self.chat_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.chat_frame.columnconfigure(0, weight=1)
+        self.chat_frame.rowconfigure(0, weight=1)
         
+        # All messages are rendered into one read-only Text widget; tags style the bubbles,
+        # so adding a message is a single insert however long the history is
+        self.chat_text = tk.Text(self.chat_frame, wrap=tk.WORD, bg='white', relief='flat', bd=0,
+                                 font=('Arial', 10), cursor='arrow', state='disabled')
+        self.chat_scrollbar = ttk.Scrollbar(self.chat_frame, orient="vertical", command=self.chat_text.yview)
+        self.chat_text.configure(yscrollcommand=self.chat_scrollbar.set)
+        
+        self.chat_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.chat_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        
+        # User messages right aligned in blue, AI messages left aligned in green
+        self.chat_text.tag_configure('user_header', justify='right', lmargin1=100, rmargin=5, spacing1=6,
+                                     foreground='#007ACC', font=('Arial', 8, 'bold'))
+        self.chat_text.tag_configure('user', justify='right', lmargin1=100, lmargin2=100, rmargin=5,
+                                     spacing3=4, background='#007ACC', foreground='white')
+        self.chat_text.tag_configure('ai_header', lmargin1=5, rmargin=100, spacing1=6,
+                                     foreground='#28A745', font=('Arial', 8, 'bold'))
+        self.chat_text.tag_configure('ai', lmargin1=5, lmargin2=5, rmargin=100, spacing3=4,
+                                     background='#28A745', foreground='white')
+        
+        # Marks at the start of each displayed message, oldest first, and the newest message shown
+        self.chat_message_marks = deque()
+        self.chat_mark_ids = 0
+        self.last_displayed_message = None
+    
     def show_settings(self):
         """Show settings window with tabbed interface"""
         if self.settings_window and self.settings_window.winfo_exists():
             self.settings_window.lift()
             return
-            
+        
         self.settings_window = tk.Toplevel(self.root)
         self.settings_window.title("ScreenAsk Settings")
         self.settings_window.geometry("750x650")
@@ -332,6 +363,57 @@ class MainGUI:
         stop_hotkey_combo = ttk.Combobox(hotkey_frame, textvariable=self.stop_hotkey_var,
                                         values=["ctrl+shift+x", "ctrl+alt+x", "ctrl+shift+z", "alt+shift+x"])
         stop_hotkey_combo.grid(row=1, column=1, sticky=(tk.W, tk.E), padx=(10, 0), pady=(10, 0))
+        
+        ttk.Label(hotkey_frame, text="Queue Presses While Busy:").grid(row=2, column=0, sticky=tk.W, pady=(10, 0))
+        self.capture_queue_var = tk.IntVar(value=self.config.get_capture_queue_size())
+        capture_queue_spinbox = ttk.Spinbox(hotkey_frame, from_=0, to=5, textvariable=self.capture_queue_var, width=5)
+        capture_queue_spinbox.grid(row=2, column=1, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        
+        # Hotkey Profiles (presets with their own hotkey, prompt, model, region, audio and TTS)
+        profiles_frame = ttk.LabelFrame(content_frame, text="Hotkey Profiles", padding="10")
+        profiles_frame.pack(fill=tk.X, pady=(0, 20))
+        profiles_frame.columnconfigure(1, weight=1)
+        
+        self.profile_vars = {}
+        profile_names = [name for name in self.config.get_profile_names() if name != 'default']
+        for row, name in enumerate(profile_names):
+            profile = self.config.get_profile(name)
+            enabled_var = tk.BooleanVar(value=profile['enabled'])
+            hotkey_var = tk.StringVar(value=profile['hotkey'])
+            self.profile_vars[name] = (enabled_var, hotkey_var)
+            
+            pady = (10, 0) if row else 0
+            ttk.Checkbutton(profiles_frame, text=name.title(),
+                            variable=enabled_var).grid(row=row, column=0, sticky=tk.W, pady=pady)
+            profile_combo = ttk.Combobox(profiles_frame, textvariable=hotkey_var, width=18,
+                                         values=["ctrl+shift+d", "ctrl+shift+w", "ctrl+shift+p", "ctrl+alt+d"])
+            profile_combo.grid(row=row, column=1, sticky=tk.W, padx=(10, 0), pady=pady)
+            
+            summary = [profile['model'] or 'default model', f"{profile['region']} region"]
+            if profile['scale'] < 1.0 or profile['detail'] == 'low':
+                summary.append('low-res')
+            summary.append('audio' if profile['audio'] else 'no audio')
+            summary.append('speech' if profile['tts'] else 'no speech')
+            ttk.Label(profiles_frame, text=', '.join(summary), foreground="gray").grid(
+                row=row, column=2, sticky=tk.W, padx=(10, 0), pady=pady)
+        
+        # Startup Settings
+        startup_frame = ttk.LabelFrame(content_frame, text="Startup", padding="10")
+        startup_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        self.warm_up_var = tk.BooleanVar(value=self.config.get_warm_up_enabled())
+        warm_up_check = ttk.Checkbutton(startup_frame, text="Warm up connections and devices after startup (faster first request)",
+                                        variable=self.warm_up_var)
+        warm_up_check.grid(row=0, column=0, sticky=tk.W)
+        
+        # Chat History Settings
+        chat_frame = ttk.LabelFrame(content_frame, text="Chat History", padding="10")
+        chat_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        self.chat_store_var = tk.BooleanVar(value=self.config.get_chat_store() == 'sqlite')
+        chat_store_check = ttk.Checkbutton(chat_frame, text="Keep the full chat history in a searchable database (applies after restart)",
+                                           variable=self.chat_store_var)
+        chat_store_check.grid(row=0, column=0, sticky=tk.W)
     
     def _create_audio_tab(self, notebook):
         """Create Audio & Speech configuration tab"""
@@ -374,6 +456,18 @@ class MainGUI:
         info_label = ttk.Label(audio_frame, text="Push-to-talk: Hold hotkey to record, release to stop", font=('Arial', 9, 'italic'))
         info_label.grid(row=1, column=0, columnspan=2, pady=(0, 10))
         
+        # Keep microphone open with pre-roll
+        self.warm_stream_var = tk.BooleanVar(value=self.config.get_audio_warm_stream_enabled())
+        warm_stream_check = ttk.Checkbutton(audio_frame, text="Keep microphone open (instant start with pre-roll)",
+                                            variable=self.warm_stream_var)
+        warm_stream_check.grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=(10, 0))
+        
+        # Skip the AI call for accidental taps
+        self.speech_gate_var = tk.BooleanVar(value=self.config.get_speech_gate_enabled())
+        speech_gate_check = ttk.Checkbutton(audio_frame, text="Skip AI analysis when no speech is detected",
+                                            variable=self.speech_gate_var)
+        speech_gate_check.grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
         ttk.Label(audio_frame, text="Language:").grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
         self.language_var = tk.StringVar(value=self.config.get('Audio', 'language', 'en-US'))
         language_combo = ttk.Combobox(audio_frame, textvariable=self.language_var,
@@ -393,6 +487,10 @@ class MainGUI:
                 transcription_combo.set("Google Speech Recognition")
             elif value == "openai_whisper":
                 transcription_combo.set("OpenAI Whisper")
+            elif value == "local_whisper":
+                transcription_combo.set("Local Whisper (offline)")
+            elif value == "race":
+                transcription_combo.set("Race (fastest acceptable)")
         
         # Set initial display value
         update_transcription_display()
@@ -404,9 +502,14 @@ class MainGUI:
                 self.transcription_var.set("google")
             elif display_value == "OpenAI Whisper":
                 self.transcription_var.set("openai_whisper")
+            elif display_value == "Local Whisper (offline)":
+                self.transcription_var.set("local_whisper")
+            elif display_value == "Race (fastest acceptable)":
+                self.transcription_var.set("race")
         
         transcription_combo.bind('<<ComboboxSelected>>', on_transcription_change)
-        transcription_combo.configure(values=["Google Speech Recognition", "OpenAI Whisper"])
+        transcription_combo.configure(values=["Google Speech Recognition", "OpenAI Whisper", "Local Whisper (offline)",
+                                              "Race (fastest acceptable)"])
         
         # TTS Settings
         tts_frame = ttk.LabelFrame(content_frame, text="Text-to-Speech", padding="10")
@@ -426,11 +529,11 @@ class MainGUI:
         ttk.Label(tts_frame, text="TTS Engine:").grid(row=2, column=0, sticky=tk.W, pady=(10, 0))
         self.tts_engine_var = tk.StringVar(value=self.config.get_tts_engine())
         tts_engine_combo = ttk.Combobox(tts_frame, textvariable=self.tts_engine_var,
-                                       values=["auto", "local", "google"], state="readonly")
+                                       values=["auto", "local", "google", "openai"], state="readonly")
         tts_engine_combo.grid(row=2, column=1, sticky=(tk.W, tk.E), padx=(10, 0), pady=(10, 0))
         
         # Add info label for TTS engine
-        info_tts_label = ttk.Label(tts_frame, text="Auto: Google TTS for non-English, Local for English", 
+        info_tts_label = ttk.Label(tts_frame, text="Auto: Google TTS for non-English, Local for English. OpenAI: streamed, needs API key", 
                                    font=('Arial', 8, 'italic'))
         info_tts_label.grid(row=3, column=0, columnspan=2, pady=(5, 0))
         
@@ -614,7 +717,7 @@ class MainGUI:
         def _on_mousewheel_prompts(event):
             canvas.yview_scroll(int(-1*(event.delta/120)), "units")
         canvas.bind_all("<MouseWheel>", _on_mousewheel_prompts)
-        
+    
     def save_settings(self):
         """Save settings to configuration"""
         # Save OpenAI settings
@@ -625,11 +728,18 @@ class MainGUI:
         # Save hotkeys
         self.config.set_hotkey(self.hotkey_var.get())
         self.config.set_stop_speaking_hotkey(self.stop_hotkey_var.get())
+        self.config.set_warm_up_enabled(self.warm_up_var.get())
+        self.config.set_capture_queue_size(self.capture_queue_var.get())
+        self.config.set_chat_store('sqlite' if self.chat_store_var.get() else 'journal')
+        for name, (enabled_var, hotkey_var) in self.profile_vars.items():
+            self.config.set_profile(name, enabled=enabled_var.get(), hotkey=hotkey_var.get().strip())
         
         # Save audio settings
         self.config.set('Audio', 'language', self.language_var.get())
         self.config.set('Audio', 'transcription_service', self.transcription_var.get())
         self.config.set_audio_recording_enabled(self.audio_enabled_var.get())
+        self.config.set_audio_warm_stream_enabled(self.warm_stream_var.get())
+        self.config.set_speech_gate_enabled(self.speech_gate_var.get())
         
         # Save TTS settings
         self.config.set('TTS', 'rate', self.rate_var.get())
@@ -652,17 +762,12 @@ class MainGUI:
         self.config.set('Prompts', 'prepend_prompt', self.prepend_prompt_text.get('1.0', tk.END).strip())
         self.config.set('Prompts', 'append_prompt', self.append_prompt_text.get('1.0', tk.END).strip())
         
-        # Update handlers with fresh config
-        self.openai_handler.setup_client()
+        # Update handlers (they share this config, so no reload is needed)
         self.tts_handler.setup_voice()
-        self.tts_handler.refresh_voice_settings()
         
         # Update main app components
         if self.main_app:
-            # Reload config for all handlers
-            self.main_app.config.load_config()
-            self.main_app.openai_handler.setup_client()
-            self.main_app.tts_handler.refresh_voice_settings()
+            self.main_app.update_audio_stream()
             self.main_app.update_hotkey()
         
         # Update status
@@ -672,7 +777,7 @@ class MainGUI:
         self.settings_window.destroy()
         
         messagebox.showinfo("Settings", "Settings saved successfully!")
-        
+    
     def test_api(self):
         """Test OpenAI API connection"""
         def test_thread():
@@ -683,7 +788,7 @@ class MainGUI:
                 messagebox.showerror("API Test", f"API connection failed:\n{message}")
         
         threading.Thread(target=test_thread, daemon=True).start()
-        
+    
     def test_capture(self):
         """Test screenshot capture"""
         if self.main_app:
@@ -698,26 +803,33 @@ class MainGUI:
             # Small delay to show recording status
             time.sleep(0.5)
             self.main_app.handle_hotkey_release()
-            
+    
     def hide_to_tray(self):
         """Hide window to system tray"""
         if self.root:
             self.root.withdraw()
-            
+    
     def show_window(self):
         """Show the main window"""
         if self.root:
             self.root.deiconify()
             self.root.lift()
             self.root.focus_force()
-            
+    
     def update_status(self):
         """Update status indicators"""
-        if self.openai_handler.is_configured():
+        # Before the OpenAI handler is created (e.g. at startup) the key decides, so the
+        # status does not import the SDK on the main thread
+        openai_handler = self.main_app.handlers.get('openai_handler') if self.main_app else None
+        if openai_handler:
+            configured = openai_handler.is_configured()
+        else:
+            configured = bool((self.config.get_openai_key() or '').strip())
+        if configured:
             self.openai_status.config(text="Configured", foreground="green")
         else:
             self.openai_status.config(text="Not configured", foreground="red")
-            
+        
         self.hotkey_label.config(text=self.config.get_hotkey())
         self.stop_hotkey_label.config(text=self.config.get_stop_speaking_hotkey())
     
@@ -751,11 +863,11 @@ class MainGUI:
     def set_status_speaking(self):
         """Set status to speaking"""
         self.update_recording_status("🔊 Speaking...", "purple")
-        
+    
     def on_closing(self):
         """Handle window closing"""
         self.hide_to_tray()
-        
+    
     def quit_app(self):
         """Quit the application"""
         if self.root:
@@ -771,72 +883,39 @@ class MainGUI:
                 messages = self.main_app.chat_history.get_all_messages()
                 for message in messages:
                     self.add_chat_message(message['sender'], message['message'], message['datetime'])
+                self.last_displayed_message = messages[-1] if messages else None
         except Exception as e:
             print(f"Error loading chat history: {e}")
     
     def add_chat_message(self, sender, message, timestamp=None):
         """Add a message to the chat display"""
         try:
-            # Create message frame
-            message_frame = tk.Frame(self.chat_scrollable_frame)
-            message_frame.pack(fill=tk.X, padx=5, pady=2)
-            
             # Get current time if not provided
             if timestamp is None:
                 from datetime import datetime
                 timestamp = datetime.now().strftime('%H:%M:%S')
             
-            if sender == 'user':
-                # User message (right aligned, blue)
-                msg_frame = tk.Frame(message_frame, bg='#007ACC', relief='raised', bd=1)
-                msg_frame.pack(side=tk.RIGHT, anchor='e', padx=(100, 0))
-                
-                # User label
-                user_label = tk.Label(msg_frame, text=f"You ({timestamp})", 
-                                    bg='#007ACC', fg='white', font=('Arial', 8, 'bold'))
-                user_label.pack(anchor='w', padx=5, pady=(2, 0))
-                
-                # Message text
-                msg_text = tk.Text(msg_frame, wrap=tk.WORD, height=1, width=30,
-                                 bg='#007ACC', fg='white', font=('Arial', 10),
-                                 relief='flat', bd=0, state='normal')
-                msg_text.insert('1.0', message)
-                msg_text.configure(state='disabled')
-                msg_text.pack(padx=5, pady=(0, 5), fill=tk.BOTH, expand=True)
-                
-                # Auto-resize text widget based on content
-                msg_text.update_idletasks()
-                lines = int(msg_text.index('end-1c').split('.')[0])
-                msg_text.configure(height=max(2, min(lines, 8)))
-                
-            else:
-                # AI message (left aligned, green)
-                msg_frame = tk.Frame(message_frame, bg='#28A745', relief='raised', bd=1)
-                msg_frame.pack(side=tk.LEFT, anchor='w', padx=(0, 100))
-                
-                # AI label
-                ai_label = tk.Label(msg_frame, text=f"AI ({timestamp})", 
-                                  bg='#28A745', fg='white', font=('Arial', 8, 'bold'))
-                ai_label.pack(anchor='w', padx=5, pady=(2, 0))
-                
-                # Message text
-                msg_text = tk.Text(msg_frame, wrap=tk.WORD, height=1, width=40,
-                                 bg='#28A745', fg='white', font=('Arial', 10),
-                                 relief='flat', bd=0, state='normal')
-                msg_text.insert('1.0', message)
-                msg_text.configure(state='disabled')
-                msg_text.pack(padx=5, pady=(0, 5), fill=tk.BOTH, expand=True)
-                
-                # Auto-resize text widget based on content
-                msg_text.update_idletasks()
-                lines = int(msg_text.index('end-1c').split('.')[0])
-                msg_text.configure(height=max(2, min(lines, 8)))
+            tag = 'user' if sender == 'user' else 'ai'
+            header = f"You ({timestamp})" if sender == 'user' else f"AI ({timestamp})"
+            
+            self.chat_text.configure(state='normal')
+            
+            # Remember where this message starts so the oldest can be dropped without counting lines
+            self.chat_mark_ids += 1
+            mark = f"message{self.chat_mark_ids}"
+            self.chat_text.mark_set(mark, 'end-1c')
+            self.chat_text.mark_gravity(mark, 'left')
+            self.chat_message_marks.append(mark)
+            
+            self.chat_text.insert('end', f" {header} \n", f"{tag}_header", f" {message.strip()} \n", tag)
             
-            # Update scroll region and scroll to bottom
-            self.chat_scrollable_frame.update_idletasks()
-            self.chat_canvas.configure(scrollregion=self.chat_canvas.bbox("all"))
-            self.chat_canvas.yview_moveto(1.0)
+            if len(self.chat_message_marks) > MAX_DISPLAYED_MESSAGES:
+                self.chat_text.delete('1.0', self.chat_message_marks[1])
+                self.chat_text.mark_unset(self.chat_message_marks.popleft())
             
+            self.chat_text.configure(state='disabled')
+            self.chat_text.see('end')
+        
         except Exception as e:
             print(f"Error adding chat message: {e}")
     
@@ -847,11 +926,13 @@ class MainGUI:
                 self.main_app.chat_history.clear_history()
                 
                 # Clear the display
-                for widget in self.chat_scrollable_frame.winfo_children():
-                    widget.destroy()
-                
-                # Update scroll region
-                self.chat_canvas.configure(scrollregion=self.chat_canvas.bbox("all"))
+                self.chat_text.configure(state='normal')
+                self.chat_text.delete('1.0', 'end')
+                self.chat_text.configure(state='disabled')
+                for mark in self.chat_message_marks:
+                    self.chat_text.mark_unset(mark)
+                self.chat_message_marks.clear()
+                self.last_displayed_message = None
                 
                 messagebox.showinfo("Chat History", "Chat history cleared successfully!")
         except Exception as e:
@@ -860,25 +941,79 @@ class MainGUI:
     
     def update_chat_display(self):
         """Update the chat display with new messages"""
+        # Called from worker threads; Tk widgets are only touched on the main thread
+        if threading.current_thread() != threading.main_thread():
+            if self.root:
+                self.root.after(0, self.update_chat_display)
+            return
+        
         try:
             if self.main_app and hasattr(self.main_app, 'chat_history'):
                 # Get the latest message
                 messages = self.main_app.chat_history.get_all_messages()
                 
-                # Add the most recent message if there are any new ones
+                # New messages are the ones after the newest displayed message (the history
+                # only keeps the most recent messages, so positions shift once it is full)
+                new_start = 0
+                for index in range(len(messages) - 1, -1, -1):
+                    if messages[index] is self.last_displayed_message:
+                        new_start = index + 1
+                        break
+                else:
+                    if self.last_displayed_message:
+                        last_time = self.last_displayed_message['timestamp']
+                        new_start = next((index for index, message in enumerate(messages)
+                                          if message['timestamp'] > last_time), len(messages))
+                
+                # Add any new messages
+                for message in messages[new_start:]:
+                    # Extract just the time from the datetime string
+                    time_part = message['datetime'].split(' ')[1]
+                    self.add_chat_message(message['sender'], message['message'], time_part)
                 if messages:
-                    # Get the count of currently displayed messages
-                    current_count = len(self.chat_scrollable_frame.winfo_children())
-                    
-                    # Add any new messages
-                    for i in range(current_count, len(messages)):
-                        message = messages[i]
-                        # Extract just the time from the datetime string
-                        time_part = message['datetime'].split(' ')[1]
-                        self.add_chat_message(message['sender'], message['message'], time_part)
+                    self.last_displayed_message = messages[-1]
         except Exception as e:
             print(f"Error updating chat display: {e}")
     
+    def search_chat_history(self):
+        """Search the chat history and list matching messages in a results window"""
+        query = self.chat_search_var.get().strip()
+        if not query or not (self.main_app and hasattr(self.main_app, 'chat_history')):
+            return
+        
+        try:
+            start_time = time.perf_counter()
+            results = self.main_app.chat_history.search(query, limit=100)
+            search_ms = (time.perf_counter() - start_time) * 1000
+        except Exception as e:
+            print(f"Error searching chat history: {e}")
+            messagebox.showerror("Error", f"Failed to search chat history: {str(e)}")
+            return
+        
+        if not (self.search_window and self.search_window.winfo_exists()):
+            self.search_window = tk.Toplevel(self.root)
+            self.search_window.geometry("600x400")
+            self.search_results_label = ttk.Label(self.search_window, padding="5")
+            self.search_results_label.pack(fill=tk.X)
+            self.search_results_text = tk.Text(self.search_window, wrap=tk.WORD, font=('Arial', 10))
+            results_scrollbar = ttk.Scrollbar(self.search_window, orient="vertical",
+                                              command=self.search_results_text.yview)
+            self.search_results_text.configure(yscrollcommand=results_scrollbar.set)
+            results_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            self.search_results_text.pack(fill=tk.BOTH, expand=True)
+            self.search_results_text.tag_configure('header', font=('Arial', 8, 'bold'), foreground='gray')
+        
+        self.search_window.title(f"Chat History Search: {query}")
+        self.search_results_label.configure(text=f"{len(results)} messages found in {search_ms:.1f} ms (newest first)")
+        self.search_results_text.configure(state='normal')
+        self.search_results_text.delete('1.0', tk.END)
+        for message in results:
+            sender = 'You' if message['sender'] == 'user' else 'AI'
+            self.search_results_text.insert(tk.END, f"{sender} ({message['datetime']})\n", 'header')
+            self.search_results_text.insert(tk.END, f"{message['message']}\n\n")
+        self.search_results_text.configure(state='disabled')
+        self.search_window.lift()
+    
     def save_chat_history(self):
         """Save chat history to file"""
         try:
@@ -0,0 +1,100 @@
+import tkinter as tk
+import itertools
+import time
+from typing import Callable, Dict, Optional
+
+class AnimationScheduler:
+    """Drive overlay animation effects from one Tk after() loop on the main thread"""
+
+    def __init__(self, fps: int = 30):
+        self.frame_interval = 1.0 / fps
+        self.effects: Dict[int, Callable[[float], bool]] = {}
+        self.effect_ids = itertools.count(1)
+        self.after_id = None
+        self.root = None
+
+        # One clock for all effects, so effects started together stay in step
+        self.clock_start = time.perf_counter()
+        self.next_frame_at = None
+
+        # Frame counters; frames the main thread was too busy to draw are dropped, not bunched up
+        self.frames = 0
+        self.dropped_frames = 0
+        self.max_late = 0.0
+
+    def now(self) -> float:
+        """Get the shared animation clock in seconds"""
+        return time.perf_counter() - self.clock_start
+
+    def add(self, effect: Callable[[float], bool]) -> int:
+        """Register an effect called every frame with the clock time until it returns False, on the main thread"""
+        effect_id = next(self.effect_ids)
+        self.effects[effect_id] = effect
+        if self.after_id is None:
+            self.root = tk._default_root
+            self.next_frame_at = time.perf_counter()
+            self._schedule(0)
+        return effect_id
+
+    def remove(self, effect_id: Optional[int]):
+        """Unregister an effect, stopping the frame loop when none are left, on the main thread"""
+        self.effects.pop(effect_id, None)
+        if not self.effects:
+            self._cancel()
+
+    def stop(self):
+        """Unregister all effects and stop the frame loop, on the main thread"""
+        self.effects.clear()
+        self._cancel()
+
+    def _schedule(self, delay_ms: int):
+        """Schedule the next frame"""
+        if self.root:
+            self.after_id = self.root.after(delay_ms, self._tick)
+
+    def _cancel(self):
+        """Cancel the pending frame"""
+        if self.after_id is not None and self.root:
+            try:
+                self.root.after_cancel(self.after_id)
+            except tk.TclError:
+                pass
+        self.after_id = None
+
+    def _tick(self):
+        """Run one frame of every effect, then schedule the next frame on the frame grid"""
+        self.after_id = None
+        tick_time = time.perf_counter()
+
+        # Skip whole frames we are late for instead of running them back to back
+        late = tick_time - self.next_frame_at
+        self.max_late = max(self.max_late, late)
+        if late >= self.frame_interval:
+            skipped = int(late / self.frame_interval)
+            self.dropped_frames += skipped
+            self.next_frame_at += skipped * self.frame_interval
+
+        self.frames += 1
+        frame_time = tick_time - self.clock_start
+        for effect_id, effect in list(self.effects.items()):
+            try:
+                keep = effect(frame_time)
+            except Exception as e:
+                print(f"Error in animation effect: {e}")
+                keep = False
+            if not keep:
+                self.effects.pop(effect_id, None)
+
+        if self.effects:
+            self.next_frame_at += self.frame_interval
+            delay = self.next_frame_at - time.perf_counter()
+            self._schedule(max(0, int(delay * 1000)))
+
+    def get_stats(self) -> Dict:
+        """Get frame counters"""
+        return {
+            'frames': self.frames,
+            'dropped_frames': self.dropped_frames,
+            'max_late_ms': self.max_late * 1000,
+            'effects': len(self.effects)
+        }
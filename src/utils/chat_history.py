@@ -1,15 +1,36 @@
 import json
+import os
 import time
+import queue
+import threading
+from collections import deque
 from typing import Dict, List, Optional
 from datetime import datetime
 
+# How long the journal writer collects messages before writing and flushing them (seconds)
+JOURNAL_FLUSH_INTERVAL = 0.2
+
+# The journal is compacted to max_history lines once it holds this many times more
+JOURNAL_COMPACT_FACTOR = 2
+
 class ChatHistory:
     """Handle chat history between user and AI"""
     
-    def __init__(self):
+    def __init__(self, journal_file: str = "chat_history.jsonl", store=None):
         self.chat_history = []
         self.max_history = 50  # Keep last 50 messages
+        self.lock = threading.Lock()
+        
+        # Optional ChatStore (SQLite) keeping the full history; the writer thread writes to it
+        # instead of the journal, and chat_history stays the last max_history messages
+        self.store = store
         
+        # Append-only journal: one JSON message per line, written by a background thread
+        self.journal_file = journal_file
+        self.journal_lines = 0
+        self.write_queue = queue.Queue()
+        self.writer_thread = None
+    
     def add_message(self, sender: str, message: str, timestamp: float = None, metadata: dict = None):
         """Add a message to chat history
         
@@ -30,47 +51,208 @@ class ChatHistory:
             'metadata': metadata or {}
         }
         
-        self.chat_history.append(chat_message)
+        with self.lock:
+            self.chat_history.append(chat_message)
+            
+            # Keep only the last max_history messages
+            if len(self.chat_history) > self.max_history:
+                self.chat_history = self.chat_history[-self.max_history:]
         
-        # Keep only the last max_history messages
-        if len(self.chat_history) > self.max_history:
-            self.chat_history = self.chat_history[-self.max_history:]
+        # Persist right away (crash-safe) without rewriting the whole history
+        self._queue_write(('append', chat_message))
         
         print(f"Chat history: Added {sender} message: {message[:50]}...")
-        
+    
+    def _queue_write(self, command):
+        """Hand a journal command to the writer thread, starting it on first use"""
+        # Checked under the lock so concurrent first writes start exactly one writer
+        with self.lock:
+            if self.writer_thread is None:
+                self.writer_thread = threading.Thread(target=self._writer_loop, name='chat-journal', daemon=True)
+                self.writer_thread.start()
+        self.write_queue.put(command)
+    
+    def _writer_loop(self):
+        """Append queued messages to the journal in batches, one flush per batch"""
+        while True:
+            commands = [self.write_queue.get()]
+            
+            # Collect whatever else arrives shortly after, unless someone is waiting for a flush
+            deadline = time.time() + JOURNAL_FLUSH_INTERVAL
+            while commands[-1][0] == 'append':
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    commands.append(self.write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            batch = []
+            for command, argument in commands:
+                if command == 'append':
+                    batch.append(argument)
+                    continue
+                
+                self._write_batch(batch)
+                batch = []
+                if command == 'clear':
+                    self._truncate_journal()
+                elif command == 'flush':
+                    argument.set()
+                elif command == 'stop':
+                    argument.set()
+                    return
+            self._write_batch(batch)
+            
+            if not self.store and self.journal_lines > self.max_history * JOURNAL_COMPACT_FACTOR:
+                self._compact_journal()
+    
+    def _write_batch(self, messages: List[Dict]):
+        """Write a batch of messages to the store or the journal, on the writer thread"""
+        if not messages:
+            return
+        if not self.store:
+            self._write_journal_lines([json.dumps(message, ensure_ascii=False) for message in messages])
+            return
+        try:
+            self.store.add_messages(messages)
+        except Exception as e:
+            print(f"Error writing chat history database: {e}")
+    
+    def _write_journal_lines(self, lines: List[str]):
+        """Append lines to the journal with a single write and flush, on the writer thread"""
+        if not lines:
+            return
+        try:
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            self.journal_lines += len(lines)
+        except Exception as e:
+            print(f"Error writing chat journal: {e}")
+    
+    def _truncate_journal(self):
+        """Empty the journal (or the store), on the writer thread"""
+        try:
+            if self.store:
+                self.store.clear()
+                return
+            open(self.journal_file, 'w', encoding='utf-8').close()
+            self.journal_lines = 0
+        except Exception as e:
+            print(f"Error clearing chat journal: {e}")
+    
+    def _compact_journal(self):
+        """Rewrite the journal with only the last max_history messages, on the writer thread"""
+        try:
+            messages, _ = self._read_journal(self.journal_file)
+            temp_file = self.journal_file + '.tmp'
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                for message in messages:
+                    f.write(json.dumps(message, ensure_ascii=False) + '\n')
+            os.replace(temp_file, self.journal_file)
+            self.journal_lines = len(messages)
+            print(f"Chat journal compacted to {len(messages)} messages")
+        except Exception as e:
+            print(f"Error compacting chat journal: {e}")
+    
+    def _read_journal(self, filename: str):
+        """Stream the last max_history messages from a journal, skipping damaged lines; returns (messages, line count)"""
+        messages = deque(maxlen=self.max_history)
+        line_count = 0
+        with open(filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                line_count += 1
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    messages.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # e.g. a line cut short by a crash
+        return list(messages), line_count
+    
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait until every queued message has been written to the journal"""
+        if self.writer_thread is None:
+            return True
+        done = threading.Event()
+        self.write_queue.put(('flush', done))
+        return done.wait(timeout)
+    
+    def close(self, timeout: float = 2.0):
+        """Write out queued messages, stop the journal writer and close the store"""
+        if self.writer_thread is not None:
+            done = threading.Event()
+            self.write_queue.put(('stop', done))
+            done.wait(timeout)
+            self.writer_thread = None
+        if self.store:
+            self.store.close()
+    
     def get_recent_messages(self, count: int = 10) -> List[Dict]:
         """Get the most recent messages"""
-        return self.chat_history[-count:] if self.chat_history else []
+        with self.lock:
+            return self.chat_history[-count:] if self.chat_history else []
     
     def get_all_messages(self) -> List[Dict]:
         """Get all messages"""
-        return self.chat_history.copy()
+        with self.lock:
+            return self.chat_history.copy()
     
     def clear_history(self):
         """Clear all chat history"""
-        self.chat_history.clear()
+        with self.lock:
+            self.chat_history.clear()
+        self._queue_write(('clear', None))
         print("Chat history cleared")
     
     def get_message_count(self) -> int:
         """Get total number of messages"""
         return len(self.chat_history)
     
-    def save_to_file(self, filename: str = "chat_history.json"):
-        """Save chat history to file"""
+    def save_to_file(self, filename: Optional[str] = None):
+        """Save chat history: flush the journal, or export everything to a JSON file if filename is given"""
+        if filename is None:
+            if self.flush():
+                print(f"Chat history saved to {self.journal_file}")
+                return True
+            print("Timed out writing chat journal")
+            return False
+        
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.chat_history, f, ensure_ascii=False, indent=2)
+                json.dump(self.get_all_messages(), f, ensure_ascii=False, indent=2)
             print(f"Chat history saved to {filename}")
             return True
         except Exception as e:
             print(f"Error saving chat history: {e}")
             return False
     
-    def load_from_file(self, filename: str = "chat_history.json"):
-        """Load chat history from file"""
+    def load_from_file(self, filename: Optional[str] = None):
+        """Load chat history from the store, the journal (streamed line by line) or a JSON export"""
+        if self.store and filename is None:
+            return self._load_from_store()
+        
+        filename = filename or self.journal_file
+        
+        # Migrate the chat_history.json written by older versions into the journal
+        if filename == self.journal_file and not os.path.exists(filename) and os.path.exists("chat_history.json"):
+            if self.load_from_file("chat_history.json"):
+                self._rewrite_journal(self.get_all_messages())
+                return True
+            return False
+        
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                self.chat_history = json.load(f)
+            if filename.endswith('.jsonl'):
+                messages, line_count = self._read_journal(filename)
+                if filename == self.journal_file:
+                    self.journal_lines = line_count  # The next batch compacts an oversized journal
+            else:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    messages = json.load(f)[-self.max_history:]
+            with self.lock:
+                self.chat_history = messages
             print(f"Chat history loaded from {filename}")
             return True
         except FileNotFoundError:
@@ -80,20 +262,66 @@ class ChatHistory:
             print(f"Error loading chat history: {e}")
             return False
     
+    def _rewrite_journal(self, messages: List[Dict]):
+        """Queue replacing the journal's contents with messages"""
+        self._queue_write(('clear', None))
+        for message in messages:
+            self._queue_write(('append', message))
+    
+    def _load_from_store(self):
+        """Load the most recent messages from the store, importing an existing journal into an empty store"""
+        try:
+            if self.store.get_message_count() == 0 and os.path.exists(self.journal_file):
+                messages, _ = self._read_journal(self.journal_file)
+                self.store.add_messages(messages)
+                print(f"Imported {len(messages)} messages from {self.journal_file} into {self.store.db_file}")
+            
+            messages = self.store.get_recent_messages(self.max_history)
+            with self.lock:
+                self.chat_history = messages
+            print(f"Chat history loaded from {self.store.db_file}")
+            return True
+        except Exception as e:
+            print(f"Error loading chat history: {e}")
+            return False
+    
     def get_last_user_message(self) -> Optional[Dict]:
         """Get the last user message"""
-        for message in reversed(self.chat_history):
-            if message['sender'] == 'user':
-                return message
-        return None
+        return self._get_last_message('user')
     
     def get_last_ai_message(self) -> Optional[Dict]:
         """Get the last AI message"""
-        for message in reversed(self.chat_history):
-            if message['sender'] == 'ai':
-                return message
+        return self._get_last_message('ai')
+    
+    def _get_last_message(self, sender: str) -> Optional[Dict]:
+        """Get the newest message of a sender, looking past max_history in the store"""
+        with self.lock:
+            for message in reversed(self.chat_history):
+                if message['sender'] == sender:
+                    return message
+        if self.store:
+            self.flush()
+            return self.store.get_last_message(sender)
         return None
     
+    def search(self, text: str, limit: int = 50) -> List[Dict]:
+        """Find messages containing every word of text, newest first (the whole store, if any)"""
+        if self.store:
+            self.flush()  # Include messages still queued for the writer
+            return self.store.search(text, limit)
+        
+        words = text.lower().split()
+        if not words:
+            return []
+        results = []
+        for message in reversed(self.get_all_messages()):
+            content = message['message'].lower()
+            if all(word in content for word in words):
+                results.append(message)
+                if len(results) >= limit:
+                    break
+        return results
+    
     def export_conversation(self, format: str = 'text') -> str:
         """Export conversation in specified format
         
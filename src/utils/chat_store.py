@@ -0,0 +1,150 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Metadata keys stored in their own columns; everything else stays in the metadata JSON column
+COLUMN_METADATA = ('x', 'y', 'radius', 'latency', 'model')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    sender TEXT NOT NULL,
+    message TEXT NOT NULL,
+    x INTEGER,
+    y INTEGER,
+    radius INTEGER,
+    latency REAL,
+    model TEXT,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS messages_timestamp ON messages (timestamp);
+CREATE INDEX IF NOT EXISTS messages_sender ON messages (sender, timestamp);
+"""
+
+# External-content full-text index over message text, kept in sync by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(message, content='messages', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, message) VALUES (new.id, new.message);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, message) VALUES ('delete', old.id, old.message);
+END;
+"""
+
+class ChatStore:
+    """SQLite chat history with indexed sender/timestamp columns and FTS5 search over message text"""
+    
+    def __init__(self, db_file: str = "chat_history.db"):
+        self.db_file = db_file
+        self.lock = threading.Lock()
+        
+        # One connection shared by the journal writer thread (writes) and the GUI (reads)
+        self.connection = sqlite3.connect(db_file, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        
+        # FTS5 is compiled into most SQLite builds; without it search falls back to LIKE
+        try:
+            self.connection.executescript(FTS_SCHEMA)
+            self.fts_available = True
+        except sqlite3.OperationalError:
+            self.fts_available = False
+            print("⚠ SQLite FTS5 not available, chat search uses LIKE")
+        self.connection.commit()
+    
+    def add_messages(self, messages: List[Dict]):
+        """Insert chat messages in one transaction"""
+        rows = []
+        for message in messages:
+            metadata = dict(message.get('metadata') or {})
+            coordinates = metadata.pop('coordinates', None) or {}
+            metadata.update({key: value for key, value in coordinates.items() if key in ('x', 'y', 'radius')})
+            columns = [metadata.pop(key, None) for key in COLUMN_METADATA]
+            rows.append((message['timestamp'], message['sender'], message['message'], *columns,
+                         json.dumps(metadata, ensure_ascii=False) if metadata else None))
+        
+        with self.lock:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO messages (timestamp, sender, message, x, y, radius, latency, model, metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    
+    def _to_message(self, row) -> Dict:
+        """Convert a row back into the dict ChatHistory uses"""
+        metadata = json.loads(row['metadata']) if row['metadata'] else {}
+        if row['x'] is not None:
+            metadata['coordinates'] = {'x': row['x'], 'y': row['y'], 'radius': row['radius']}
+        for key in ('latency', 'model'):
+            if row[key] is not None:
+                metadata[key] = row[key]
+        return {
+            'sender': row['sender'],
+            'message': row['message'],
+            'timestamp': row['timestamp'],
+            'datetime': datetime.fromtimestamp(row['timestamp']).strftime('%Y-%m-%d %H:%M:%S'),
+            'metadata': metadata
+        }
+    
+    def _query(self, sql: str, parameters=()) -> List[Dict]:
+        """Run a SELECT over messages and convert the rows"""
+        with self.lock:
+            rows = self.connection.execute(sql, parameters).fetchall()
+        return [self._to_message(row) for row in rows]
+    
+    def get_recent_messages(self, count: int) -> List[Dict]:
+        """Get the most recent messages, oldest first"""
+        messages = self._query("SELECT * FROM messages ORDER BY timestamp DESC, id DESC LIMIT ?", (count,))
+        return messages[::-1]
+    
+    def get_last_message(self, sender: str) -> Optional[Dict]:
+        """Get the newest message of a sender using the (sender, timestamp) index"""
+        messages = self._query("SELECT * FROM messages WHERE sender = ? ORDER BY timestamp DESC, id DESC LIMIT 1",
+                               (sender,))
+        return messages[0] if messages else None
+    
+    def search(self, text: str, limit: int = 50, sender: Optional[str] = None) -> List[Dict]:
+        """Find messages containing every word of text, newest first"""
+        words = text.split()
+        if not words:
+            return []
+        
+        conditions, parameters = [], []
+        if self.fts_available:
+            # Each word is quoted so FTS5 operators in the search text are matched literally, and is
+            # a prefix term so "screen" finds "screenshot" like the journal's substring search
+            query = ' '.join('"' + word.replace('"', '""') + '"*' for word in words)
+            conditions.append("id IN (SELECT rowid FROM messages_fts WHERE messages_fts MATCH ?)")
+            parameters.append(query)
+        else:
+            for word in words:
+                conditions.append("message LIKE ? ESCAPE '\\'")
+                parameters.append('%' + word.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        if sender:
+            conditions.append("sender = ?")
+            parameters.append(sender)
+        
+        parameters.append(limit)
+        return self._query(f"SELECT * FROM messages WHERE {' AND '.join(conditions)} "
+                           f"ORDER BY timestamp DESC, id DESC LIMIT ?", parameters)
+    
+    def get_message_count(self) -> int:
+        """Get the number of stored messages"""
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+    
+    def clear(self):
+        """Delete all messages"""
+        with self.lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM messages")
+    
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            self.connection.close()
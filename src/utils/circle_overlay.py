@@ -1,267 +1,302 @@
 import tkinter as tk
 import threading
-import time
 import math
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+from src.utils.animation_scheduler import AnimationScheduler
+
+# Largest radius of each animation relative to the POI radius, used to size the overlay window
+ANIMATION_MAX_SCALE = {'pulse': 1.2, 'fade': 1.0, 'grow': 1.0, 'static': 1.0}
+
+# Window opacity changes smaller than this are not applied
+ALPHA_STEP = 1 / 32
+
+# Room around the circle for its outline, and above/beside it for the label
+OVERLAY_PADDING = 4
+LABEL_HEIGHT = 32
+LABEL_HALF_WIDTH = 60
 
 class CircleOverlay:
     """Display semi-transparent circle overlay at POI coordinates"""
     
-    def __init__(self, config):
+    def __init__(self, config, scheduler=None):
         self.config = config
         self.overlay_window = None
         self.canvas = None
-        self.circle_id = None
-        self.animation_thread = None
         self.is_showing = False
-        self.stop_animation = False
         
-    def show_circle(self, x: int, y: int, radius: int, duration: Optional[float] = None):
-        """Show circle overlay at specified coordinates"""
-        if self.is_showing:
-            self.hide_circle()
+        # Frames are driven by the scheduler's after() loop on the main thread
+        self.scheduler = scheduler or AnimationScheduler()
+        self.effect_id = None
         
-        # Get settings
-        if duration is None:
-            duration = float(self.config.get('CircleOverlay', 'duration', '3.0'))
+        # Circles are plain ovals: the window is colour-keyed (-transparentcolor black), which has no
+        # partial transparency, so anti-aliased edges would be blended with the key colour into a
+        # dark halo. Opacity comes from the window's -alpha instead.
+        self.window_alpha = None
         
-        # Start animation in separate thread
-        self.animation_thread = threading.Thread(
-            target=self._animate_circle,
-            args=(x, y, radius, duration),
-            daemon=True
-        )
-        self.animation_thread.start()
+        # The window and its canvas items are created once and reused; frames only move them.
+        # One (circle, label) item pair per point of interest, added as more points are shown.
+        self.circle_items = []
+        self.window_visible = False
+        
+        # The window only covers the circles' bounding box; frames draw relative to its origin
+        self.window_origin = (0, 0)
+        self.window_size = (1, 1)
     
-    def _animate_circle(self, x: int, y: int, radius: int, duration: float):
-        """Animate circle overlay"""
+    def create_window(self):
+        """Create the (hidden) overlay window and its persistent canvas items, on the main thread"""
+        if self.overlay_window is not None:
+            return
+        
         try:
-            self.is_showing = True
-            self.stop_animation = False
+            self.overlay_window = tk.Toplevel()
+            self.overlay_window.withdraw()
+            self.overlay_window.title("Circle Overlay")
             
-            # Create overlay window
-            self._create_overlay_window()
+            # Make window transparent and always on top
+            self.overlay_window.attributes('-topmost', True)
+            self.overlay_window.attributes('-alpha', 0.7)
+            self.window_alpha = 0.7
+            self.overlay_window.overrideredirect(True)  # Remove window decorations
             
-            # Get circle settings
-            color = self.config.get('CircleOverlay', 'color', '#00FF00')  # Default green
-            alpha = float(self.config.get('CircleOverlay', 'alpha', '0.5'))
-            animation_type = self.config.get('CircleOverlay', 'animation', 'pulse')
+            # Sized and moved to each animation's bounding box by _place_window
+            self.overlay_window.geometry("1x1+0+0")
             
-            # Convert alpha to tkinter format (0-255)
-            alpha_int = int(alpha * 255)
+            # Create canvas
+            self.canvas = tk.Canvas(
+                self.overlay_window,
+                width=1,
+                height=1,
+                highlightthickness=0,
+                bg='black'
+            )
+            self.canvas.pack()
             
-            # Animation parameters
-            start_time = time.time()
-            frames_per_second = 30
-            frame_duration = 1.0 / frames_per_second
-            
-            while time.time() - start_time < duration and not self.stop_animation:
-                elapsed = time.time() - start_time
-                progress = elapsed / duration
-                
-                # Calculate current radius based on animation type
-                if animation_type == 'pulse':
-                    # Pulsing animation
-                    pulse_factor = 0.8 + 0.4 * math.sin(elapsed * 4)  # Pulse between 0.8 and 1.2
-                    current_radius = int(radius * pulse_factor)
-                elif animation_type == 'fade':
-                    # Fading animation
-                    fade_alpha = alpha * (1 - progress)
-                    alpha_int = int(fade_alpha * 255)
-                    current_radius = radius
-                elif animation_type == 'grow':
-                    # Growing animation
-                    current_radius = int(radius * (0.5 + 0.5 * progress))
-                else:  # static
-                    current_radius = radius
-                
-                # Update circle
-                self._update_circle(x, y, current_radius, color, alpha_int)
-                
-                # Wait for next frame
-                time.sleep(frame_duration)
-            
-            # Hide overlay
-            self._hide_overlay_window()
+            # Make canvas transparent
+            self.overlay_window.configure(bg='black')
+            try:
+                self.overlay_window.attributes('-transparentcolor', 'black')
+            except tk.TclError:
+                pass  # Only supported on Windows
             
-        except Exception as e:
-            print(f"Error in circle animation: {e}")
-        finally:
-            self.is_showing = False
-            self.stop_animation = False
-    
-    def _create_overlay_window(self):
-        """Create transparent overlay window"""
-        try:
-            # Create overlay window on main thread
-            def create_window():
-                try:
-                    self.overlay_window = tk.Toplevel()
-                    self.overlay_window.title("Circle Overlay")
-                    
-                    # Make window transparent and always on top
-                    self.overlay_window.attributes('-topmost', True)
-                    self.overlay_window.attributes('-alpha', 0.7)
-                    self.overlay_window.overrideredirect(True)  # Remove window decorations
-                    
-                    # Make window fullscreen
-                    screen_width = self.overlay_window.winfo_screenwidth()
-                    screen_height = self.overlay_window.winfo_screenheight()
-                    self.overlay_window.geometry(f"{screen_width}x{screen_height}+0+0")
-                    
-                    # Create canvas
-                    self.canvas = tk.Canvas(
-                        self.overlay_window,
-                        width=screen_width,
-                        height=screen_height,
-                        highlightthickness=0,
-                        bg='black'
-                    )
-                    self.canvas.pack()
-                    
-                    # Make canvas transparent
-                    self.overlay_window.configure(bg='black')
-                    self.overlay_window.attributes('-transparentcolor', 'black')
-                    
-                    # Bind cleanup on window close
-                    self.overlay_window.protocol("WM_DELETE_WINDOW", self._on_window_close)
-                    
-                except Exception as e:
-                    print(f"Error in create_window: {e}")
-                    self.overlay_window = None
-                    self.canvas = None
+            # Circle and label for the first point, moved and restyled by each frame
+            self.circle_items = []
+            self._ensure_circle_items(1)
             
-            # Execute on main thread
-            if threading.current_thread() != threading.main_thread():
-                # Schedule on main thread
-                root = tk._default_root
-                if root:
-                    root.after(0, create_window)
-                    # Wait for window creation with timeout
-                    timeout = 2.0  # 2 second timeout
-                    start_time = time.time()
-                    while self.overlay_window is None and not self.stop_animation:
-                        if time.time() - start_time > timeout:
-                            print("Timeout waiting for overlay window creation")
-                            break
-                        time.sleep(0.01)
-            else:
-                create_window()
-                
+            # Bind cleanup on window close
+            self.overlay_window.protocol("WM_DELETE_WINDOW", self._on_window_close)
+            self.window_visible = False
+        
         except Exception as e:
             print(f"Error creating overlay window: {e}")
             self.overlay_window = None
             self.canvas = None
+            self.circle_items = []
+    
+    def _ensure_circle_items(self, count: int):
+        """Create hidden circle and label items until there are at least count pairs"""
+        while len(self.circle_items) < count:
+            circle_id = self.canvas.create_oval(0, 0, 0, 0, width=2, state='hidden')
+            text_id = self.canvas.create_text(0, 0, text='', fill="white", font=("Arial", 12, "bold"),
+                                              anchor="center", state='hidden')
+            self.circle_items.append((circle_id, text_id))
+    
+    def show_circle(self, x: int, y: int, radius: int, duration: Optional[float] = None):
+        """Show circle overlay at specified coordinates"""
+        self.show_circles([{'x': x, 'y': y, 'r': radius}], duration)
+    
+    def show_circles(self, points: List[Dict], duration: Optional[float] = None):
+        """Show a circle (with its label, if any) at every point of interest in one overlay"""
+        if not points:
+            return
+        
+        # Get settings
+        if duration is None:
+            duration = float(self.config.get('CircleOverlay', 'duration', '3.0'))
+        
+        self.is_showing = True
+        self._run_on_main_thread(lambda: self._start_animation(points, duration))
+    
+    def _start_animation(self, points: List[Dict], duration: float):
+        """Replace the current animation with new circles, on the main thread"""
+        self.scheduler.remove(self.effect_id)
+        
+        # Get circle settings
+        color = self.config.get('CircleOverlay', 'color', '#00FF00')  # Default green
+        alpha = float(self.config.get('CircleOverlay', 'alpha', '0.5'))
+        animation_type = self.config.get('CircleOverlay', 'animation', 'pulse')
+        debug_mode = self.config.get('CircleOverlay', 'debug_coords', 'false').lower() == 'true'
+        
+        # Label text per circle: its label, plus coordinates in debug mode
+        labels = []
+        for point in points:
+            label = point.get('label') or ''
+            if debug_mode:
+                label = f"{label} ({point['x']}, {point['y']})".strip()
+            labels.append(label)
+        
+        # Size the window once for the largest frame of the animation
+        max_scale = ANIMATION_MAX_SCALE.get(animation_type, 1.0)
+        self._place_window([(point['x'], point['y'], int(point['r'] * max_scale)) for point in points],
+                           any(labels))
+        
+        # The configured alpha is the overlay window's opacity; 'fade' lowers it every frame
+        self._set_window_alpha(alpha)
+        
+        start_time = self.scheduler.now()
+        frames_before = self.scheduler.frames
+        dropped_before = self.scheduler.dropped_frames
+        
+        def frame(now):
+            """Draw one frame at the shared clock time, returning False when the animation is over"""
+            elapsed = now - start_time
+            if elapsed >= duration:
+                self._hide_now()
+                print(f"Circle animation finished: {self.scheduler.frames - frames_before} frames, "
+                      f"{self.scheduler.dropped_frames - dropped_before} dropped")
+                return False
+            progress = elapsed / duration
+            
+            # Calculate current radius scale based on animation type
+            if animation_type == 'pulse':
+                # Pulsing animation
+                radius_scale = 0.8 + 0.4 * math.sin(elapsed * 4)  # Pulse between 0.8 and 1.2
+            elif animation_type == 'fade':
+                # Fading animation
+                self._set_window_alpha(alpha * (1 - progress))
+                radius_scale = 1.0
+            elif animation_type == 'grow':
+                # Growing animation
+                radius_scale = 0.5 + 0.5 * progress
+            else:  # static
+                radius_scale = 1.0
+            
+            # All circles are drawn in one pass
+            circles = [(point['x'], point['y'], int(point['r'] * radius_scale), label)
+                       for point, label in zip(points, labels)]
+            self._draw_frame(circles, color)
+            return True
+        
+        self.effect_id = self.scheduler.add(frame)
+    
+    def _run_on_main_thread(self, func):
+        """Run func now on the main thread, or schedule it there from other threads"""
+        if threading.current_thread() == threading.main_thread():
+            func()
+            return
+        root = tk._default_root
+        if root:
+            root.after(0, func)
     
     def _on_window_close(self):
         """Handle window close event"""
-        self.stop_animation = True
+        self._hide_now()
     
-    def _update_circle(self, x: int, y: int, radius: int, color: str, alpha: int):
-        """Update circle on canvas"""
+    def _place_window(self, circles: List[Tuple[int, int, int]], show_labels: bool = False):
+        """Size and move the overlay window to cover (x, y, max_radius) circles, on the main thread"""
+        self.create_window()
+        if not self.canvas:
+            return
+        
+        left = top = right = bottom = None
+        for x, y, max_radius in circles:
+            half_width = max_radius + OVERLAY_PADDING
+            top_extent = half_width
+            if show_labels:
+                half_width = max(half_width, LABEL_HALF_WIDTH)
+                top_extent += LABEL_HEIGHT
+            
+            box = (x - half_width, y - top_extent, x + half_width, y + max_radius + OVERLAY_PADDING)
+            if left is None:
+                left, top, right, bottom = box
+            else:
+                left, top = min(left, box[0]), min(top, box[1])
+                right, bottom = max(right, box[2]), max(bottom, box[3])
+        
+        width, height = right - left, bottom - top
+        
         try:
-            if self.canvas and self.overlay_window:
-                def update():
-                    if self.canvas and not self.stop_animation:
-                        # Clear previous circle
-                        if self.circle_id:
-                            self.canvas.delete(self.circle_id)
-                        
-                        # Draw new circle
-                        x1, y1 = x - radius, y - radius
-                        x2, y2 = x + radius, y + radius
-                        
-                        # Create color with alpha
-                        fill_color = color
-                        outline_color = color
-                        
-                        self.circle_id = self.canvas.create_oval(
-                            x1, y1, x2, y2,
-                            fill=fill_color,
-                            outline=outline_color,
-                            width=2
-                        )
-                        
-                        # Add coordinate text for debugging (if debug mode enabled)
-                        debug_mode = self.config.get('CircleOverlay', 'debug_coords', 'false').lower() == 'true'
-                        if debug_mode:
-                            coord_text = f"({x}, {y})"
-                            text_x = x
-                            text_y = y - radius - 20  # Position above the circle
-                            
-                            self.canvas.create_text(
-                                text_x, text_y,
-                                text=coord_text,
-                                fill="white",
-                                font=("Arial", 12, "bold"),
-                                anchor="center"
-                            )
-                
-                # Execute on main thread
-                if threading.current_thread() != threading.main_thread():
-                    root = tk._default_root
-                    if root:
-                        root.after(0, update)
-                else:
-                    update()
-                    
+            if (width, height) != self.window_size:
+                self.canvas.config(width=width, height=height)
+            self.overlay_window.geometry(f"{width}x{height}+{left}+{top}")  # "+-10" is left of the screen edge
+            self.window_origin = (left, top)
+            self.window_size = (width, height)
         except Exception as e:
-            print(f"Error updating circle: {e}")
+            print(f"Error placing overlay window: {e}")
     
-    def _hide_overlay_window(self):
-        """Hide overlay window"""
+    def _draw_frame(self, circles: List[Tuple[int, int, int, str]], color: str):
+        """Move the persistent circles and labels to this frame's (x, y, radius, label), on the main thread"""
         try:
-            def hide():
-                try:
-                    if self.overlay_window:
-                        # Clear any pending after() calls
-                        self.overlay_window.after_cancel("all")
-                        self.overlay_window.destroy()
-                        self.overlay_window = None
-                        self.canvas = None
-                        self.circle_id = None
-                except Exception as e:
-                    print(f"Error destroying overlay window: {e}")
-                    # Force cleanup even if destroy fails
-                    self.overlay_window = None
-                    self.canvas = None
-                    self.circle_id = None
+            self.create_window()
+            if not self.canvas:
+                return
             
-            # Execute on main thread
-            if threading.current_thread() != threading.main_thread():
-                root = tk._default_root
-                if root:
-                    try:
-                        root.after(0, hide)
-                    except Exception as e:
-                        print(f"Error scheduling hide: {e}")
-            else:
-                hide()
+            self._ensure_circle_items(len(circles))
+            
+            # Screen coordinates to window coordinates
+            left, top = self.window_origin
+            for index, (circle_id, text_id) in enumerate(self.circle_items):
+                if index >= len(circles):
+                    self.canvas.itemconfig(circle_id, state='hidden')
+                    self.canvas.itemconfig(text_id, state='hidden')
+                    continue
                 
+                x, y, radius, label = circles[index]
+                cx, cy = x - left, y - top
+                self.canvas.coords(circle_id, cx - radius, cy - radius, cx + radius, cy + radius)
+                self.canvas.itemconfig(circle_id, fill=color, outline=color, state='normal')
+                
+                # Label (and coordinates in debug mode), positioned above the circle
+                if label:
+                    self.canvas.coords(text_id, cx, cy - radius - 20)
+                    self.canvas.itemconfig(text_id, text=label, state='normal')
+                else:
+                    self.canvas.itemconfig(text_id, state='hidden')
+            
+            if not self.window_visible:
+                self.overlay_window.deiconify()
+                self.overlay_window.attributes('-topmost', True)
+                self.window_visible = True
         except Exception as e:
-            print(f"Error hiding overlay: {e}")
-            # Force cleanup
-            self.overlay_window = None
-            self.canvas = None
-            self.circle_id = None
+            print(f"Error drawing circle frame: {e}")
+    
+    def _set_window_alpha(self, alpha: float):
+        """Set the overlay window's opacity, skipping changes too small to see, on the main thread"""
+        alpha = min(max(alpha, 0.0), 1.0)
+        if not self.overlay_window or (self.window_alpha is not None and abs(alpha - self.window_alpha) < ALPHA_STEP):
+            return
+        try:
+            self.overlay_window.attributes('-alpha', alpha)
+            self.window_alpha = alpha
+        except Exception as e:
+            print(f"Error setting overlay opacity: {e}")
+    
+    def _hide_now(self):
+        """Stop the animation and hide the overlay window, on the main thread"""
+        self.scheduler.remove(self.effect_id)
+        self.effect_id = None
+        self.is_showing = False
+        try:
+            if self.canvas:
+                for circle_id, text_id in self.circle_items:
+                    self.canvas.itemconfig(circle_id, state='hidden')
+                    self.canvas.itemconfig(text_id, state='hidden')
+            if self.overlay_window and self.window_visible:
+                self.overlay_window.withdraw()
+            self.window_visible = False
+        except Exception as e:
+            print(f"Error hiding overlay window: {e}")
     
     def hide_circle(self):
         """Hide circle overlay immediately"""
-        self.stop_animation = True
-        
-        # Clean up immediately
-        if hasattr(self, 'overlay_window') and self.overlay_window:
-            try:
-                self.overlay_window.after_cancel("all")
-            except:
-                pass
-        
-        if self.animation_thread and self.animation_thread.is_alive():
-            self.animation_thread.join(timeout=1.0)
-        
-        self._hide_overlay_window()
-        self.is_showing = False
+        try:
+            self._run_on_main_thread(self._hide_now)
+        except Exception as e:
+            print(f"Error hiding overlay: {e}")
+    
+    def get_item_count(self) -> int:
+        """Get the number of items on the overlay canvas"""
+        return len(self.canvas.find_all()) if self.canvas else 0
     
     def is_circle_showing(self) -> bool:
         """Check if circle is currently showing"""
-        return self.is_showing 
\ No newline at end of file
+        return self.is_showing
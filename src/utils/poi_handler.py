@@ -9,14 +9,24 @@ class POIHandler:
         self.current_poi = None
         self.poi_history = []
         self.max_history = 10  # Keep last 10 POIs
-        
+    
     def set_current_poi(self, x: int, y: int, radius: int, text: str):
         """Set the current point of interest"""
+        self.set_current_pois([{'x': x, 'y': y, 'r': radius}], text)
+    
+    def set_current_pois(self, points: List[Dict], text: str):
+        """Set the current points of interest (dicts with x, y, r and optional label); the first is the main POI"""
+        if not points:
+            return
+        
+        first = points[0]
         poi_data = {
-            'x': x,
-            'y': y,
-            'radius': radius,
+            'x': first['x'],
+            'y': first['y'],
+            'radius': first['r'],
             'text': text,
+            'points': [{'x': point['x'], 'y': point['y'], 'radius': point['r'], 'label': point.get('label', '')}
+                       for point in points],
             'timestamp': time.time()
         }
         
@@ -30,12 +40,22 @@ class POIHandler:
         # Set as current
         self.current_poi = poi_data
         
-        print(f"POI set: ({x}, {y}) with radius {radius}")
-        
+        if len(points) == 1:
+            print(f"POI set: ({first['x']}, {first['y']}) with radius {first['r']}")
+        else:
+            print(f"{len(points)} POIs set: " + ', '.join(
+                f"{point.get('label') or '?'} ({point['x']}, {point['y']})" for point in points))
+    
     def get_current_poi(self) -> Optional[Dict]:
         """Get the current point of interest"""
         return self.current_poi
     
+    def get_current_pois(self) -> List[Dict]:
+        """Get all current points of interest"""
+        if self.current_poi:
+            return list(self.current_poi.get('points', []))
+        return []
+    
     def get_poi_coordinates(self) -> Optional[Tuple[int, int]]:
         """Get just the coordinates of current POI"""
         if self.current_poi:
@@ -0,0 +1,121 @@
+import re
+from typing import List, Optional
+
+# Closing quotes and brackets that may follow terminal punctuation; German closes with “,
+# French puts a (non-breaking) space before »
+CLOSING_CHARS = '"\'”’“»)]'
+
+# Candidate boundary: terminal punctuation, optional closing quotes/brackets, then whitespace
+BOUNDARY_PATTERN = re.compile(r'[.!?…]+(?:["\'”’“)\]]|[ \u00a0]?»)*\s+')
+
+# Clause boundaries used to break up sentences that are too long to speak as one chunk
+CLAUSE_PATTERN = re.compile(r'(?<=[,;:])\s+')
+
+# Words that end with a period but do not end a sentence (lowercase, without the final period)
+ABBREVIATIONS = {
+    'en': {'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'vs', 'etc', 'e.g', 'i.e', 'approx',
+           'fig', 'inc', 'ltd', 'co', 'corp', 'dept', 'est', 'min', 'max', 'sec', 'ca'},
+    'es': {'sr', 'sra', 'srta', 'dr', 'dra', 'ud', 'uds', 'etc', 'p.ej', 'aprox', 'pág', 'núm', 'av', 'ej'},
+    'fr': {'m', 'mme', 'mlle', 'dr', 'pr', 'etc', 'p.ex', 'env', 'cf', 'av', 'bd', 'n°', 'p'},
+    'de': {'z.b', 'bzw', 'usw', 'nr', 'ca', 'dr', 'hr', 'fr', 'd.h', 'u.a', 'vgl', 'ggf', 'evtl', 'inkl',
+           'str', 'bspw', 'sog', 'max', 'min'},
+    'it': {'sig', 'sig.ra', 'dott', 'dott.ssa', 'ing', 'avv', 'prof', 'ecc', 'es', 'pag', 'n'},
+    'pt': {'sr', 'sra', 'dr', 'dra', 'etc', 'p.ex', 'pág', 'n.º', 'av', 'prof'},
+    'ru': {'т.е', 'т.д', 'т.п', 'т.к', 'г', 'гг', 'др', 'пр', 'ул', 'им', 'см', 'стр', 'руб', 'тыс', 'млн', 'млрд'},
+    'tr': {'dr', 'prof', 'doç', 'vb', 'vs', 'bkz', 'örn', 'sn', 'no', 'sok', 'cad', 'mah', 'yy'}
+}
+
+# Languages where "3." is an ordinal ("am 3. Mai", "3. sırada") rather than a sentence end
+ORDINAL_PERIOD_LANGUAGES = {'de', 'tr'}
+
+def split_sentences(text: str, language: str = 'en-US', max_chars: Optional[int] = None) -> List[str]:
+    """Split text into sentences, aware of abbreviations, initials and numbers
+    
+    Args:
+        text: Text to split
+        language: Language code such as 'en-US' or 'tr-TR'
+        max_chars: Optional soft limit; longer sentences are split at clause punctuation
+    """
+    if not text:
+        return []
+    
+    language_code = (language or 'en')[:2].lower()
+    abbreviations = ABBREVIATIONS.get(language_code, set()) | ABBREVIATIONS['en']
+    
+    sentences = []
+    # Line breaks always end a sentence (lists, headings, paragraphs)
+    for paragraph in re.split(r'\s*\n\s*', text):
+        if paragraph.strip():
+            sentences.extend(_split_paragraph(paragraph.strip(), language_code, abbreviations))
+    
+    if max_chars:
+        sentences = [piece for sentence in sentences for piece in _split_long_sentence(sentence, max_chars)]
+    return sentences
+
+def _split_paragraph(paragraph: str, language_code: str, abbreviations: set) -> List[str]:
+    """Split a single paragraph at sentence boundaries"""
+    sentences = []
+    start = 0
+    
+    for match in BOUNDARY_PATTERN.finditer(paragraph):
+        if _is_sentence_boundary(paragraph, start, match, language_code, abbreviations):
+            sentence = paragraph[start:match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+    
+    tail = paragraph[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+def _is_sentence_boundary(paragraph: str, start: int, match, language_code: str, abbreviations: set) -> bool:
+    """Decide whether a candidate boundary really ends a sentence"""
+    # A sentence never continues with a lowercase letter after a real boundary
+    next_char = paragraph[match.end():match.end() + 1]
+    if next_char and next_char.islower():
+        return False
+    
+    terminator = match.group().rstrip()
+    if terminator.rstrip(CLOSING_CHARS + ' \u00a0') != '.':
+        return True  # '!', '?', '…' and '...' always end a sentence
+    
+    previous = paragraph[start:match.start()].split()
+    if not previous:
+        return True
+    word = previous[-1].lstrip('"\'“‘«([')
+    
+    # Abbreviations ("Dr.", "z.B.", "т.е.")
+    if word.lower() in abbreviations:
+        return False
+    
+    # Initials ("J. K. Rowling")
+    if len(word) == 1 and word.isupper():
+        return False
+    
+    # Ordinal numbers ("am 3. Mai")
+    if word.isdigit() and language_code in ORDINAL_PERIOD_LANGUAGES:
+        return False
+    
+    # List numbers at the start of a line ("1. Open File")
+    if word.isdigit() and len(previous) == 1 and start == 0:
+        return False
+    
+    return True
+
+def _split_long_sentence(sentence: str, max_chars: int) -> List[str]:
+    """Split a sentence longer than max_chars at clause punctuation"""
+    if len(sentence) <= max_chars:
+        return [sentence]
+    
+    pieces = []
+    current = ''
+    for clause in CLAUSE_PATTERN.split(sentence):
+        if current and len(current) + 1 + len(clause) > max_chars:
+            pieces.append(current)
+            current = clause
+        else:
+            current = f"{current} {clause}" if current else clause
+    if current:
+        pieces.append(current)
+    return pieces
@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Optional
+
+class TTSCache:
+    """Content-addressed on-disk cache of synthesized speech with size-based LRU eviction"""
+    
+    def __init__(self, cache_dir: str = "tts_cache", max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+        # key -> (size, last access time), used for eviction without rescanning the directory
+        self.index = {}
+        self.total_bytes = 0
+        self._load_index()
+    
+    def _load_index(self):
+        """Scan the cache directory to rebuild the size/access index"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file() and entry.name.endswith('.audio'):
+                    stat = entry.stat()
+                    self.index[entry.name[:-len('.audio')]] = (stat.st_size, stat.st_mtime)
+                    self.total_bytes += stat.st_size
+            print(f"TTS cache: {len(self.index)} entries, {self.total_bytes / 1024:.0f} KB")
+        except Exception as e:
+            print(f"Error loading TTS cache: {e}")
+    
+    def make_key(self, text: str, language: str, engine: str, voice: str = "") -> str:
+        """Build the content address for a (text, language, engine, voice) tuple"""
+        payload = json.dumps([text.strip(), language, engine, voice or ""], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        """Get the file path for a cache key"""
+        return os.path.join(self.cache_dir, f"{key}.audio")
+    
+    def get(self, text: str, language: str, engine: str, voice: str = "") -> Optional[bytes]:
+        """Get cached audio bytes, or None on a miss"""
+        key = self.make_key(text, language, engine, voice)
+        with self.lock:
+            if key not in self.index:
+                self.misses += 1
+                return None
+            
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                # Touch the file so access order survives restarts
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                self.index[key] = (len(data), time.time())
+                self.hits += 1
+                return data
+            except OSError:
+                # File vanished underneath us - forget it
+                size, _ = self.index.pop(key)
+                self.total_bytes -= size
+                self.misses += 1
+                return None
+    
+    def put(self, text: str, language: str, engine: str, voice: str, data: bytes):
+        """Store audio bytes and evict least recently used entries over the size limit"""
+        if not data or len(data) > self.max_bytes:
+            return
+        
+        key = self.make_key(text, language, engine, voice)
+        with self.lock:
+            try:
+                # Write to a temp name and rename so readers never see partial files
+                tmp_path = self._path(key) + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(key))
+            except OSError as e:
+                print(f"Error writing TTS cache entry: {e}")
+                return
+            
+            if key in self.index:
+                self.total_bytes -= self.index[key][0]
+            self.index[key] = (len(data), time.time())
+            self.total_bytes += len(data)
+            self._evict()
+    
+    def _evict(self):
+        """Remove least recently used entries until under max_bytes, caller holds lock"""
+        if self.total_bytes <= self.max_bytes:
+            return
+        
+        for key, (size, _) in sorted(self.index.items(), key=lambda item: item[1][1]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                continue  # Probably in use, try the next one
+            del self.index[key]
+            self.total_bytes -= size
+    
+    def clear(self):
+        """Remove all cached audio"""
+        with self.lock:
+            for key in list(self.index.keys()):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self.index.clear()
+            self.total_bytes = 0
+    
+    def get_stats(self) -> Dict:
+        """Get hit/miss counts, hit rate and cache size"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self.index),
+                'bytes': self.total_bytes
+            }